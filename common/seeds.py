@@ -0,0 +1,47 @@
+"""
+Geração de sementes e geradores de números aleatórios independentes.
+
+Todos os geradores derivam de uma única semente via `numpy.random.SeedSequence`.
+Cada motor (GA, ACO, banco, ilha, colônia, worker) recebe o seu próprio
+`numpy.random.Generator`, sem tocar no estado global de `random`/`np.random`.
+Como o i-ésimo filho de `SeedSequence(seed).spawn(n)` depende apenas de `seed`
+e de `i`, um worker que recebe o índice `i` gera a mesma sequência
+independentemente de quantos workers existam no pool.
+"""
+from typing import List, Union
+
+import numpy as np
+
+SEMENTE_PADRAO = 42
+
+
+def criar_geradores(seed: int, n: int) -> List[np.random.Generator]:
+    """Cria `n` geradores independentes a partir de uma semente (SeedSequence.spawn)."""
+    return [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(n)]
+
+
+def gerador_filho(seed: int, *caminho: int) -> np.random.Generator:
+    """
+    Gerador do filho identificado por `caminho` na árvore de spawn da semente.
+
+    `gerador_filho(seed, i)` produz a mesma sequência que `criar_geradores(seed, n)[i]`
+    para qualquer n > i; `gerador_filho(seed, i, j)` equivale ao j-ésimo filho dele.
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=tuple(caminho)))
+
+
+def gerador(rng: Union[None, int, np.random.Generator] = None,
+            seed: int = SEMENTE_PADRAO) -> np.random.Generator:
+    """
+    Normaliza o argumento `rng` dos motores: um Generator é usado como está,
+    um inteiro vira a semente e None usa `seed`.
+    """
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(seed if rng is None else rng)
+
+
+def semente_inteira(rng: np.random.Generator) -> int:
+    """Sorteia uma semente inteira a partir de um Generator (para APIs que só aceitam int)."""
+    return int(rng.integers(2**63 - 1))
+
@@ -0,0 +1,174 @@
+"""
+Benchmark comparativo das metaheurísticas (GA x ACO) no problema de montagem de provas.
+
+Executa cada algoritmo sobre uma matriz de filtros (matéria/tópico), sementes e
+tamanhos de banco e salva as métricas em CSV e JSON. No modo de comparação
+(--comparar), confronta o resultado com uma baseline salva e sinaliza regressões.
+
+Exemplos:
+    python3 src/benchmark/run_benchmark.py --nivel materia --seeds 1 2 3
+    python3 src/benchmark/run_benchmark.py --comparar reports/benchmark/baseline.json
+"""
+
+import argparse
+import csv
+import json
+import sys
+import os
+
+# Adiciona o diretório raiz ao path para importar os módulos do projeto
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from src.benchmark.runners import ALGORITMOS, executar, listar_filtros
+from src.part3_ga.problems.exam import BancoDeQuestoes
+
+SAIDA_PADRAO = 'reports/benchmark/benchmark'
+
+# Campos que identificam uma célula do benchmark (usados na comparação)
+CHAVE_CELULA = ('algoritmo', 'materia', 'topico', 'tamanho_banco', 'seed')
+
+COLUNAS = [
+    'algoritmo', 'materia', 'topico', 'tamanho_banco', 'seed', 'status', 'n_candidatas',
+    'melhor_fitness', 'avaliacoes', 'tempo_s', 'pico_memoria_kb', 'alvo', 'atingiu_alvo',
+    'tempo_alvo_s', 'avaliacoes_alvo', 'params', 'melhor_ids',
+]
+
+
+def rodar_matriz(algoritmos, filtros, seeds, tamanhos, alvo, medir_memoria=True, params=None):
+    """
+    Executa todas as células da matriz (tamanho x filtro x semente x algoritmo).
+    O banco de cada tamanho é gerado uma única vez e compartilhado entre as células.
+    """
+    params = params or {}
+    resultados = []
+    total = len(algoritmos) * len(filtros) * len(seeds) * len(tamanhos)
+    n = 0
+    for tamanho in tamanhos:
+        banco = BancoDeQuestoes(tamanho=tamanho)
+        for materia, topico in filtros:
+            for seed in seeds:
+                for algoritmo in algoritmos:
+                    n += 1
+                    registro = executar(algoritmo, banco, materia, topico, seed,
+                                        params.get(algoritmo), alvo, medir_memoria)
+                    resultados.append(registro)
+                    rotulo = f"{materia}/{topico or '*'}"
+                    if registro['status'] == 'ok':
+                        print(f"[{n}/{total}] {algoritmo:<4} {rotulo:<35} banco={tamanho} seed={seed} "
+                              f"fitness={registro['melhor_fitness']:.2f} avals={registro['avaliacoes']} "
+                              f"tempo={registro['tempo_s']:.3f}s")
+                    else:
+                        print(f"[{n}/{total}] {algoritmo:<4} {rotulo:<35} banco={tamanho} seed={seed} "
+                              f"-> {registro['status']} ({registro['n_candidatas']} candidatas)")
+    return resultados
+
+
+def salvar_resultados(resultados, prefixo):
+    """Salva os registros em <prefixo>.csv e <prefixo>.json."""
+    os.makedirs(os.path.dirname(prefixo) or '.', exist_ok=True)
+
+    with open(f'{prefixo}.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUNAS, extrasaction='ignore')
+        writer.writeheader()
+        for r in resultados:
+            writer.writerow(r)
+
+    with open(f'{prefixo}.json', 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+    print(f"Resultados salvos em: {prefixo}.csv e {prefixo}.json")
+
+
+def comparar_com_baseline(resultados, baseline, tol_fitness=1.0, tol_tempo=0.25, tol_avaliacoes=0.10):
+    """
+    Compara os resultados com uma baseline e retorna a lista de regressões.
+
+    Uma célula regride quando:
+      - o melhor fitness cai mais que `tol_fitness` pontos;
+      - deixa de atingir o alvo que a baseline atingia;
+      - as avaliações até o alvo crescem mais que `tol_avaliacoes` (fração);
+      - o tempo de parede cresce mais que `tol_tempo` (fração).
+    """
+    def chave(r):
+        return tuple(r[c] for c in CHAVE_CELULA)
+
+    base = {chave(r): r for r in baseline if r.get('status') == 'ok'}
+    regressoes = []
+
+    for atual in resultados:
+        ref = base.get(chave(atual))
+        if ref is None or atual.get('status') != 'ok':
+            continue
+        rotulo = ' | '.join(str(v) for v in chave(atual))
+
+        if atual['melhor_fitness'] < ref['melhor_fitness'] - tol_fitness:
+            regressoes.append(f"{rotulo}: fitness {ref['melhor_fitness']:.2f} -> {atual['melhor_fitness']:.2f}")
+
+        if ref.get('atingiu_alvo') and not atual.get('atingiu_alvo'):
+            regressoes.append(f"{rotulo}: deixou de atingir o alvo {ref['alvo']}")
+        elif ref.get('avaliacoes_alvo') and atual.get('avaliacoes_alvo'):
+            if atual['avaliacoes_alvo'] > ref['avaliacoes_alvo'] * (1 + tol_avaliacoes):
+                regressoes.append(f"{rotulo}: avaliações até o alvo "
+                                  f"{ref['avaliacoes_alvo']} -> {atual['avaliacoes_alvo']}")
+
+        if atual['tempo_s'] > ref['tempo_s'] * (1 + tol_tempo):
+            regressoes.append(f"{rotulo}: tempo {ref['tempo_s']:.3f}s -> {atual['tempo_s']:.3f}s")
+
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark GA x ACO na montagem de provas')
+
+    parser.add_argument('--algos', nargs='+', default=list(ALGORITMOS), choices=list(ALGORITMOS),
+                        help='Algoritmos avaliados')
+    parser.add_argument('--nivel', choices=['materia', 'topico', 'todos'], default='todos',
+                        help='Filtros por matéria, por tópico ou ambos')
+    parser.add_argument('--materias', nargs='+', default=None, help='Restringe às matérias informadas')
+    parser.add_argument('--seeds', nargs='+', type=int, default=[42], help='Sementes')
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=[5000], help='Tamanhos do banco')
+    parser.add_argument('--alvo', type=float, default=750.0, help='Fitness alvo para o time-to-target')
+    parser.add_argument('--params', type=str, default=None,
+                        help='JSON com parâmetros por algoritmo, ex: \'{"ga": {"gens": 100}}\'')
+    parser.add_argument('--sem-memoria', action='store_true',
+                        help='Não mede o pico de memória (evita a segunda execução com tracemalloc)')
+    parser.add_argument('--saida', type=str, default=SAIDA_PADRAO, help='Prefixo dos arquivos CSV/JSON')
+
+    # Modo de comparação
+    parser.add_argument('--comparar', type=str, default=None, help='JSON de baseline para comparação')
+    parser.add_argument('--tol-fitness', type=float, default=1.0, help='Queda máxima de fitness (pontos)')
+    parser.add_argument('--tol-tempo', type=float, default=0.25, help='Aumento máximo de tempo (fração)')
+    parser.add_argument('--tol-avaliacoes', type=float, default=0.10,
+                        help='Aumento máximo de avaliações até o alvo (fração)')
+
+    args = parser.parse_args()
+
+    filtros = listar_filtros(args.nivel, args.materias)
+    params = json.loads(args.params) if args.params else None
+
+    print(f"Benchmark: {len(args.algos)} algoritmo(s) x {len(filtros)} filtro(s) x "
+          f"{len(args.seeds)} semente(s) x {len(args.tamanhos)} tamanho(s) de banco")
+
+    resultados = rodar_matriz(args.algos, filtros, args.seeds, args.tamanhos, args.alvo,
+                              medir_memoria=not args.sem_memoria, params=params)
+    salvar_resultados(resultados, args.saida)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+        regressoes = comparar_com_baseline(resultados, baseline, args.tol_fitness,
+                                           args.tol_tempo, args.tol_avaliacoes)
+        print("\n" + "=" * 40)
+        print(" COMPARAÇÃO COM A BASELINE")
+        print("=" * 40)
+        if regressoes:
+            for r in regressoes:
+                print(f"REGRESSÃO: {r}")
+            print(f"\n{len(regressoes)} regressão(ões) encontrada(s).")
+            sys.exit(1)
+        print("Nenhuma regressão encontrada.")
+
+
+if __name__ == "__main__":
+    main()
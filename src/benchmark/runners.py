@@ -0,0 +1,264 @@
+"""
+Executores padronizados das metaheurísticas (GA e ACO) para o problema de montagem de provas.
+
+Cada executor recebe o banco, o filtro, a semente e um dicionário de parâmetros
+(com os mesmos nomes das flags de `run_ga.py`/`run_aco.py`) e devolve um registro
+com fitness, número de avaliações, tempo de parede, pico de memória e
+tempo/avaliações até atingir o alvo.
+"""
+
+import sys
+import os
+import json
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+# Adiciona o diretório raiz ao path para importar os módulos do projeto
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from common.seeds import criar_geradores
+from src.part3_ga.ga import GA
+from src.part3_ga.hibrido import HibridoACOGA
+from src.part3_ga.problems.exam import BancoDeQuestoes, MATERIAS_TOPICOS, QuestoesInsuficientes
+from src.part3_ga.run_ga import ExamProblem
+from src.part4_swarm_immune.aco import ACO
+from src.part4_swarm_immune.run_aco import ExamProblemACO
+
+
+# Parâmetros padrão de cada algoritmo (mesmos nomes das flags dos scripts)
+PARAMS_PADRAO: Dict[str, Dict[str, Any]] = {
+    'ga': {'pop': 100, 'gens': 50, 'cx': 0.7, 'mut': 0.01, 'adaptativo': False, 'dedup': False,
+           'modo': 'geracional'},
+    'aco': {'ants': 20, 'iters': 20, 'alpha': 1.0, 'beta': 2.0, 'rho': 0.1,
+            'Q': 10.0, 'tau0': 1.0, 'elite': 5.0},
+    # ACO → AG: 'iters' são as iterações da colônia por ciclo; o AG usa 'gens' no total
+    'hibrido': {'pop': 100, 'gens': 50, 'cx': 0.7, 'mut': 0.01, 'adaptativo': False, 'dedup': False,
+                'modo': 'geracional', 'ants': 10, 'iters': 2, 'alpha': 1.0, 'beta': 2.0, 'rho': 0.1,
+                'Q': 10.0, 'tau0': 1.0, 'elite': 5.0, 'fracao': 1.0, 'ciclos': 1, 'retorno': False},
+}
+
+
+class Rastreador:
+    """
+    Envolve uma função de fitness contando avaliações e registrando
+    o instante (tempo e nº de avaliações) em que o alvo foi atingido pela primeira vez.
+    """
+    def __init__(self, fitness_fn: Callable[[Any], float], alvo: Optional[float] = None):
+        self.fitness_fn = fitness_fn
+        self.alvo = alvo
+        self.avaliacoes = 0
+        self.melhor = float('-inf')
+        self.tempo_alvo = None
+        self.avaliacoes_alvo = None
+        self.inicio = time.perf_counter()
+
+    def reiniciar(self):
+        """Zera os contadores (chamado imediatamente antes da execução)."""
+        self.avaliacoes = 0
+        self.melhor = float('-inf')
+        self.tempo_alvo = None
+        self.avaliacoes_alvo = None
+        self.inicio = time.perf_counter()
+
+    def __call__(self, ind: Any) -> float:
+        score = self.fitness_fn(ind)
+        self.avaliacoes += 1
+        if score > self.melhor:
+            self.melhor = score
+            if self.tempo_alvo is None and self.alvo is not None and score >= self.alvo:
+                self.tempo_alvo = time.perf_counter() - self.inicio
+                self.avaliacoes_alvo = self.avaliacoes
+        return score
+
+
+def listar_filtros(nivel: str = 'todos', materias: Optional[List[str]] = None) -> List[tuple]:
+    """
+    Lista os filtros (materia, topico) do banco.
+    nivel: 'materia' (só matérias), 'topico' (só pares matéria/tópico) ou 'todos'.
+    """
+    filtros = []
+    for materia, topicos in MATERIAS_TOPICOS.items():
+        if materias and materia not in materias:
+            continue
+        if nivel in ('materia', 'todos'):
+            filtros.append((materia, None))
+        if nivel in ('topico', 'todos'):
+            filtros.extend((materia, topico) for topico in topicos)
+    return filtros
+
+
+def executar_ga(banco: BancoDeQuestoes, materia: str, topico: Optional[str], seed: int,
+                params: Dict[str, Any], rastreador_fn: Callable[[Callable], Rastreador],
+                metas: Optional[Dict[str, Any]] = None):
+    """
+    Monta e executa o GA. Retorna (melhor_solucao, problema, rastreador).
+    `metas` sobrescreve as metas da prova (tamanho, tempo_min, tempo_max, dificuldade_alvo).
+    """
+    rng_problema, rng_ga = criar_geradores(seed, 2)
+    problem = ExamProblem(materia, topico, banco, verbose=False, rng=rng_problema, **(metas or {}))
+    rastreador = rastreador_fn(problem.fitness)
+    rastreador.reiniciar()
+    ga = GA(
+        pop_size=params['pop'],
+        fitness_fn=rastreador,
+        create_ind=problem.create_ind,
+        mutate_fn=problem.mutate,
+        crossover_fn=problem.crossover,
+        cx_rate=params['cx'],
+        mut_rate=params['mut'],
+        elitism=True,
+        rng=rng_ga,
+        key_fn=problem.chave,
+        adaptativo=params['adaptativo'],
+        deduplicar=params['dedup'],
+        modo=params['modo']
+    )
+    best = ga.run(n_generations=params['gens'], verbose=False)
+    return best, problem, rastreador
+
+
+def executar_aco(banco: BancoDeQuestoes, materia: str, topico: Optional[str], seed: int,
+                 params: Dict[str, Any], rastreador_fn: Callable[[Callable], Rastreador],
+                 metas: Optional[Dict[str, Any]] = None):
+    """Monta e executa o ACO. Retorna (melhor_solucao, problema, rastreador)."""
+    problem = ExamProblemACO(materia, topico, banco, verbose=False, **(metas or {}))
+    rastreador = rastreador_fn(problem.fitness)
+    rastreador.reiniciar()
+    aco = ACO(
+        n_ants=params['ants'],
+        n_positions=problem.tamanho,
+        n_options=len(problem.questoes_candidatas),
+        fitness_fn=rastreador,
+        heuristica_fn=problem.heuristica,
+        get_valid_options=problem.get_valid_options,
+        update_state=problem.update_state,
+        get_option_id=problem.get_questao_idx,
+        alpha=params['alpha'],
+        beta=params['beta'],
+        rho=params['rho'],
+        Q=params['Q'],
+        tau_zero=params['tau0'],
+        e=params['elite'],
+        seed=seed
+    )
+    best = aco.run(n_iterations=params['iters'], verbose=False)
+    return best, problem, rastreador
+
+
+def executar_hibrido(banco: BancoDeQuestoes, materia: str, topico: Optional[str], seed: int,
+                     params: Dict[str, Any], rastreador_fn: Callable[[Callable], Rastreador],
+                     metas: Optional[Dict[str, Any]] = None):
+    """
+    Monta e executa o pipeline ACO → AG. Retorna (melhor_solucao, problema, rastreador).
+    As avaliações das duas fases passam pelo mesmo rastreador.
+    """
+    rng_problema, rng_ga, rng_aco = criar_geradores(seed, 3)
+    problem = ExamProblem(materia, topico, banco, verbose=False, rng=rng_problema, **(metas or {}))
+    problem_aco = ExamProblemACO(materia, topico, banco, verbose=False, **(metas or {}))
+    rastreador = rastreador_fn(problem.fitness)
+    rastreador.reiniciar()
+    aco = ACO(
+        n_ants=params['ants'],
+        n_positions=problem.tamanho,
+        n_options=len(problem_aco.questoes_candidatas),
+        fitness_fn=rastreador,
+        heuristica_fn=problem_aco.heuristica,
+        get_valid_options=problem_aco.get_valid_options,
+        update_state=problem_aco.update_state,
+        get_option_id=problem_aco.get_questao_idx,
+        alpha=params['alpha'],
+        beta=params['beta'],
+        rho=params['rho'],
+        Q=params['Q'],
+        tau_zero=params['tau0'],
+        e=params['elite'],
+        rng=rng_aco,
+        tamanho_arquivo=params['pop'],
+        chave_fn=problem.chave
+    )
+
+    def criar_ga(populacao_inicial):
+        return GA(
+            pop_size=params['pop'],
+            fitness_fn=rastreador,
+            create_ind=problem.create_ind,
+            mutate_fn=problem.mutate,
+            crossover_fn=problem.crossover,
+            cx_rate=params['cx'],
+            mut_rate=params['mut'],
+            elitism=True,
+            rng=rng_ga,
+            key_fn=problem.chave,
+            adaptativo=params['adaptativo'],
+            deduplicar=params['dedup'],
+            modo=params['modo'],
+            populacao_inicial=populacao_inicial
+        )
+
+    hibrido = HibridoACOGA(aco, criar_ga, params['pop'], iters_aco=params['iters'], fracao=params['fracao'],
+                           ciclos=params['ciclos'], retorno=params['retorno'])
+    best = hibrido.run(n_generations=params['gens'], verbose=False)
+    return best, problem, rastreador
+
+
+ALGORITMOS: Dict[str, Callable] = {
+    'ga': executar_ga,
+    'aco': executar_aco,
+    'hibrido': executar_hibrido,
+}
+
+
+def executar(algoritmo: str, banco: BancoDeQuestoes, materia: str, topico: Optional[str],
+             seed: int, params: Optional[Dict[str, Any]] = None, alvo: Optional[float] = None,
+             medir_memoria: bool = True) -> Dict[str, Any]:
+    """
+    Executa uma célula (algoritmo, filtro, semente, parâmetros) e devolve o registro de métricas.
+
+    O tempo de parede é medido sem o tracemalloc ligado; se `medir_memoria` for True,
+    a mesma célula (mesma semente) é repetida com o tracemalloc para obter o pico de memória.
+    """
+    params = {**PARAMS_PADRAO[algoritmo], **(params or {})}
+    executor = ALGORITMOS[algoritmo]
+
+    registro = {
+        'algoritmo': algoritmo,
+        'materia': materia,
+        'topico': topico or '',
+        'tamanho_banco': banco.tamanho,
+        'seed': seed,
+        'alvo': alvo,
+        'params': json.dumps(params, sort_keys=True),
+    }
+
+    try:
+        inicio = time.perf_counter()
+        best, problem, rastreador = executor(banco, materia, topico, seed, params,
+                                             lambda fn: Rastreador(fn, alvo))
+        tempo = time.perf_counter() - inicio
+    except QuestoesInsuficientes:
+        # Filtro com questões insuficientes para este tamanho de banco (outros erros propagam)
+        registro.update({'status': 'insuficiente', 'n_candidatas': len(banco.filtrar(materia, topico))})
+        return registro
+
+    pico_kb = None
+    if medir_memoria:
+        tracemalloc.start()
+        executor(banco, materia, topico, seed, params, lambda fn: Rastreador(fn, alvo))
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        pico_kb = pico / 1024
+
+    registro.update({
+        'status': 'ok',
+        'n_candidatas': len(problem.questoes_candidatas),
+        'melhor_fitness': problem.fitness(best),
+        'avaliacoes': rastreador.avaliacoes,
+        'tempo_s': tempo,
+        'pico_memoria_kb': pico_kb,
+        'atingiu_alvo': rastreador.tempo_alvo is not None,
+        'tempo_alvo_s': rastreador.tempo_alvo,
+        'avaliacoes_alvo': rastreador.avaliacoes_alvo,
+        'melhor_ids': ' '.join(str(q.id) for q in best),
+    })
+    return registro
@@ -0,0 +1,134 @@
+"""
+Orçamento de inicialização das CLIs do GA e do ACO.
+
+Para cada ponto de entrada mede, em processos novos:
+- interpretador: `python -c pass` (piso comum a todos);
+- imports: soma dos módulos de topo em `python -X importtime <script> --help`;
+- primeira geração: tempo de parede de `<script> <args de 1 geração/iteração>`
+  (interpretador + imports + banco + população inicial + 1 geração).
+
+Cada medida é a melhor de --repeticoes execuções. Sai com código 1 se algum
+limite (em ms) for ultrapassado.
+
+Exemplos:
+    python3 src/benchmark/startup.py
+    python3 src/benchmark/startup.py --limites limites.json --repeticoes 10
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'))
+
+# Script e argumentos de uma execução curta (1 geração / 1 iteração) de cada ponto de entrada
+PONTOS_DE_ENTRADA: Dict[str, Tuple[str, List[str]]] = {
+    'run_ga': ('src/part3_ga/run_ga.py', ['--gens', '1']),
+    'run_aco': ('src/part4_swarm_immune/run_aco.py', ['--iters', '1', '--ants', '1']),
+}
+
+# Limites padrão (ms); um arquivo JSON com o mesmo formato sobrescreve por ponto de entrada
+LIMITES_MS: Dict[str, Dict[str, float]] = {
+    'run_ga': {'imports': 120.0, 'primeira_geracao': 250.0},
+    'run_aco': {'imports': 120.0, 'primeira_geracao': 250.0},
+}
+
+
+def _melhor_tempo_ms(cmd: List[str], repeticoes: int) -> float:
+    """Menor tempo de parede (ms) de `cmd` em `repeticoes` execuções."""
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        subprocess.run(cmd, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        melhor = min(melhor, (time.perf_counter() - inicio) * 1000)
+    return melhor
+
+
+def medir_imports(script: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Tempo total de imports (ms) de `script --help` e os módulos de topo mais caros.
+    Só as linhas de profundidade zero do -X importtime entram na soma (o acumulado
+    delas já inclui os submódulos).
+    """
+    saida = subprocess.run([sys.executable, '-X', 'importtime', script, '--help'], cwd=RAIZ,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True).stderr
+    topo = []
+    for linha in saida.splitlines():
+        if not linha.startswith('import time:') or 'cumulative' in linha:
+            continue
+        _, acumulado, nome = linha.split('|')
+        if not nome.startswith('  '):
+            topo.append((nome.strip(), int(acumulado) / 1000))
+    return sum(ms for _, ms in topo), sorted(topo, key=lambda t: -t[1])[:5]
+
+
+def medir(pontos: Dict[str, Tuple[str, List[str]]], repeticoes: int = 5) -> Dict[str, Dict[str, float]]:
+    """Mede interpretador, imports e primeira geração de cada ponto de entrada."""
+    interpretador = _melhor_tempo_ms([sys.executable, '-c', 'pass'], repeticoes)
+    resultados = {}
+    for nome, (script, args) in pontos.items():
+        # Aquece o cache de bytecode e o snapshot do banco antes de medir
+        _melhor_tempo_ms([sys.executable, script] + args, 1)
+        imports = min(medir_imports(script)[0] for _ in range(repeticoes))
+        resultados[nome] = {
+            'interpretador': interpretador,
+            'imports': imports,
+            'primeira_geracao': _melhor_tempo_ms([sys.executable, script] + args, repeticoes),
+            'top_imports': medir_imports(script)[1],
+        }
+    return resultados
+
+
+def verificar_limites(resultados: Dict[str, Dict[str, float]], limites: Dict[str, Dict[str, float]]) -> List[str]:
+    """Lista de limites ultrapassados."""
+    violacoes = []
+    for nome, medidas in resultados.items():
+        for metrica, limite in limites.get(nome, {}).items():
+            if medidas[metrica] > limite:
+                violacoes.append(f"{nome}: {metrica} {medidas[metrica]:.1f}ms > limite {limite:.1f}ms")
+    return violacoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Tempo de inicialização das CLIs do GA e do ACO')
+    parser.add_argument('--pontos', nargs='+', choices=list(PONTOS_DE_ENTRADA), default=list(PONTOS_DE_ENTRADA),
+                        help='Pontos de entrada medidos')
+    parser.add_argument('--repeticoes', type=int, default=5, help='Execuções por medida (vale a melhor)')
+    parser.add_argument('--limites', type=str, default=None, help='JSON com limites em ms por ponto de entrada')
+    parser.add_argument('--saida', type=str, default=None, help='Salva as medidas em JSON')
+    args = parser.parse_args()
+
+    limites = {nome: dict(v) for nome, v in LIMITES_MS.items()}
+    if args.limites:
+        with open(args.limites) as f:
+            for nome, v in json.load(f).items():
+                limites.setdefault(nome, {}).update(v)
+
+    resultados = medir({n: PONTOS_DE_ENTRADA[n] for n in args.pontos}, args.repeticoes)
+
+    print(f"{'ponto de entrada':<18} {'interpretador':>14} {'imports':>10} {'1ª geração':>12}")
+    for nome, m in resultados.items():
+        print(f"{nome:<18} {m['interpretador']:>12.1f}ms {m['imports']:>8.1f}ms {m['primeira_geracao']:>10.1f}ms")
+        print("    imports mais caros: " + ", ".join(f"{mod} {ms:.1f}ms" for mod, ms in m['top_imports']))
+
+    if args.saida:
+        os.makedirs(os.path.dirname(args.saida) or '.', exist_ok=True)
+        with open(args.saida, 'w') as f:
+            json.dump(resultados, f, indent=2)
+        print(f"Medidas salvas em: {args.saida}")
+
+    violacoes = verificar_limites(resultados, limites)
+    if violacoes:
+        for v in violacoes:
+            print(f"  LIMITE: {v}")
+        print(f"\n{len(violacoes)} limite(s) ultrapassado(s).")
+        sys.exit(1)
+    print("Dentro do orçamento de inicialização.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Varredura (sweep) de hiperparâmetros do GA e do ACO em paralelo e retomável.
+
+Cada célula (algoritmo, parâmetros, filtro, semente) é identificada por um hash
+e seu resultado é anexado a um arquivo JSONL assim que termina. Uma varredura
+interrompida ou repetida pula as células já concluídas. O mesmo arquivo responde
+à consulta "melhor configuração para este filtro".
+
+Exemplos:
+    # Grade pela linha de comando
+    python3 src/benchmark/sweep.py run --algo ga --grade pop=50,100 cx=0.6,0.8 mut=0.01,0.1 \\
+        --materia Física --topico Cinemática --seeds 1 2 3 --workers 4
+
+    # Especificação em JSON (grade ou busca aleatória)
+    python3 src/benchmark/sweep.py run --spec sweep_aco.json
+
+    # Melhor configuração para um filtro
+    python3 src/benchmark/sweep.py melhor --algo ga --materia Física --topico Cinemática
+
+Formato do JSON de especificação:
+    {
+        "algoritmo": "aco",
+        "modo": "aleatorio",               # "grade" (padrão) ou "aleatorio"
+        "n_amostras": 20,                  # só no modo aleatório
+        "seed_busca": 0,                   # sorteio reprodutível das configurações
+        "params": {
+            "ants": [10, 20, 40],                      # lista: valores discretos
+            "alpha": {"min": 0.5, "max": 3.0},         # intervalo contínuo (uniforme)
+            "rho": {"min": 0.01, "max": 0.5, "log": true}
+        },
+        "filtros": [["Física", "Cinemática"], ["Química", null]],
+        "seeds": [1, 2, 3],
+        "tamanho_banco": 5000,
+        "alvo": 750
+    }
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import random
+import sys
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+# Adiciona o diretório raiz ao path para importar os módulos do projeto
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from src.benchmark.runners import ALGORITMOS, PARAMS_PADRAO, executar
+from src.part3_ga.problems.exam import BancoDeQuestoes
+
+STORE_PADRAO = 'reports/sweeps/resultados.jsonl'
+
+# Bancos já gerados no processo (cada worker gera o seu uma única vez por tamanho)
+_BANCOS: Dict[int, BancoDeQuestoes] = {}
+
+
+def chave_celula(algoritmo: str, params: Dict[str, Any], materia: str,
+                 topico: Optional[str], seed: int, tamanho_banco: int) -> str:
+    """Hash estável que identifica uma célula da varredura."""
+    conteudo = json.dumps([algoritmo, params, materia, topico or '', seed, tamanho_banco],
+                          sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+def _converter_valor(texto: str):
+    """Converte '50' -> 50, '0.7' -> 0.7; mantém texto caso contrário."""
+    for tipo in (int, float):
+        try:
+            return tipo(texto)
+        except ValueError:
+            pass
+    return texto
+
+
+def gerar_configuracoes(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expande a especificação em uma lista de configurações de parâmetros.
+    Modo 'grade': produto cartesiano das listas.
+    Modo 'aleatorio': `n_amostras` sorteios reprodutíveis (semente `seed_busca`).
+    """
+    espaco = spec['params']
+    nomes = sorted(espaco)
+
+    if spec.get('modo', 'grade') == 'grade':
+        listas = [espaco[n] if isinstance(espaco[n], list) else [espaco[n]] for n in nomes]
+        return [dict(zip(nomes, valores)) for valores in itertools.product(*listas)]
+
+    rng = random.Random(spec.get('seed_busca', 0))
+    configs = []
+    for _ in range(spec.get('n_amostras', 10)):
+        config = {}
+        for n in nomes:
+            dominio = espaco[n]
+            if isinstance(dominio, list):
+                config[n] = rng.choice(dominio)
+            elif isinstance(dominio, dict):
+                lo, hi = dominio['min'], dominio['max']
+                if dominio.get('log'):
+                    valor = math.exp(rng.uniform(math.log(lo), math.log(hi)))
+                else:
+                    valor = rng.uniform(lo, hi)
+                config[n] = int(round(valor)) if isinstance(lo, int) and isinstance(hi, int) else valor
+            else:
+                config[n] = dominio
+        configs.append(config)
+    return configs
+
+
+def gerar_celulas(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Cruza configurações x filtros x sementes, já com os parâmetros completos e a chave."""
+    algoritmo = spec['algoritmo']
+    tamanho = spec.get('tamanho_banco', 5000)
+    celulas = []
+    for config in gerar_configuracoes(spec):
+        params = {**PARAMS_PADRAO[algoritmo], **config}
+        for materia, topico in spec['filtros']:
+            for seed in spec.get('seeds', [42]):
+                celulas.append({
+                    'chave': chave_celula(algoritmo, params, materia, topico, seed, tamanho),
+                    'algoritmo': algoritmo,
+                    'params': params,
+                    'materia': materia,
+                    'topico': topico,
+                    'seed': seed,
+                    'tamanho_banco': tamanho,
+                    'alvo': spec.get('alvo'),
+                })
+    return celulas
+
+
+def carregar_store(caminho: str) -> List[Dict[str, Any]]:
+    """Lê os resultados já salvos (linhas incompletas de uma interrupção são ignoradas)."""
+    if not os.path.exists(caminho):
+        return []
+    resultados = []
+    with open(caminho, encoding='utf-8') as f:
+        for linha in f:
+            try:
+                resultados.append(json.loads(linha))
+            except json.JSONDecodeError:
+                continue
+    return resultados
+
+
+def _executar_celula(celula: Dict[str, Any]) -> Dict[str, Any]:
+    """Executa uma célula no processo worker."""
+    tamanho = celula['tamanho_banco']
+    if tamanho not in _BANCOS:
+        _BANCOS[tamanho] = BancoDeQuestoes(tamanho=tamanho)
+
+    registro = executar(celula['algoritmo'], _BANCOS[tamanho], celula['materia'], celula['topico'],
+                        celula['seed'], celula['params'], celula['alvo'], medir_memoria=False)
+    registro['chave'] = celula['chave']
+    registro['params'] = celula['params']
+    return registro
+
+
+def rodar_sweep(spec: Dict[str, Any], store: str = STORE_PADRAO, workers: Optional[int] = None):
+    """Executa as células pendentes da especificação em um pool de processos."""
+    celulas = gerar_celulas(spec)
+    concluidas = {r['chave'] for r in carregar_store(store)}
+    pendentes = [c for c in celulas if c['chave'] not in concluidas]
+
+    print(f"Sweep {spec['algoritmo']}: {len(celulas)} célula(s), "
+          f"{len(celulas) - len(pendentes)} já concluída(s), {len(pendentes)} pendente(s)")
+    if not pendentes:
+        return
+
+    os.makedirs(os.path.dirname(store) or '.', exist_ok=True)
+    with open(store, 'a', encoding='utf-8') as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = [pool.submit(_executar_celula, c) for c in pendentes]
+        for n, futuro in enumerate(as_completed(futuros), start=1):
+            registro = futuro.result()
+            # Grava e descarrega imediatamente: a célula fica concluída mesmo se o sweep for interrompido
+            f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+            f.flush()
+            if registro['status'] == 'ok':
+                print(f"[{n}/{len(pendentes)}] {registro['materia']}/{registro['topico'] or '*'} "
+                      f"seed={registro['seed']} fitness={registro['melhor_fitness']:.2f} "
+                      f"params={json.dumps(registro['params'], sort_keys=True)}")
+            else:
+                print(f"[{n}/{len(pendentes)}] {registro['materia']}/{registro['topico'] or '*'} "
+                      f"-> {registro['status']}")
+
+
+def melhores_configs(resultados: List[Dict[str, Any]], algoritmo: str, materia: str,
+                     topico: Optional[str] = None, tamanho_banco: Optional[int] = None,
+                     top: int = 5) -> List[Dict[str, Any]]:
+    """
+    Agrega os resultados do filtro por configuração (média sobre as sementes)
+    e retorna as `top` melhores, ordenadas por fitness médio e depois por tempo.
+    """
+    grupos: Dict[str, List[Dict[str, Any]]] = {}
+    for r in resultados:
+        if (r['algoritmo'] != algoritmo or r['status'] != 'ok'
+                or r['materia'].lower() != materia.lower()
+                or (r['topico'] or '').lower() != (topico or '').lower()
+                or (tamanho_banco is not None and r['tamanho_banco'] != tamanho_banco)):
+            continue
+        grupos.setdefault(json.dumps(r['params'], sort_keys=True), []).append(r)
+
+    resumo = []
+    for params, runs in grupos.items():
+        n = len(runs)
+        resumo.append({
+            'params': json.loads(params),
+            'n_seeds': n,
+            'fitness_medio': sum(r['melhor_fitness'] for r in runs) / n,
+            'fitness_min': min(r['melhor_fitness'] for r in runs),
+            'avaliacoes_medias': sum(r['avaliacoes'] for r in runs) / n,
+            'tempo_medio_s': sum(r['tempo_s'] for r in runs) / n,
+            'taxa_alvo': sum(bool(r['atingiu_alvo']) for r in runs) / n,
+        })
+
+    resumo.sort(key=lambda x: (-x['fitness_medio'], x['tempo_medio_s']))
+    return resumo[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sweep de hiperparâmetros para GA e ACO')
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_run = sub.add_parser('run', help='Executa (ou retoma) uma varredura')
+    p_run.add_argument('--spec', type=str, default=None, help='Arquivo JSON de especificação')
+    p_run.add_argument('--algo', choices=list(ALGORITMOS), default='ga', help='Algoritmo (sem --spec)')
+    p_run.add_argument('--grade', nargs='+', default=[],
+                       help='Grade no formato nome=v1,v2 (ex: pop=50,100 cx=0.6,0.8)')
+    p_run.add_argument('--materia', type=str, default='Física', help='Matéria (sem --spec)')
+    p_run.add_argument('--topico', type=str, default=None, help='Tópico (sem --spec)')
+    p_run.add_argument('--seeds', nargs='+', type=int, default=[42], help='Sementes (sem --spec)')
+    p_run.add_argument('--alvo', type=float, default=750.0, help='Fitness alvo (sem --spec)')
+    p_run.add_argument('--workers', type=int, default=None, help='Processos no pool (padrão: nº de CPUs)')
+    p_run.add_argument('--store', type=str, default=STORE_PADRAO, help='Arquivo JSONL de resultados')
+
+    p_best = sub.add_parser('melhor', help='Consulta a melhor configuração para um filtro')
+    p_best.add_argument('--algo', choices=list(ALGORITMOS), required=True)
+    p_best.add_argument('--materia', type=str, required=True)
+    p_best.add_argument('--topico', type=str, default=None)
+    p_best.add_argument('--tamanho-banco', type=int, default=None)
+    p_best.add_argument('--top', type=int, default=5)
+    p_best.add_argument('--store', type=str, default=STORE_PADRAO)
+
+    args = parser.parse_args()
+
+    if args.comando == 'run':
+        if args.spec:
+            with open(args.spec, encoding='utf-8') as f:
+                spec = json.load(f)
+        else:
+            grade = {}
+            for item in args.grade:
+                nome, valores = item.split('=', 1)
+                grade[nome] = [_converter_valor(v) for v in valores.split(',')]
+            spec = {
+                'algoritmo': args.algo,
+                'params': grade,
+                'filtros': [[args.materia, args.topico]],
+                'seeds': args.seeds,
+                'alvo': args.alvo,
+            }
+        rodar_sweep(spec, args.store, args.workers)
+
+    else:
+        melhores = melhores_configs(carregar_store(args.store), args.algo, args.materia,
+                                    args.topico, args.tamanho_banco, args.top)
+        if not melhores:
+            print("Nenhum resultado para este filtro.")
+            return
+        print(f"Melhores configurações: {args.algo} | {args.materia}/{args.topico or '*'}")
+        for i, m in enumerate(melhores, start=1):
+            print(f"{i:02d}. fitness médio={m['fitness_medio']:.2f} (mín {m['fitness_min']:.2f}, "
+                  f"{m['n_seeds']} seed(s)) | avals={m['avaliacoes_medias']:.0f} | "
+                  f"tempo={m['tempo_medio_s']:.3f}s | alvo={m['taxa_alvo']:.0%} | "
+                  f"{json.dumps(m['params'], sort_keys=True)}")
+
+
+if __name__ == "__main__":
+    main()
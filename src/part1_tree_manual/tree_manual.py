@@ -1,4 +1,11 @@
+import os
 import sys 
+import csv
+import json
+import argparse
+from dataclasses import dataclass
+
+import numpy as np
 
 # Estrutura de dados para represetnar a Árvore de decisão 
 # Formato de dicionário
@@ -45,7 +52,7 @@ decision_tree = {
     'res_mobile': ("Área sugerida: Desenvolvimento Mobile (IOS/Android)", None, None),
     'res_ia_research': ("Área sugerida: Cientista de IA/ Pesquisador de Machine Learning", None, None),
     'res_data_eng': ("Área sugerida: Engenharia de Dados e Big Data", None, None),
-    'res_security': ("Área sugerida: Segurança da Informação / Ethical Hacking", None),
+    'res_security': ("Área sugerida: Segurança da Informação / Ethical Hacking", None, None),
     'res_back_java': ("Área sugerida: Desenvolvimento Backend (Java/Enterprise)", None, None),
     'res_back_modern': ("Área sugerida: Desenvolvimento Backend Moderno (Node.js/Python/Go)", None, None),
     'res_robotica': ("Área sugerida: Engenharia de Robótica e Automação", None, None),
@@ -57,50 +64,227 @@ decision_tree = {
                
 }
 
+# Respostas aceitas (entrada interativa e arquivos em lote)
+YES = {'s', 'sim', 'y', 'yes', '1', 'true'}
+NO = {'n', 'não', 'nao', 'no', '0', 'false'}
+
+# Valor usado na matriz de respostas para perguntas não respondidas
+MISSING = -1
+
+
+@dataclass(frozen=True)
+class CompiledTree:
+    """
+    Árvore compilada em arrays planos (um elemento por nó).
+
+    question[i]: índice da pergunta (coluna da matriz de respostas) ou -1 se for folha
+    yes[i], no[i]: índice do nó filho para Sim/Não (-1 nas folhas)
+    leaf[i]: índice do resultado em leaf_ids (-1 nos nós internos)
+    """
+    node_ids: list
+    texts: list
+    question_ids: list
+    leaf_ids: list
+    question: np.ndarray
+    yes: np.ndarray
+    no: np.ndarray
+    leaf: np.ndarray
+    depth: int
+    root: int = 0
+
+
+def compile_tree(tree=None, root='q1'):
+    """
+    Valida o dicionário da árvore e o converte em arrays (CompiledTree).
+
+    Levanta ValueError se um nó não tiver 3 elementos, se um filho não existir,
+    se uma folha tiver só um filho, se houver ciclos ou nós inalcançáveis.
+    """
+    tree = decision_tree if tree is None else tree
+    for node_id, node in tree.items():
+        if not isinstance(node, tuple) or len(node) != 3:
+            raise ValueError(f"Nó '{node_id}' deve ser (texto, id_sim, id_não), recebido: {node!r}")
+        _, yes_id, no_id = node
+        if (yes_id is None) != (no_id is None):
+            raise ValueError(f"Nó '{node_id}' tem só um filho")
+        for child in (yes_id, no_id):
+            if child is not None and child not in tree:
+                raise ValueError(f"Nó '{node_id}' aponta para '{child}', que não existe")
+    if root not in tree:
+        raise ValueError(f"Raiz '{root}' não existe")
+
+    # Percurso a partir da raiz: ordem dos nós, profundidade e detecção de ciclos
+    order, depth = [], 0
+    visited, stack = set(), [(root, 0, ())]
+    while stack:
+        node_id, level, ancestors = stack.pop()
+        if node_id in ancestors:
+            raise ValueError(f"Ciclo na árvore passando por '{node_id}'")
+        if node_id in visited:
+            continue
+        visited.add(node_id)
+        order.append(node_id)
+        depth = max(depth, level)
+        _, yes_id, no_id = tree[node_id]
+        if yes_id is not None:
+            stack.append((no_id, level + 1, ancestors + (node_id,)))
+            stack.append((yes_id, level + 1, ancestors + (node_id,)))
+    unreachable = set(tree) - visited
+    if unreachable:
+        raise ValueError(f"Nós inalcançáveis a partir de '{root}': {sorted(unreachable)}")
+
+    # Colunas da matriz de respostas: perguntas em ordem numérica (q1, q2, ..., q13)
+    question_ids = sorted((n for n in order if tree[n][1] is not None),
+                          key=lambda n: (len(n), n))
+    leaf_ids = [n for n in order if tree[n][1] is None]
+    index = {node_id: i for i, node_id in enumerate(order)}
+
+    n = len(order)
+    question = np.full(n, -1, dtype=np.int32)
+    yes = np.full(n, -1, dtype=np.int32)
+    no = np.full(n, -1, dtype=np.int32)
+    leaf = np.full(n, -1, dtype=np.int32)
+    for i, node_id in enumerate(order):
+        _, yes_id, no_id = tree[node_id]
+        if yes_id is None:
+            leaf[i] = leaf_ids.index(node_id)
+        else:
+            question[i] = question_ids.index(node_id)
+            yes[i], no[i] = index[yes_id], index[no_id]
+
+    return CompiledTree(order, [tree[n][0] for n in order], question_ids, leaf_ids,
+                        question, yes, no, leaf, depth, index[root])
+
+
+def evaluate(compiled, answers):
+    """
+    Avalia uma matriz de respostas (respondentes x perguntas) de uma vez.
+
+    Args:
+        compiled: CompiledTree
+        answers: Matriz com 1 (Sim), 0 (Não) ou MISSING, colunas em compiled.question_ids
+
+    Returns:
+        np.ndarray: Índice do nó final de cada respondente; -1 se faltou uma
+        resposta necessária no caminho
+    """
+    answers = np.asarray(answers, dtype=np.int8)
+    rows = np.arange(len(answers))
+    node = np.full(len(answers), compiled.root, dtype=np.int32)
+    # Cada iteração desce um nível em todos os respondentes ainda em nós internos
+    for _ in range(compiled.depth):
+        active = (node >= 0) & (compiled.question[np.maximum(node, 0)] >= 0)
+        if not active.any():
+            break
+        cur = node[active]
+        answer = answers[rows[active], compiled.question[cur]]
+        node[active] = np.where(answer == MISSING, -1,
+                                np.where(answer == 1, compiled.yes[cur], compiled.no[cur]))
+    return node
+
+
+def parse_answer(value):
+    """Converte uma resposta textual em 1 (Sim), 0 (Não) ou MISSING (vazia)."""
+    value = str(value).strip().lower() if value is not None else ''
+    if value in YES:
+        return 1
+    if value in NO:
+        return 0
+    if value == '':
+        return MISSING
+    raise ValueError(f"Resposta inválida: {value!r}")
+
+
+def read_answers(path, compiled):
+    """
+    Lê respostas de um CSV (cabeçalho com os ids das perguntas, coluna 'id' opcional)
+    ou JSONL (um objeto por linha). Perguntas ausentes ficam como MISSING.
+
+    Returns:
+        ids: Identificador de cada respondente
+        answers: Matriz int8 (respondentes x perguntas)
+    """
+    if path.endswith('.jsonl'):
+        with open(path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(path, newline='', encoding='utf-8') as f:
+            records = list(csv.DictReader(f))
+
+    ids = [str(r.get('id', i + 1)) for i, r in enumerate(records)]
+    answers = np.array([[parse_answer(r.get(q)) for q in compiled.question_ids] for r in records],
+                       dtype=np.int8).reshape(len(records), len(compiled.question_ids))
+    return ids, answers
+
+
+def classify_file(input_path, output_path, compiled=None):
+    """Classifica um arquivo de respostas em lote e grava id, nó final e área sugerida em CSV."""
+    compiled = compiled or compile_tree()
+    ids, answers = read_answers(input_path, compiled)
+    nodes = evaluate(compiled, answers)
+
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'resultado', 'area'])
+        for rid, node in zip(ids, nodes):
+            if node < 0:
+                writer.writerow([rid, '', 'Respostas incompletas'])
+            else:
+                writer.writerow([rid, compiled.node_ids[node], compiled.texts[node]])
+    print(f"{len(ids)} respostas classificadas. Resultado salvo em: {output_path}")
+    return nodes
+
+
 def get_answer(question):
     "Função auxiliar para validar entrada do usuário (Sim/Não)"
     while True:
         #pega o input e normaliza
         response = input(f"{question} [s/n]: ").strip().lower()
         
-        if response in ['s', 'sim', 'y', 'yes', '1']:
+        if response in YES:
             return True
-        elif response in ['n', 'não', 'nao', 'no', '0']:
+        elif response in NO:
             return False
             
         print(">> Entrada inválida. Por favor, digite 's' para Sim ou 'n' para Não")
         
-def run_tree(node_id):
-    #Percorre a árvore de decisão recursivamente
-    
-    #Desempacota o nó atual
-    text, yes_id, no_id = decision_tree[node_id]
+def run_tree(compiled, node=None):
+    #Percorre a árvore compilada, perguntando em cada nó interno
+    node = compiled.root if node is None else node
     
-    #Se for nó folha, mostra o resultado final
-    if yes_id is None and no_id is None:
-        print("\n" + '='*40)
-        print(f"RESULTADO: {text}")
-        print('='*40 + "\n")
-        return
+    while compiled.question[node] >= 0:
+        # Se não é folha, faz a pergunta e decide o próximo passo
+        print(f"\n {compiled.texts[node]}")
+        answer = get_answer("Sua resposta")
+        node = compiled.yes[node] if answer else compiled.no[node]
     
-    # Se não é folha, faz a pergunta e decide o próximo passo
-    print(f"\n {text}")
-    answer = get_answer("Sua resposta")
-    
-    if answer:
-        run_tree(yes_id)
-    else:
-        run_tree(no_id)
+    #Nó folha: mostra o resultado final
+    print("\n" + '='*40)
+    print(f"RESULTADO: {compiled.texts[node]}")
+    print('='*40 + "\n")
+    return compiled.node_ids[node]
         
 def main():
     print("=== Árvore de Decisão: Orientação de Carreira em Computação ===")
     print("Este sistema fará uma série de perguntas para sugerir um caminho profissional.")
     print("Responda com 's' (Sim) ou 'n' (Não).\n")
         
-    # Inicia a recursão pela raiz 'q1'
-    run_tree('q1')
+    # Compila (e valida) a árvore e começa pela raiz 'q1'
+    run_tree(compile_tree())
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Árvore de decisão de orientação de carreira')
+    parser.add_argument('--input', type=str, default=None,
+                        help='Arquivo de respostas (.csv ou .jsonl) para classificar em lote')
+    parser.add_argument('--output', type=str, default='reports/tree_manual_resultados.csv')
+    args = parser.parse_args()
+
+    if args.input:
+        classify_file(args.input, args.output)
+        sys.exit(0)
+
     try:
         main()
     except KeyboardInterrupt:
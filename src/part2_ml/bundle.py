@@ -0,0 +1,52 @@
+"""
+Pacotes de modelo: o pré-processador ajustado (scaler + one-hot), a ordem das
+features e o modelo treinado num único arquivo joblib, suficiente para pontuar
+dados brutos novos (ver predict.py).
+"""
+import os
+import json
+import joblib
+import numpy as np
+
+PROCESSED_PATH = 'data/processed/'
+MODELS_PATH = 'data/models/'
+PREPROCESSOR_FILE = 'preprocessor.joblib'
+FEATURE_NAMES_FILE = 'feature,names.npy'
+
+
+def save_bundle(model, name, processed_path=PROCESSED_PATH, models_path=MODELS_PATH):
+    """
+    Salva `models_path/<name>.joblib` com o pré-processador e a ordem das
+    features gerados pela última execução do preprocess.py.
+
+    Returns:
+        str: Caminho do pacote salvo
+    """
+    with open(os.path.join(processed_path, 'cache.json')) as f:
+        preprocess_key = json.load(f)['key']
+
+    bundle = {
+        'name': name,
+        'preprocess_key': preprocess_key,
+        'preprocessor': joblib.load(os.path.join(processed_path, PREPROCESSOR_FILE)),
+        'feature_names': np.load(os.path.join(processed_path, FEATURE_NAMES_FILE), allow_pickle=True),
+        'model': model,
+    }
+
+    os.makedirs(models_path, exist_ok=True)
+    path = os.path.join(models_path, f'{name}.joblib')
+    joblib.dump(bundle, path)
+    print(f"Modelo salvo em: {path}")
+    return path
+
+
+def load_bundle(path):
+    """
+    Carrega um pacote e confere se o pré-processador produz as features
+    na mesma ordem usada no treino. Levanta ValueError se não bater.
+    """
+    bundle = joblib.load(path)
+    names = bundle['preprocessor'].get_feature_names_out()
+    if list(names) != list(bundle['feature_names']):
+        raise ValueError(f"As features do pré-processador não correspondem às do modelo em {path}")
+    return bundle
@@ -0,0 +1,192 @@
+"""
+Formato consolidado do dataset processado: um único arquivo binário com todos os
+arrays (float32 para as features) e um manifesto JSON com offset, dtype e shape
+de cada um. Os arrays são abertos com memória mapeada (np.memmap), então vários
+processos de treino compartilham as mesmas páginas em vez de copiar os dados.
+"""
+import os
+import json
+import numpy as np
+from scipy import sparse
+
+DATASET_FILE = 'dataset.bin'
+MANIFEST_FILE = 'dataset.json'
+FORMAT_VERSION = 1
+
+# Alinhamento de cada array dentro do arquivo (em bytes)
+ALIGNMENT = 64
+
+
+# Elementos por bloco ao copiar os arrays temporários para o arquivo final
+COPY_BLOCK = 1 << 20
+
+
+class DatasetWriter:
+    """
+    Grava o dataset consolidado bloco a bloco: as linhas de cada matriz (CSR ou
+    densa) e cada vetor de rótulos podem chegar em vários append(), intercalados
+    entre nomes. Cada array vai para um arquivo temporário no próprio diretório e
+    close() os concatena (alinhados) em `dataset.bin` e grava o manifesto, então a
+    memória usada depende do tamanho do bloco e não do tamanho do dataset.
+
+    Args:
+        path: Diretório de saída
+        preprocess_key: Chave do cache do pré-processamento que gerou os dados
+    """
+    def __init__(self, path, preprocess_key):
+        self.path = path
+        self.preprocess_key = preprocess_key
+        self.matrices = {}  # nome -> {'format', 'shape'} (linhas acumuladas; nnz nas CSR)
+        self.labels = {}
+        self.arrays = {}    # nome do array -> {'file', 'path', 'dtype', 'count'}, na ordem de gravação
+
+    def _append_array(self, name, arr):
+        if name not in self.arrays:
+            tmp = os.path.join(self.path, f'.{DATASET_FILE}.{name}.tmp')
+            self.arrays[name] = {'file': open(tmp, 'wb'), 'path': tmp, 'dtype': arr.dtype, 'count': 0}
+        entry = self.arrays[name]
+        entry['file'].write(np.ascontiguousarray(arr, dtype=entry['dtype']).tobytes())
+        entry['count'] += arr.size
+
+    def append(self, name, X):
+        """Anexa um bloco de linhas (CSR ou denso) à matriz `name`."""
+        if sparse.issparse(X):
+            X = X.tocsr()
+        primeiro = name not in self.matrices
+        meta = self.matrices.setdefault(name, {'format': 'csr' if sparse.issparse(X) else 'dense',
+                                               'shape': [0, X.shape[1]], 'nnz': 0})
+        if meta['shape'][1] != X.shape[1]:
+            raise ValueError(f"{name}: bloco com {X.shape[1]} colunas, esperado {meta['shape'][1]}")
+
+        if meta['format'] == 'csr':
+            # Índices em int64 nos temporários; close() reduz para int32 se o nnz total couber
+            indptr = X.indptr.astype(np.int64) + meta['nnz']
+            self._append_array(f'{name}.data', X.data.astype(np.float32))
+            self._append_array(f'{name}.indices', X.indices.astype(np.int64))
+            self._append_array(f'{name}.indptr', indptr if primeiro else indptr[1:])
+            meta['nnz'] += X.nnz
+        else:
+            self._append_array(f'{name}.data', np.asarray(X, dtype=np.float32))
+        meta['shape'][0] += X.shape[0]
+
+    def append_labels(self, name, y):
+        """Anexa um bloco ao vetor de rótulos `name` (int8)."""
+        self.labels[name] = name
+        self._append_array(name, np.asarray(y, dtype=np.int8))
+
+    def _shape_of(self, name, count):
+        matrix, _, _ = name.rpartition('.')
+        meta = self.matrices.get(matrix)
+        if meta is not None and meta['format'] == 'dense':
+            return list(meta['shape'])
+        return [count]
+
+    def close(self):
+        """Concatena os temporários em `dataset.bin` (alinhados) e grava o manifesto."""
+        manifest = {'version': FORMAT_VERSION, 'preprocess_key': self.preprocess_key,
+                    'matrices': {n: {'format': m['format'], 'shape': m['shape']} for n, m in self.matrices.items()},
+                    'labels': self.labels, 'arrays': {}}
+
+        # Índices int32 sempre que couberem: é o dtype que o scipy usa, então não há cópia ao abrir
+        out_dtypes = {}
+        for name, meta in self.matrices.items():
+            if meta['format'] == 'csr':
+                index_dtype = np.dtype(np.int32 if meta['nnz'] < np.iinfo(np.int32).max else np.int64)
+                out_dtypes[f'{name}.indices'] = out_dtypes[f'{name}.indptr'] = index_dtype
+
+        offset = 0
+        with open(os.path.join(self.path, DATASET_FILE), 'wb') as out:
+            for name, entry in self.arrays.items():
+                entry['file'].close()
+                dtype = out_dtypes.get(name, entry['dtype'])
+                pad = -offset % ALIGNMENT
+                out.write(b'\0' * pad)
+                offset += pad
+                with open(entry['path'], 'rb') as f:
+                    for _ in range(0, entry['count'], COPY_BLOCK):
+                        out.write(np.fromfile(f, dtype=entry['dtype'], count=COPY_BLOCK).astype(dtype).tobytes())
+                os.remove(entry['path'])
+                manifest['arrays'][name] = {'offset': offset, 'dtype': dtype.str,
+                                            'shape': self._shape_of(name, entry['count'])}
+                offset += entry['count'] * dtype.itemsize
+        manifest['size_bytes'] = offset
+
+        with open(os.path.join(self.path, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+
+def save_dataset(path, preprocess_key, matrices, labels):
+    """
+    Grava as matrizes de features (float32) e os vetores de rótulos em
+    `path/dataset.bin` e o manifesto em `path/dataset.json`.
+
+    Args:
+        path: Diretório de saída
+        preprocess_key: Chave do cache do pré-processamento que gerou os dados
+        matrices: {nome: matriz CSR ou densa}, ex: {'X_train': ..., 'X_test': ...}
+        labels: {nome: vetor}, ex: {'y_train': ..., 'y_test': ...}
+    """
+    writer = DatasetWriter(path, preprocess_key)
+    for name, X in matrices.items():
+        writer.append(name, X)
+    for name, y in labels.items():
+        writer.append_labels(name, y)
+    writer.close()
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def validate_dataset(path, preprocess_key=None):
+    """
+    Confere se o manifesto corresponde ao arquivo binário e à execução do pré-processamento.
+    Levanta ValueError com a causa se algo não bater.
+    """
+    manifest = read_manifest(path)
+    if manifest.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Versão do dataset {manifest.get('version')} != {FORMAT_VERSION}. "
+                         "Execute novamente o preprocess.py")
+    if preprocess_key is not None and manifest.get('preprocess_key') != preprocess_key:
+        raise ValueError("O dataset não corresponde à última execução do pré-processamento. "
+                         "Execute novamente o preprocess.py")
+    size = os.path.getsize(os.path.join(path, DATASET_FILE))
+    if size != manifest['size_bytes']:
+        raise ValueError(f"Tamanho do {DATASET_FILE} ({size} bytes) difere do manifesto "
+                         f"({manifest['size_bytes']} bytes)")
+    return manifest
+
+
+def open_dataset(path, preprocess_key=None, mmap_mode='r'):
+    """
+    Abre o dataset consolidado. Com mmap_mode (padrão 'r'), os arrays são np.memmap
+    sobre o arquivo e nada é lido até ser usado; mmap_mode=None carrega tudo em memória.
+
+    Returns:
+        dict: {nome: matriz CSR/densa ou vetor de rótulos}
+    """
+    manifest = validate_dataset(path, preprocess_key)
+    file_path = os.path.join(path, DATASET_FILE)
+
+    def array(name):
+        meta = manifest['arrays'][name]
+        if mmap_mode is None:
+            with open(file_path, 'rb') as f:
+                f.seek(meta['offset'])
+                count = int(np.prod(meta['shape']))
+                return np.fromfile(f, dtype=meta['dtype'], count=count).reshape(meta['shape'])
+        return np.memmap(file_path, dtype=meta['dtype'], mode=mmap_mode,
+                         offset=meta['offset'], shape=tuple(meta['shape']))
+
+    data = {}
+    for name, meta in manifest['matrices'].items():
+        if meta['format'] == 'csr':
+            data[name] = sparse.csr_matrix(
+                (array(f'{name}.data'), array(f'{name}.indices'), array(f'{name}.indptr')),
+                shape=tuple(meta['shape']), copy=False)
+        else:
+            data[name] = array(f'{name}.data')
+    for name in manifest['labels']:
+        data[name] = array(name)
+    return data
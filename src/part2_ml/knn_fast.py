@@ -0,0 +1,151 @@
+"""
+Backends rápidos para o KNN.
+
+- BlockedKNN: distâncias euclidianas em float32 calculadas por blocos de linhas
+  de consulta (||a||² - 2a·b + ||b||²), com memória limitada por bloco.
+- Redução de dimensionalidade (PCA ou projeção aleatória) seguida de um índice
+  em árvore (kd_tree), que volta a ser eficiente com poucas dimensões.
+
+Executado como script, mede latência de predição por 1k linhas e acurácia de
+cada configuração.
+"""
+import time
+import argparse
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.decomposition import PCA
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.random_projection import GaussianRandomProjection
+from sklearn.metrics import accuracy_score
+
+from utils_metrics import load_data
+
+# Modos aceitos por build_knn (e pelo --mode do train_knn.py)
+MODES = ('exact', 'blocked', 'pca', 'rp')
+
+
+def _dense32(X):
+    """Converte um bloco (CSR ou denso) para float32 denso contíguo."""
+    if sparse.issparse(X):
+        return X.astype(np.float32).toarray()
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
+class BlockedKNN(ClassifierMixin, BaseEstimator):
+    """
+    KNN força bruta em float32, votando por maioria entre os k vizinhos.
+
+    As consultas são processadas em blocos cujo número de linhas é escolhido para
+    que a matriz de distâncias do bloco caiba em `max_memory_mb`.
+    """
+    def __init__(self, n_neighbors=15, max_memory_mb=64):
+        self.n_neighbors = n_neighbors
+        self.max_memory_mb = max_memory_mb
+
+    def fit(self, X, y):
+        self.X_ = _dense32(X)
+        self.sq_norms_ = np.einsum('ij,ij->i', self.X_, self.X_)
+        self.classes_, self.y_ = np.unique(np.asarray(y), return_inverse=True)
+        return self
+
+    def _block_rows(self):
+        # Cada linha de consulta ocupa n_treino floats na matriz de distâncias
+        return max(1, int(self.max_memory_mb * 2**20 // (4 * len(self.X_))))
+
+    def kneighbors(self, X):
+        """Índices dos k vizinhos mais próximos de cada linha (sem ordenação interna)."""
+        k = self.n_neighbors
+        out = np.empty((X.shape[0], k), dtype=np.intp)
+        step = self._block_rows()
+        for start in range(0, X.shape[0], step):
+            Q = _dense32(X[start:start + step])
+            # ||q||² é constante na linha: não muda a ordem dos vizinhos
+            dist = self.sq_norms_ - 2 * (Q @ self.X_.T)
+            out[start:start + step] = np.argpartition(dist, k - 1, axis=1)[:, :k]
+        return out
+
+    def predict(self, X):
+        votes = self.y_[self.kneighbors(X)]
+        counts = np.stack([(votes == c).sum(axis=1) for c in range(len(self.classes_))], axis=1)
+        return self.classes_[counts.argmax(axis=1)]
+
+
+def build_knn(mode='exact', n_neighbors=15, n_components=20, max_memory_mb=64, n_jobs=-1):
+    """
+    Monta o classificador KNN no modo pedido.
+
+    Args:
+        mode: 'exact' (sklearn, float64), 'blocked' (float32 por blocos),
+              'pca' ou 'rp' (redução para n_components + kd_tree)
+    """
+    if mode == 'exact':
+        return KNeighborsClassifier(n_neighbors=n_neighbors, metric='euclidean', n_jobs=n_jobs)
+    if mode == 'blocked':
+        return BlockedKNN(n_neighbors=n_neighbors, max_memory_mb=max_memory_mb)
+
+    if mode == 'pca':
+        reducer = PCA(n_components=n_components, svd_solver='covariance_eigh', random_state=42)
+    elif mode == 'rp':
+        reducer = GaussianRandomProjection(n_components=n_components, random_state=42)
+    else:
+        raise ValueError(f"Modo de KNN desconhecido: {mode}. Use um de {MODES}")
+    return make_pipeline(reducer, KNeighborsClassifier(n_neighbors=n_neighbors, algorithm='kd_tree',
+                                                       n_jobs=n_jobs))
+
+
+def benchmark(configs, repeat=1):
+    """
+    Ajusta cada configuração e mede a predição no conjunto de teste
+    (repetido `repeat` vezes, para simular um conjunto de pontuação maior).
+
+    Returns:
+        list[dict]: modo, n_components, acurácia, tempo de ajuste e ms por 1k linhas
+    """
+    X_train, X_test, y_train, y_test = load_data()
+    if repeat > 1:
+        X_test = sparse.vstack([X_test] * repeat, format='csr')
+        y_test = np.tile(np.asarray(y_test), repeat)
+
+    rows = []
+    for mode, n_components in configs:
+        model = build_knn(mode, n_components=n_components)
+
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_pred = model.predict(X_test)
+        predict_time = time.perf_counter() - start
+
+        rows.append({'mode': mode, 'n_components': n_components if mode in ('pca', 'rp') else None,
+                     'accuracy': accuracy_score(y_test, y_pred), 'fit_s': fit_time,
+                     'ms_per_1k': 1000 * predict_time / (X_test.shape[0] / 1000)})
+    return rows
+
+
+def print_table(rows):
+    print(f"\n{'modo':<8} {'dims':>5} {'acurácia':>9} {'ajuste (s)':>11} {'ms/1k linhas':>13}")
+    for r in rows:
+        dims = r['n_components'] if r['n_components'] is not None else '-'
+        print(f"{r['mode']:<8} {dims:>5} {r['accuracy']:>9.4f} {r['fit_s']:>11.2f} {r['ms_per_1k']:>13.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Latência x acurácia dos backends de KNN')
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES)
+    parser.add_argument('--components', nargs='+', type=int, default=[10, 20],
+                        help='Dimensões testadas nos modos pca/rp')
+    parser.add_argument('--repeat', type=int, default=1, help='Replica o conjunto de teste N vezes')
+    args = parser.parse_args()
+
+    configs = []
+    for mode in args.modes:
+        if mode in ('pca', 'rp'):
+            configs.extend((mode, n) for n in args.components)
+        else:
+            configs.append((mode, None))
+    print_table(benchmark(configs, args.repeat))
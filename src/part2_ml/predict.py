@@ -0,0 +1,99 @@
+"""
+Pontuação em lote de um CSV bruto (mesmo formato do adult.csv, com ou sem a
+coluna income) usando um pacote salvo pelos scripts de treino.
+
+O CSV é lido em blocos: cada bloco é transformado de forma vetorizada pelo
+pré-processador do pacote, pontuado e anexado ao arquivo de saída, então a
+memória usada depende do tamanho do bloco e não do tamanho do arquivo.
+
+Uso:
+    python src/part2_ml/predict.py --model data/models/tree.joblib \
+        --input data/raw/adult.csv --output reports/predictions.csv
+"""
+import os
+import time
+import warnings
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from bundle import load_bundle, MODELS_PATH
+from utils_metrics import ConfusionMetrics, print_metrics_summary
+from preprocess import COLUMNS, NUMERIC_COLS, CATEGORICAL_COLS, DTYPES
+
+CHUNKSIZE = 100_000
+
+
+def _columns_of(path):
+    """Colunas presentes no CSV: com ou sem a coluna alvo (income) no final."""
+    with open(path) as f:
+        n_fields = len(f.readline().split(','))
+    if n_fields not in (len(COLUMNS), len(COLUMNS) - 1):
+        raise ValueError(f"{path}: esperado {len(COLUMNS) - 1} ou {len(COLUMNS)} colunas, "
+                         f"encontrado {n_fields}")
+    return COLUMNS[:n_fields]
+
+
+def iter_predictions(bundle, path, chunksize=CHUNKSIZE):
+    """
+    Gera (bloco bruto, predições) para cada bloco do CSV.
+
+    Categorias desconhecidas ou ausentes ('?') ficam sem coluna ativa no one-hot;
+    valores numéricos ausentes recebem a média do treino (zero após o escalonamento).
+    """
+    preprocessor, model = bundle['preprocessor'], bundle['model']
+    num_means = dict(zip(NUMERIC_COLS, preprocessor.named_transformers_['num'].mean_))
+
+    columns = _columns_of(path)
+    reader = pd.read_csv(path, names=columns, dtype={c: DTYPES[c] for c in columns}, na_values='?',
+                         skipinitialspace=True, engine='c', chunksize=chunksize)
+    for chunk in reader:
+        X = chunk[NUMERIC_COLS + CATEGORICAL_COLS].fillna(num_means)
+        with warnings.catch_warnings():
+            # Ausentes viram categorias desconhecidas: esperado, não precisa avisar a cada bloco
+            warnings.filterwarnings('ignore', message='Found unknown categories')
+            X_scaled = preprocessor.transform(X).astype(np.float32)
+        yield chunk, model.predict(X_scaled)
+
+
+def predict_csv(model_path, input_path, output_path, chunksize=CHUNKSIZE):
+    bundle = load_bundle(model_path)
+    print(f"Modelo '{bundle['name']}' carregado de {model_path}")
+
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    # Se o CSV tiver a coluna income, as métricas são acumuladas bloco a bloco
+    engine = ConfusionMetrics()
+    labeled = False
+
+    start = time.perf_counter()
+    n_rows = 0
+    for i, (chunk, y_pred) in enumerate(iter_predictions(bundle, input_path, chunksize)):
+        pd.DataFrame({'prediction': y_pred}).to_csv(output_path, mode='w' if i == 0 else 'a',
+                                                    header=(i == 0), index=False)
+        if 'income' in chunk:
+            labeled = True
+            y_true = chunk['income'].astype(str).str.contains('>50').astype(np.int8)
+            engine.update(y_true.values, y_pred)
+        n_rows += len(chunk)
+    elapsed = time.perf_counter() - start
+
+    print(f"{n_rows} linhas pontuadas em {elapsed:.2f}s ({n_rows / elapsed:.0f} linhas/s)")
+    print(f"Predições salvas em: {output_path}")
+    if labeled:
+        print_metrics_summary(None, None, bundle['name'], engine=engine)
+    return n_rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Pontua um CSV bruto com um modelo salvo')
+    parser.add_argument('--model', type=str, default=os.path.join(MODELS_PATH, 'tree.joblib'),
+                        help='Pacote gerado pelos scripts de treino')
+    parser.add_argument('--input', type=str, required=True, help='CSV bruto (formato adult.csv)')
+    parser.add_argument('--output', type=str, default='reports/predictions.csv')
+    parser.add_argument('--chunksize', type=int, default=CHUNKSIZE, help='Linhas por bloco')
+    args = parser.parse_args()
+
+    predict_csv(args.model, args.input, args.output, args.chunksize)
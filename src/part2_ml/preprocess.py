@@ -1,92 +1,279 @@
-import pandas as pd 
+import pandas as pd
 import numpy as np
-import os 
+import os
+import json
+import hashlib
+import joblib
+from sklearn.compose import ColumnTransformer
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from dataset import DatasetWriter, save_dataset, DATASET_FILE, MANIFEST_FILE
 
-RAW_PATH = 'data/raw/adult.data'
+RAW_PATH = 'data/raw/adult.csv'
 PROCESSED_PATH = 'data/processed/'
+CACHE_FILE = 'cache.json'
+
+# Versão do pré-processamento: mudar invalida o cache dos artefatos
+PREPROCESS_VERSION = 4
+PREPROCESS_PARAMS = {'test_size': 0.3, 'random_state': 42, 'drop_first': True}
 
 COLUMNS = [
-    'age', 'workclass', 'fnlwgt', 'education', 'education-num', 
-    'marital-status', 'occupation', 'relationship', 'race', 'sex', 
+    'age', 'workclass', 'fnlwgt', 'education', 'education-num',
+    'marital-status', 'occupation', 'relationship', 'race', 'sex',
     'capital-gain', 'capital-loss', 'hours-per-week', 'native-country', 'income'
-] 
+]
 
+NUMERIC_COLS = ['age', 'fnlwgt', 'education-num', 'capital-gain', 'capital-loss', 'hours-per-week']
+CATEGORICAL_COLS = [c for c in COLUMNS if c not in NUMERIC_COLS and c != 'income']
 
-def load_and_clean_data():
-    print("Loading data...")
-    
-    df = pd.read_csv(RAW_PATH, names=COLUMNS,sep=',\s' ,na_values='?', engine='python')
-    
-    print("Initial data shape:", df.shape)
-    
+# Tipos explícitos: evita a inferência e guarda textos repetidos como 'category'
+DTYPES = {**{c: 'int64' for c in NUMERIC_COLS}, **{c: 'category' for c in CATEGORICAL_COLS}, 'income': 'category'}
+
+ARTIFACTS = [DATASET_FILE, MANIFEST_FILE, 'y_train.npy', 'y_test.npy', 'feature,names.npy', 'preprocessor.joblib']
+
+
+def _read_raw(path, chunksize=None):
+    """
+    Lê o CSV bruto com o parser C (skipinitialspace no lugar do separador regex ',\\s').
+    Com chunksize, devolve um iterador de blocos para arquivos maiores que a memória de uma leitura.
+    """
+    return pd.read_csv(path, names=COLUMNS, dtype=DTYPES, na_values='?', skipinitialspace=True,
+                       engine='c', chunksize=chunksize)
+
+
+def _clean_chunk(df):
+    """Remove nulos e codifica o alvo de um bloco (ou do arquivo inteiro)."""
+    df = df.dropna()
+    # Categorias que só apareciam em linhas removidas não viram colunas no one-hot
+    df = df.assign(**{c: df[c].cat.remove_unused_categories() for c in CATEGORICAL_COLS})
+
+    # Codificação da Variável Alvo (Target)
+    # Normaliza espaços e case nas categorias (poucas) em vez de em cada linha
+    income = df['income'].cat.rename_categories(lambda x: x.strip().lower())
+    df = df.assign(income=income.astype(str).str.contains('>50').astype('int8'))
+    return df
+
+
+def _clean_chunks(path, chunksize):
+    """Blocos já limpos do CSV bruto, na ordem do arquivo."""
+    for chunk in _read_raw(path, chunksize):
+        yield _clean_chunk(chunk)
+
+
+def _report(missing_before, n_rows, y):
     # Tratamento de Nulos
-    missing_before = df.isnull().sum().sum()
-    df.dropna(inplace=True)
     print(f"Linhas com nulos removidas: {missing_before} dados faltantes tratados.")
-    print("Data shape after dropping NAs:", df.shape)
-    
-    # Codificação da Variável Alvo (Target)
-    # Normaliza espaços e case para garantir que capture todas as variações
-    df['income'] = df['income'].str.strip().str.lower()
-    df['income'] = df['income'].apply(lambda x: 1 if '>50k' in x or '>50' in x else 0)
-    
+    print("Data shape after dropping NAs:", (n_rows, len(COLUMNS)))
+
     # Verificar distribuição das classes
     print(f"\nDistribuição da variável alvo:")
-    print(df['income'].value_counts())
-    print(f"Proporção: {df['income'].mean():.4f} para classe 1 (>50k)")
-    
+    print(pd.Series(y, name='income').value_counts())
+    print(f"Proporção: {y.mean():.4f} para classe 1 (>50k)")
+
+
+def load_and_clean_data(path=RAW_PATH):
+    print("Loading data...")
+    df = _read_raw(path)
+    print("Initial data shape:", df.shape)
+    missing_before = int(df.isnull().sum().sum())
+    df = _clean_chunk(df)
+    _report(missing_before, len(df), df['income'].to_numpy())
     return df
 
 
-def preprocess_data():
-    if not os.path.exists(PROCESSED_PATH):
-        os.makedirs(PROCESSED_PATH)
-        
-    df = load_and_clean_data()
-    
+def _scan_chunks(path, chunksize):
+    """
+    1ª passada do modo em blocos: categorias presentes após a limpeza (ordenadas,
+    como no union_categoricals) e o vetor alvo. Só o alvo (int8) fica em memória.
+
+    Returns:
+        categories: {coluna categórica: lista de categorias}
+        y: Alvo de todas as linhas mantidas, na ordem do arquivo
+    """
+    print("Loading data...")
+    categories = {c: set() for c in CATEGORICAL_COLS}
+    ys = []
+    missing_before = total_rows = 0
+    for chunk in _read_raw(path, chunksize):
+        total_rows += len(chunk)
+        missing_before += int(chunk.isnull().sum().sum())
+        chunk = _clean_chunk(chunk)
+        for c in CATEGORICAL_COLS:
+            categories[c].update(chunk[c].cat.categories)
+        ys.append(chunk['income'].to_numpy())
+    y = np.concatenate(ys)
+    print(f"Initial data shape: ({total_rows}, {len(COLUMNS)}) em {len(ys)} bloco(s)")
+    _report(missing_before, len(y), y)
+    return {c: sorted(v) for c, v in categories.items()}, y
+
+
+def _file_hash(path, block_size=1 << 20):
+    """SHA-256 do arquivo bruto, lido em blocos de 1 MiB."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def cache_key(path=RAW_PATH):
+    """Chave do cache: hash do arquivo bruto + parâmetros e versão do pré-processamento."""
+    params = json.dumps({'version': PREPROCESS_VERSION, **PREPROCESS_PARAMS}, sort_keys=True)
+    return hashlib.sha256((_file_hash(path) + params).encode()).hexdigest()
+
+
+def _cache_is_valid(key):
+    cache_path = os.path.join(PROCESSED_PATH, CACHE_FILE)
+    if not os.path.exists(cache_path):
+        return False
+    with open(cache_path) as f:
+        cache = json.load(f)
+    return cache.get('key') == key and all(
+        os.path.exists(os.path.join(PROCESSED_PATH, a)) for a in cache.get('artifacts', []))
+
+
+def build_preprocessor(categories):
+    """
+    Transformador das features: StandardScaler nas colunas numéricas e
+    OneHotEncoder esparso (drop='first') nas categóricas, com saída CSR.
+
+    Args:
+        categories: {coluna categórica: lista de categorias} do dataset inteiro
+    """
+    return ColumnTransformer(
+        [
+            ('num', StandardScaler(), NUMERIC_COLS),
+            ('cat', OneHotEncoder(categories=[categories[c] for c in CATEGORICAL_COLS],
+                                  drop='first' if PREPROCESS_PARAMS['drop_first'] else None,
+                                  handle_unknown='ignore', sparse_output=True), CATEGORICAL_COLS),
+        ],
+        sparse_threshold=1.0,
+        verbose_feature_names_out=False,
+    )
+
+
+def _preprocess_in_memory(path, key):
+    """Lê o CSV inteiro, divide, ajusta o pré-processador no treino e grava o dataset."""
+    df = load_and_clean_data(path)
+
     # Separação entre featues (X) e target (Y)
     X = df.drop('income', axis=1)
     y = df['income']
-    
-    
-    #One-hot encoding para variáveis categóricas
-    #Seleciona colunas que são texto 
-    categorical_cols = X.select_dtypes(include=['object']).columns
-    
-    # get_dummies tranforma texto em números binários (0 e 1)
-    X = pd.get_dummies(X, columns=categorical_cols, drop_first=True)
-    
-    #Divisão entre treino e teste 
+
+    #Divisão entre treino e teste
     #O stratify garante que a proporção das classes na variável alvo seja mantida em ambos os conjuntos
     X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.3, stratify=y, random_state=42
+        X, y, test_size=PREPROCESS_PARAMS['test_size'], stratify=y,
+        random_state=PREPROCESS_PARAMS['random_state']
     )
-    
-    # Escalonamento dos dados 
-    scaler = StandardScaler()
 
-    X_train_scaled = scaler.fit_transform(X_train)
+    # One-hot esparso (CSR) para as categóricas e escalonamento só das numéricas
+    # As categorias vêm do dataset inteiro: mesmas colunas que o get_dummies gerava
+    preprocessor = build_preprocessor({c: list(X[c].cat.categories) for c in CATEGORICAL_COLS})
+
+    X_train_scaled = preprocessor.fit_transform(X_train)
     # Usa transform() no teste para manter consistência com o scaler treinado
-    X_test_scaled = scaler.transform(X_test)
-    
+    X_test_scaled = preprocessor.transform(X_test)
+
     # Converter y para numpy array
-    y_train = y_train.values
-    y_test = y_test.values
-    
-    # Salvando os dados processados
-    np.save(os.path.join(PROCESSED_PATH, 'X_train.npy'), X_train_scaled)
-    np.save(os.path.join(PROCESSED_PATH, 'X_test.npy'), X_test_scaled)
+    y_train = y_train.values.astype(np.int64)
+    y_test = y_test.values.astype(np.int64)
+
+    # Salvando os dados processados: arquivo único float32 + manifesto (aberto com mmap no treino)
+    save_dataset(PROCESSED_PATH, key, {'X_train': X_train_scaled, 'X_test': X_test_scaled},
+                 {'y_train': y_train, 'y_test': y_test})
+    return preprocessor, y_train, y_test
+
+
+def _preprocess_chunks(path, chunksize, key):
+    """
+    Mesmo pré-processamento em três passadas sobre o CSV, sem carregá-lo inteiro:
+    1) categorias e alvo; 2) StandardScaler.partial_fit nas linhas de treino;
+    3) transforma cada bloco e anexa as linhas de treino/teste ao dataset.bin.
+
+    A divisão estratificada é a mesma do modo em memória (mesmo alvo e semente),
+    mas as linhas de cada conjunto ficam na ordem do arquivo.
+    """
+    categories, y = _scan_chunks(path, chunksize)
+    train_idx, _ = train_test_split(
+        np.arange(len(y)), test_size=PREPROCESS_PARAMS['test_size'], stratify=y,
+        random_state=PREPROCESS_PARAMS['random_state']
+    )
+    is_train = np.zeros(len(y), dtype=bool)
+    is_train[train_idx] = True
+
+    def split_chunks():
+        start = 0
+        for chunk in _clean_chunks(path, chunksize):
+            yield chunk.drop('income', axis=1), is_train[start:start + len(chunk)]
+            start += len(chunk)
+
+    # O primeiro bloco com linhas de treino ajusta o transformador (o one-hot já tem as
+    # categorias fixas); os seguintes só acumulam média e variância no scaler
+    preprocessor = build_preprocessor(categories)
+    scaler = None
+    for X, train_rows in split_chunks():
+        if not train_rows.any():
+            continue
+        if scaler is None:
+            preprocessor.fit(X[train_rows])
+            scaler = preprocessor.named_transformers_['num']
+        else:
+            scaler.partial_fit(X.loc[train_rows, NUMERIC_COLS])
+
+    writer = DatasetWriter(PROCESSED_PATH, key)
+    for X, train_rows in split_chunks():
+        for name, rows in (('X_train', train_rows), ('X_test', ~train_rows)):
+            if rows.any():
+                writer.append(name, preprocessor.transform(X[rows]))
+
+    y_train = y[is_train].astype(np.int64)
+    y_test = y[~is_train].astype(np.int64)
+    writer.append_labels('y_train', y_train)
+    writer.append_labels('y_test', y_test)
+    writer.close()
+    return preprocessor, y_train, y_test
+
+
+def preprocess_data(path=RAW_PATH, chunksize=None, force=False):
+    if not os.path.exists(PROCESSED_PATH):
+        os.makedirs(PROCESSED_PATH)
+
+    # Entradas inalteradas: os artefatos em cache continuam válidos
+    key = cache_key(path)
+    if not force and _cache_is_valid(key):
+        print(f"Cache válido ({key[:12]}): dados processados já estão atualizados.")
+        return
+
+    if chunksize:
+        preprocessor, y_train, y_test = _preprocess_chunks(path, chunksize, key)
+    else:
+        preprocessor, y_train, y_test = _preprocess_in_memory(path, key)
+
     np.save(os.path.join(PROCESSED_PATH, 'y_train.npy'), y_train)
     np.save(os.path.join(PROCESSED_PATH, 'y_test.npy'), y_test)
-    
-    # Salvando nome das colunas 
-    np.save(os.path.join(PROCESSED_PATH, 'feature,names.npy'), X.columns.values)
+
+    # Salvando nome das colunas
+    np.save(os.path.join(PROCESSED_PATH, 'feature,names.npy'), preprocessor.get_feature_names_out().astype(object))
+
+    # Pré-processador ajustado (scaler + one-hot): necessário para pontuar dados novos
+    joblib.dump(preprocessor, os.path.join(PROCESSED_PATH, 'preprocessor.joblib'))
+
+    # Registra a chave do cache junto com os artefatos gerados
+    with open(os.path.join(PROCESSED_PATH, CACHE_FILE), 'w') as f:
+        json.dump({'key': key, 'raw_path': path, 'params': PREPROCESS_PARAMS,
+                   'version': PREPROCESS_VERSION, 'artifacts': ARTIFACTS}, f, indent=2)
 
     print("Pré-processamento conluído")
-    
-    
+
+
 if __name__ == "__main__":
-    preprocess_data()    
-    
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Pré-processamento do dataset Adult')
+    parser.add_argument('--raw', type=str, default=RAW_PATH, help='CSV bruto')
+    parser.add_argument('--chunksize', type=int, default=None, help='Processa o CSV em blocos de N linhas, sem carregá-lo inteiro')
+    parser.add_argument('--force', action='store_true', help='Ignora o cache e reprocessa')
+    args = parser.parse_args()
+
+    preprocess_data(args.raw, args.chunksize, args.force)
@@ -0,0 +1,146 @@
+"""
+Camada de relatórios: as figuras (matrizes de confusão, comparação entre
+modelos) são enfileiradas como especificações simples (dicts serializáveis em
+JSON) durante o treino e renderizadas fora do caminho crítico.
+
+Modos:
+    background  renderiza em um processo auxiliar enquanto o treino continua (padrão)
+    deferred    grava as especificações em reports/figs/pending_figures.json para
+                uma etapa separada: python src/part2_ml/reporting.py render
+    sync        renderiza na hora, no próprio processo
+    off         não gera figuras (--no-plots, jobs sem interface gráfica)
+
+matplotlib e seaborn só são importados no processo que renderiza.
+"""
+import os
+import json
+import atexit
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+MODES = ('background', 'deferred', 'sync', 'off')
+PENDING_FILE = 'reports/figs/pending_figures.json'
+
+_mode = 'background'
+_queue = []
+_executor = None
+_futures = []
+
+
+def set_mode(mode):
+    """Define como as figuras enfileiradas serão renderizadas."""
+    global _mode
+    if mode not in MODES:
+        raise ValueError(f"Modo de relatório desconhecido: {mode}. Use um de {MODES}")
+    _mode = mode
+
+
+def add_plot_arguments(parser):
+    """Opções de linha de comando comuns aos scripts de treino."""
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--plots', default='background', choices=MODES, help='Como gerar as figuras')
+    group.add_argument('--no-plots', dest='plots', action='store_const', const='off',
+                       help='Não gera figuras')
+
+
+def queue_figure(kind, **spec):
+    """
+    Enfileira uma figura.
+
+    Args:
+        kind: 'confusion_matrix' ou 'models_comparison'
+        **spec: Argumentos da figura (apenas tipos serializáveis em JSON)
+    """
+    if _mode != 'off':
+        _queue.append({'kind': kind, **spec})
+
+
+def flush():
+    """Envia as figuras enfileiradas para renderização conforme o modo atual."""
+    global _executor
+    specs = list(_queue)
+    _queue.clear()
+    if not specs or _mode == 'off':
+        return
+
+    if _mode == 'sync':
+        render(specs)
+    elif _mode == 'background':
+        if _executor is None:
+            # Um único processo auxiliar: as figuras não competem entre si pela CPU
+            _executor = ProcessPoolExecutor(max_workers=1)
+        _futures.append(_executor.submit(render, specs))
+    else:
+        pending = []
+        if os.path.exists(PENDING_FILE):
+            with open(PENDING_FILE) as f:
+                pending = json.load(f)
+        os.makedirs(os.path.dirname(PENDING_FILE), exist_ok=True)
+        with open(PENDING_FILE, 'w') as f:
+            json.dump(pending + specs, f, indent=2)
+        print(f"{len(specs)} figura(s) adiada(s) em {PENDING_FILE}")
+
+
+def wait():
+    """Espera as renderizações em segundo plano (e propaga erros delas)."""
+    global _executor
+    try:
+        for future in _futures:
+            future.result()
+    finally:
+        _futures.clear()
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+def _finish():
+    flush()
+    wait()
+
+
+atexit.register(_finish)
+
+
+def render(specs):
+    """Renderiza uma lista de especificações de figura (importa matplotlib aqui)."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import numpy as np
+    import pandas as pd
+    from utils_metrics import plot_confusion_matrix, plot_models_comparison
+
+    for spec in specs:
+        spec = dict(spec)
+        kind = spec.pop('kind')
+        if kind == 'confusion_matrix':
+            cm = np.asarray(spec.pop('cm'))
+            plot_confusion_matrix(None, None, cm=cm, **spec)
+        elif kind == 'models_comparison':
+            df = pd.DataFrame.from_dict(spec.pop('data'), orient='index')
+            plot_models_comparison(df, **spec)
+        else:
+            raise ValueError(f"Tipo de figura desconhecido: {kind}")
+
+
+def render_pending(path=PENDING_FILE):
+    """Renderiza as figuras adiadas pelo modo 'deferred' e limpa a fila."""
+    if not os.path.exists(path):
+        print("Nenhuma figura pendente.")
+        return 0
+    with open(path) as f:
+        specs = json.load(f)
+    render(specs)
+    os.remove(path)
+    return len(specs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Renderiza as figuras adiadas do treino')
+    parser.add_argument('command', choices=['render'])
+    parser.add_argument('--pending', type=str, default=PENDING_FILE)
+    args = parser.parse_args()
+
+    n = render_pending(args.pending)
+    if n:
+        print(f"{n} figura(s) renderizada(s)")
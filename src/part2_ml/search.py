@@ -0,0 +1,192 @@
+"""
+Busca de hiperparâmetros com validação cruzada estratificada.
+
+Os folds são avaliados em paralelo (pool de processos) e os resultados
+intermediários caros são reaproveitados:
+- KNN: uma única consulta kneighbors com o maior k dá as predições de todos os
+  k menores (os vizinhos já vêm ordenados por distância).
+- Árvore: um único ajuste profundo é avaliado em cada profundidade, truncando o
+  caminho de decisão (decision_path) de cada amostra.
+- SVM: successive halving (HalvingGridSearchCV) sobre C e gamma.
+
+Ao final, cada modelo é reajustado no treino completo com os melhores
+parâmetros, avaliado no teste e salvo como pacote (bundle.py).
+"""
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import StratifiedKFold, HalvingGridSearchCV
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.metrics import accuracy_score
+
+import train_knn
+import train_svm
+import train_tree
+from utils_metrics import load_data, evaluate_model
+from bundle import save_bundle
+import reporting
+
+#Caminhos
+REPORTS_PATH = 'reports'
+
+# Grades padrão
+K_VALUES = [1, 3, 5, 7, 9, 11, 15, 21, 31, 41]
+DEPTHS = list(range(2, 21))
+SVM_GRID = {'C': [0.1, 1, 10], 'gamma': ['scale', 0.01, 0.1]}
+
+MODELS = {'knn': train_knn, 'svm': train_svm, 'tree': train_tree}
+
+# Dados carregados no processo principal; com 'fork' os workers herdam os memmaps sem recarregar
+_DATA = None
+
+
+def _data():
+    global _DATA
+    if _DATA is None:
+        _DATA = load_data()
+    return _DATA
+
+
+def stratified_folds(y, n_splits=5, seed=42):
+    """Pares (treino, validação) de índices com a proporção das classes preservada."""
+    skf = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    return list(skf.split(np.zeros(len(y)), y))
+
+
+def knn_fold_scores(train_idx, val_idx, k_values):
+    """Acurácia no fold para cada k, com uma única consulta de vizinhos (k máximo)."""
+    X_train, _, y_train, _ = _data()
+    y_train = np.asarray(y_train)
+    k_values = sorted(k_values)
+
+    model = KNeighborsClassifier(n_neighbors=k_values[-1], metric='euclidean')
+    model.fit(X_train[train_idx], y_train[train_idx])
+    # Índices ordenados por distância: os primeiros k são os vizinhos do KNN com k
+    neighbors = model.kneighbors(X_train[val_idx], return_distance=False)
+
+    # Votos acumulados da classe 1 ao longo dos vizinhos (rótulos binários 0/1)
+    votes = np.cumsum(y_train[train_idx][neighbors], axis=1)
+    y_val = y_train[val_idx]
+    # Empate (só com k par): o KNN do sklearn escolhe a menor classe
+    return [accuracy_score(y_val, (votes[:, k - 1] > k / 2).astype(int)) for k in k_values]
+
+
+def tree_depth_predictions(model, X, depths):
+    """
+    Predições de uma árvore profunda truncada em cada profundidade.
+
+    Os nós de um caminho têm ids crescentes da raiz à folha, então o nó na
+    profundidade d é o (d+1)-ésimo do caminho (ou a folha, se o caminho for mais curto).
+    Equivale a ajustar com max_depth=d, salvo desempates entre divisões de mesmo
+    ganho (o sklearn sorteia a ordem das features, e a sequência de sorteios muda
+    com a profundidade).
+    """
+    path = model.decision_path(X).tocsr()
+    starts = path.indptr[:-1]
+    lengths = np.diff(path.indptr)
+    leaf_class = model.tree_.value[:, 0, :].argmax(axis=1)
+    return {d: model.classes_[leaf_class[path.indices[starts + np.minimum(d, lengths - 1)]]]
+            for d in depths}
+
+
+def tree_fold_scores(train_idx, val_idx, depths):
+    """Acurácia no fold para cada profundidade, com um único ajuste na profundidade máxima."""
+    X_train, _, y_train, _ = _data()
+    y_train = np.asarray(y_train)
+
+    model = train_tree.build_model().set_params(max_depth=max(depths))
+    model.fit(X_train[train_idx], y_train[train_idx])
+    y_val = y_train[val_idx]
+    preds = tree_depth_predictions(model, X_train[val_idx], depths)
+    return [accuracy_score(y_val, preds[d]) for d in depths]
+
+
+def _run_folds(fn, folds, grid, workers):
+    """Executa fn em cada fold (em paralelo) e devolve a matriz [fold, valor da grade]."""
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(fn, train_idx, val_idx, grid) for train_idx, val_idx in folds]
+        return np.array([f.result() for f in futures])
+
+
+def search_knn(folds, workers, k_values=K_VALUES):
+    scores = _run_folds(knn_fold_scores, folds, sorted(k_values), workers)
+    return sorted(k_values), scores, 'n_neighbors'
+
+
+def search_tree(folds, workers, depths=DEPTHS):
+    scores = _run_folds(tree_fold_scores, folds, sorted(depths), workers)
+    return sorted(depths), scores, 'max_depth'
+
+
+def search_svm(folds, workers, grid=SVM_GRID):
+    """Successive halving: todas as combinações com poucas amostras, só as melhores com o treino completo."""
+    X_train, _, y_train, _ = _data()
+    search = HalvingGridSearchCV(train_svm.build_model(), grid, cv=folds, factor=3,
+                                 scoring='accuracy', n_jobs=workers, random_state=42)
+    search.fit(X_train, y_train)
+    return search
+
+
+def search(models=tuple(MODELS), n_splits=5, workers=None, k_values=K_VALUES, depths=DEPTHS):
+    _, X_test, y_train, y_test = _data()
+    folds = stratified_folds(np.asarray(y_train), n_splits)
+    workers = workers or min(n_splits, os.cpu_count() or 1)
+
+    results = {}
+    for name in models:
+        print(f"\nBuscando hiperparâmetros de {name} ({n_splits} folds, {workers} worker(s))...")
+        start = time.perf_counter()
+        if name == 'svm':
+            svm_search = search_svm(folds, workers)
+            best_params = svm_search.best_params_
+            cv_score = svm_search.best_score_
+            table = {json.dumps(p): s for p, s in zip(svm_search.cv_results_['params'],
+                                                      svm_search.cv_results_['mean_test_score'])}
+        else:
+            grid, scores, param = (search_knn if name == 'knn' else search_tree)(
+                folds, workers, k_values if name == 'knn' else depths)
+            mean = scores.mean(axis=0)
+            best = int(np.argmax(mean))
+            best_params = {param: grid[best]}
+            cv_score = float(mean[best])
+            table = {str(v): float(s) for v, s in zip(grid, mean)}
+            for v, s, sd in zip(grid, mean, scores.std(axis=0)):
+                print(f"  {param}={v:<4} acurácia CV = {s:.4f} ± {sd:.4f}")
+        search_time = time.perf_counter() - start
+        print(f"Melhor: {best_params} (acurácia CV = {cv_score:.4f}, {search_time:.1f}s)")
+
+        # Modelo final: treino completo com os melhores parâmetros
+        X_train = _data()[0]
+        model = MODELS[name].build_model().set_params(**best_params)
+        model.fit(X_train, y_train)
+        metrics = evaluate_model(y_test, model.predict(X_test), model_name=f'{name}_tuned',
+                                 save_dir=f'{REPORTS_PATH}/figs')
+        save_bundle(model, f'{name}_tuned')
+
+        results[name] = {'best_params': best_params, 'cv_accuracy': cv_score, 'search_time_s': search_time,
+                         'test_metrics': metrics, 'cv_table': table}
+
+    path = f'{REPORTS_PATH}/search.json'
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"\nResultados da busca salvos em: {path}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Busca de hiperparâmetros com validação cruzada')
+    parser.add_argument('--models', nargs='+', default=list(MODELS), choices=list(MODELS))
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=None, help='Processos (padrão: min(folds, CPUs))')
+    parser.add_argument('--k-values', nargs='+', type=int, default=K_VALUES)
+    parser.add_argument('--depths', nargs='+', type=int, default=DEPTHS)
+    reporting.add_plot_arguments(parser)
+    args = parser.parse_args()
+    reporting.set_mode(args.plots)
+
+    search(args.models, args.folds, args.workers, args.k_values, args.depths)
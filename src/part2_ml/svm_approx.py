@@ -0,0 +1,139 @@
+"""
+SVM com aproximação do kernel RBF.
+
+As features são mapeadas com Nyström ou Random Fourier Features (RBFSampler) e
+um SVM linear é treinado no espaço mapeado: o custo de treino cresce de forma
+linear no número de amostras, em vez de aproximadamente quadrática no SVC exato.
+
+Executado como script, compara tempo de ajuste, de predição e acurácia com o SVC.
+"""
+import time
+import argparse
+
+import numpy as np
+from scipy import sparse
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.kernel_approximation import Nystroem, RBFSampler
+from sklearn.svm import SVC, LinearSVC
+from sklearn.metrics import accuracy_score
+
+from utils_metrics import load_data
+
+# Modos aceitos por build_svm (e pelo --mode do train_svm.py)
+MODES = ('exact', 'nystroem', 'rff')
+
+
+def scale_gamma(X):
+    """gamma='scale' do SVC: 1 / (n_features * X.var()), também para matrizes esparsas."""
+    if sparse.issparse(X):
+        n = X.shape[0] * X.shape[1]
+        mean = X.sum() / n
+        var = X.multiply(X).sum() / n - mean ** 2
+    else:
+        var = np.asarray(X).var()
+    return 1.0 / (X.shape[1] * var) if var > 0 else 1.0
+
+
+class ApproxKernelSVM(ClassifierMixin, BaseEstimator):
+    """
+    Mapeamento aproximado do kernel RBF seguido de LinearSVC.
+
+    Aceita matrizes CSR (inclusive sobre memmap) e densas; o mapeamento produz
+    uma matriz densa de n_components colunas.
+    """
+    def __init__(self, kernel_map='nystroem', n_components=300, C=1.0, gamma='scale', random_state=42):
+        self.kernel_map = kernel_map
+        self.n_components = n_components
+        self.C = C
+        self.gamma = gamma
+        self.random_state = random_state
+
+    def _transform(self, X):
+        return self.map_.transform(X).astype(np.float32, copy=False)
+
+    def fit(self, X, y):
+        gamma = scale_gamma(X) if self.gamma == 'scale' else self.gamma
+        if self.kernel_map == 'nystroem':
+            self.map_ = Nystroem(kernel='rbf', gamma=gamma, n_components=self.n_components,
+                                 random_state=self.random_state)
+        elif self.kernel_map == 'rff':
+            self.map_ = RBFSampler(gamma=gamma, n_components=self.n_components,
+                                   random_state=self.random_state)
+        else:
+            raise ValueError(f"Mapeamento desconhecido: {self.kernel_map}")
+
+        Z = self.map_.fit(X).transform(X).astype(np.float32, copy=False)
+        self.svm_ = LinearSVC(C=self.C, dual=False, random_state=self.random_state).fit(Z, y)
+        self.classes_ = self.svm_.classes_
+        return self
+
+    def decision_function(self, X):
+        return self.svm_.decision_function(self._transform(X))
+
+    def predict(self, X):
+        return self.svm_.predict(self._transform(X))
+
+
+def build_svm(mode='exact', n_components=300):
+    """
+    Monta o SVM no modo pedido.
+
+    Args:
+        mode: 'exact' (SVC RBF), 'nystroem' ou 'rff' (kernel aproximado + LinearSVC)
+        n_components: Dimensão do mapeamento nos modos aproximados
+    """
+    if mode == 'exact':
+        return SVC(kernel='rbf', C=1, gamma='scale', random_state=42)
+    if mode in ('nystroem', 'rff'):
+        return ApproxKernelSVM(kernel_map=mode, n_components=n_components)
+    raise ValueError(f"Modo de SVM desconhecido: {mode}. Use um de {MODES}")
+
+
+def benchmark(configs):
+    """
+    Ajusta cada configuração e mede ajuste, predição e acurácia no conjunto de teste.
+
+    Returns:
+        list[dict]: modo, n_components, acurácia, tempo de ajuste e de predição
+    """
+    X_train, X_test, y_train, y_test = load_data()
+
+    rows = []
+    for mode, n_components in configs:
+        model = build_svm(mode, n_components=n_components)
+
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_pred = model.predict(X_test)
+        predict_time = time.perf_counter() - start
+
+        rows.append({'mode': mode, 'n_components': n_components if mode != 'exact' else None,
+                     'accuracy': accuracy_score(y_test, y_pred), 'fit_s': fit_time,
+                     'predict_s': predict_time})
+    return rows
+
+
+def print_table(rows):
+    print(f"\n{'modo':<9} {'comp.':>6} {'acurácia':>9} {'ajuste (s)':>11} {'predição (s)':>13}")
+    for r in rows:
+        comp = r['n_components'] if r['n_components'] is not None else '-'
+        print(f"{r['mode']:<9} {comp:>6} {r['accuracy']:>9.4f} {r['fit_s']:>11.2f} {r['predict_s']:>13.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='SVC exato x kernel aproximado')
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES)
+    parser.add_argument('--components', nargs='+', type=int, default=[100, 300, 1000],
+                        help='Dimensões testadas nos modos aproximados')
+    args = parser.parse_args()
+
+    configs = []
+    for mode in args.modes:
+        if mode == 'exact':
+            configs.append((mode, None))
+        else:
+            configs.extend((mode, n) for n in args.components)
+    print_table(benchmark(configs))
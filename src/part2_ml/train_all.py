@@ -0,0 +1,119 @@
+"""
+Treina KNN, SVM e Árvore de Decisão em um único processo de entrada.
+
+Os dados são carregados uma vez (memória mapeada) e os modelos são ajustados
+em paralelo em um pool de processos, cada worker com um número controlado de
+threads. As predições são reunidas em compare_models_metrics, que gera a
+figura de comparação e um JSON com as métricas; cada modelo é salvo
+como pacote (bundle.py).
+"""
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+import train_knn
+import train_svm
+import train_tree
+from utils_metrics import evaluate_model, load_data, compare_models_metrics
+from bundle import save_bundle
+import reporting
+
+#Caminhos
+REPORTS_PATH = 'reports'
+
+# Nome do modelo -> (módulo com build_model, mapa de cores da matriz de confusão)
+MODELS = {
+    'knn': (train_knn, 'Blues'),
+    'svm': (train_svm, 'Greens'),
+    'tree': (train_tree, 'Oranges'),
+}
+
+# Dados carregados no processo principal; com 'fork' os workers herdam os memmaps sem recarregar
+_DATA = None
+
+
+def _fit_predict(name, n_threads):
+    """Ajusta um modelo e devolve o modelo e as predições no conjunto de teste (executa no worker)."""
+    global _DATA
+    if _DATA is None:
+        # Start method 'spawn': o worker abre o dataset mapeado (não copia os dados)
+        _DATA = load_data()
+    X_train, X_test, y_train, y_test = _DATA
+
+    module, _ = MODELS[name]
+    with threadpool_limits(limits=n_threads):
+        model = module.build_model(n_jobs=n_threads)
+
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_pred = model.predict(X_test)
+        predict_time = time.perf_counter() - start
+
+    return name, model, np.asarray(y_pred), fit_time, predict_time
+
+
+def train_all(models=tuple(MODELS), workers=None, threads=None):
+    global _DATA
+    _DATA = load_data()
+    y_test = np.asarray(_DATA[3])
+
+    workers = workers or min(len(models), os.cpu_count() or 1)
+    threads = threads or max(1, (os.cpu_count() or 1) // workers)
+    print(f"Treinando {', '.join(models)} com {workers} worker(s) x {threads} thread(s)...")
+
+    start = time.perf_counter()
+    results = {}
+    timings = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_fit_predict, name, threads) for name in models]
+        for future in as_completed(futures):
+            name, model, y_pred, fit_time, predict_time = future.result()
+            results[name] = y_pred
+            save_bundle(model, name)
+            timings[name] = {'fit_time_s': fit_time, 'predict_time_s': predict_time}
+            print(f"{name}: fit={fit_time:.2f}s predict={predict_time:.2f}s")
+    total_time = time.perf_counter() - start
+
+    # Avaliação (na ordem declarada, para a saída ficar estável)
+    for name in models:
+        evaluate_model(y_test, results[name], model_name=name,
+                       save_dir=f'{REPORTS_PATH}/figs', cmap=MODELS[name][1])
+
+    comparison = compare_models_metrics({name: {'y_true': y_test, 'y_pred': results[name]}
+                                         for name in models})
+    print("\nComparação entre modelos:")
+    print(comparison.round(4))
+
+    reporting.queue_figure('models_comparison', save_path=f'{REPORTS_PATH}/figs/comparison_models.png',
+                           data=comparison.to_dict(orient='index'))
+    reporting.flush()
+
+    metrics = {name: {**comparison.loc[name].to_dict(), **timings[name]} for name in models}
+    metrics_path = f'{REPORTS_PATH}/metrics.json'
+    with open(metrics_path, 'w') as f:
+        json.dump({'models': metrics, 'total_train_time_s': total_time,
+                   'workers': workers, 'threads_per_worker': threads}, f, indent=2)
+    print(f"Métricas salvas em: {metrics_path}")
+    print(f"Tempo total de treino: {total_time:.2f}s")
+
+    return comparison
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Treina todos os modelos em um único processo')
+    parser.add_argument('--models', nargs='+', default=list(MODELS), choices=list(MODELS))
+    parser.add_argument('--workers', type=int, default=None, help='Processos no pool (padrão: nº de modelos)')
+    parser.add_argument('--threads', type=int, default=None, help='Threads por worker (padrão: CPUs / workers)')
+    reporting.add_plot_arguments(parser)
+    args = parser.parse_args()
+    reporting.set_mode(args.plots)
+
+    train_all(args.models, args.workers, args.threads)
@@ -1,22 +1,28 @@
 import numpy as np
 import os 
-from sklearn.neighbors import KNeighborsClassifier
 from utils_metrics import evaluate_model, load_data
+from bundle import save_bundle
+import reporting
+from knn_fast import build_knn, MODES
 
 #Caminhos 
 PROCESSED_PATH = 'data/processed/'
 REPORTS_PATH = 'reports'
 
 
-def train_knn():
-    X_train, X_test, y_train, y_test = load_data()
-    
+def build_model(n_jobs=-1, mode='exact', n_components=20):
     # Configuração do KNN
     k = 15
-    print(f"Treinando KNN com k={k}...")
-    
     # n_jobs=-1 usa todos os núcleos disponíveis 
-    model = KNeighborsClassifier(n_neighbors=k, metric='euclidean', n_jobs=-1)
+    # mode: 'exact' (sklearn), 'blocked' (float32 por blocos), 'pca'/'rp' (redução + kd_tree)
+    return build_knn(mode, n_neighbors=k, n_components=n_components, n_jobs=n_jobs)
+
+
+def train_knn(mode='exact', n_components=20):
+    X_train, X_test, y_train, y_test = load_data()
+    
+    model = build_model(mode=mode, n_components=n_components)
+    print(f"Treinando KNN com k=15 (modo {mode})...")
     model.fit(X_train, y_train)
     
     # Predição
@@ -33,7 +39,19 @@ def train_knn():
         cmap='Blues'
     )
     
+    # Pacote com pré-processador + ordem das features + modelo (usado pelo predict.py)
+    save_bundle(model, "knn")
+    
     return model, metrics
     
 if __name__ == "__main__":
-    train_knn()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Treina o KNN')
+    parser.add_argument('--mode', default='exact', choices=MODES, help='Backend do KNN')
+    parser.add_argument('--components', type=int, default=20, help='Dimensões nos modos pca/rp')
+    reporting.add_plot_arguments(parser)
+    args = parser.parse_args()
+    reporting.set_mode(args.plots)
+
+    train_knn(args.mode, args.components)
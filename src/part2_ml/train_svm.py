@@ -1,23 +1,30 @@
 import numpy as np 
 import os 
-from sklearn.svm import SVC
 from utils_metrics import evaluate_model, load_data
+from bundle import save_bundle
+import reporting
+from svm_approx import build_svm, MODES
 
 #Caminhos 
 PROCESSED_PATH = 'data/processed/'
 REPORTS_PATH = 'reports'
 
 
-def train_svm():
-    X_train, X_test, y_train, y_test = load_data()
-    
+def build_model(n_jobs=None, mode='exact', n_components=300):
     # Configuração do SVM
-    print("Treinando SVM...")
-    
     # SVM com kernel RBF (Radial Basis Function) - é bom para dados não lineares
     # C=1 é o parâmetro de regularização padrão
     # gamma='scale' ajusta automaticamente o parâmetro gamma
-    model = SVC(kernel='rbf', C=1, gamma='scale', random_state=42)
+    # (o SVC é single-thread: n_jobs existe só para manter a mesma assinatura dos outros modelos)
+    # mode 'nystroem'/'rff': kernel RBF aproximado com n_components dimensões + LinearSVC
+    return build_svm(mode, n_components=n_components)
+
+
+def train_svm(mode='exact', n_components=300):
+    X_train, X_test, y_train, y_test = load_data()
+    
+    print(f"Treinando SVM (modo {mode})...")
+    model = build_model(mode=mode, n_components=n_components)
     model.fit(X_train, y_train)
     
     # Predição
@@ -33,7 +40,20 @@ def train_svm():
         cmap='Greens'
     )
     
+    # Pacote com pré-processador + ordem das features + modelo (usado pelo predict.py)
+    save_bundle(model, "svm")
+    
     return model, metrics
     
 if __name__ == "__main__":
-    train_svm()
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Treina o SVM')
+    parser.add_argument('--mode', default='exact', choices=MODES, help='SVC exato ou kernel aproximado')
+    parser.add_argument('--components', type=int, default=300, help='Dimensões do mapeamento aproximado')
+    reporting.add_plot_arguments(parser)
+    args = parser.parse_args()
+    reporting.set_mode(args.plots)
+
+    train_svm(args.mode, args.components)
+
@@ -2,26 +2,32 @@ import numpy as np
 import os 
 from sklearn.tree import DecisionTreeClassifier
 from utils_metrics import evaluate_model, load_data
+from bundle import save_bundle
+import reporting
 
 #Caminhos 
 PROCESSED_PATH = 'data/processed/'
 REPORTS_PATH = 'reports'
 
 
-def train_tree():
-    X_train, X_test, y_train, y_test = load_data()
-    
+def build_model(n_jobs=None):
     # Configuração da Árvore de Decisão
-    print("Treinando Árvore de Decisão...")
-    
     # max_depth controla a profundidade máxima da árvore (evita overfitting)
     # min_samples_split: número mínimo de amostras necessárias para dividir um nó
     # random_state para reprodutibilidade
-    model = DecisionTreeClassifier(
+    # (a árvore é single-thread: n_jobs existe só para manter a mesma assinatura dos outros modelos)
+    return DecisionTreeClassifier(
         max_depth=10, 
         min_samples_split=20, 
         random_state=42
     )
+
+
+def train_tree():
+    X_train, X_test, y_train, y_test = load_data()
+    
+    print("Treinando Árvore de Decisão...")
+    model = build_model()
     model.fit(X_train, y_train)
     
     # Predição
@@ -37,8 +43,19 @@ def train_tree():
         cmap='Oranges'
     )
     
+    # Pacote com pré-processador + ordem das features + modelo (usado pelo predict.py)
+    save_bundle(model, "tree")
+    
     return model, metrics
     
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Treina a Árvore de Decisão')
+    reporting.add_plot_arguments(parser)
+    args = parser.parse_args()
+    reporting.set_mode(args.plots)
+
     train_tree()
 
+
@@ -0,0 +1,180 @@
+"""
+Exportação da Árvore de Decisão treinada para uma tabela de nós compacta
+(feature, threshold, filhos, classe) e um avaliador leve para um registro ou
+um lote pequeno, sem a validação de entrada do predict do sklearn.
+
+A comparação segue a do sklearn: o valor da feature é convertido para float32
+e comparado (<=) com o threshold em float64, então as predições são idênticas.
+
+Executado como script, exporta o modelo de data/models/tree.joblib, confere a
+concordância com o sklearn no conjunto de teste e mede a latência.
+"""
+import os
+import time
+import argparse
+
+import numpy as np
+from scipy import sparse
+
+from bundle import load_bundle, MODELS_PATH
+from utils_metrics import load_data
+
+TABLE_FILE = 'tree_nodes.npz'
+
+# Valor de feature das folhas na tabela (o mesmo do sklearn)
+LEAF = -2
+
+
+class TreeTable:
+    """
+    Tabela de nós de uma árvore binária.
+
+    feature[i]: índice da feature testada no nó (LEAF nas folhas)
+    threshold[i]: vai para left[i] se x[feature] <= threshold, senão para right[i]
+    value[i]: índice da classe prevista no nó (usado nas folhas)
+    """
+    def __init__(self, feature, threshold, left, right, value, classes, feature_names=None):
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.value = np.asarray(value, dtype=np.int32)
+        self.classes = np.asarray(classes)
+        self.feature_names = None if feature_names is None else [str(n) for n in feature_names]
+
+        # Listas Python: indexar lista é bem mais barato que indexar array NumPy elemento a elemento
+        self._feature = self.feature.tolist()
+        self._threshold = self.threshold.tolist()
+        self._left = self.left.tolist()
+        self._right = self.right.tolist()
+        self._label = self.classes[self.value].tolist()
+        self._index = {n: i for i, n in enumerate(self.feature_names or [])}
+        self.depth = self._depth()
+
+    def _depth(self):
+        depth = np.zeros(len(self.feature), dtype=np.int32)
+        for i in range(len(self.feature)):
+            if self.feature[i] != LEAF:
+                depth[self.left[i]] = depth[self.right[i]] = depth[i] + 1
+        return int(depth.max())
+
+    def __len__(self):
+        return len(self.feature)
+
+    def predict_one(self, row):
+        """
+        Prediz um registro.
+
+        Args:
+            row: Sequência de features (na ordem do treino) ou dict {nome da feature: valor};
+                 features ausentes do dict valem 0 (como no one-hot esparso)
+        """
+        feature, threshold, left, right = self._feature, self._threshold, self._left, self._right
+        if isinstance(row, dict):
+            names = self.feature_names
+            node = 0
+            while feature[node] != LEAF:
+                x = float(np.float32(row.get(names[feature[node]], 0.0)))
+                node = left[node] if x <= threshold[node] else right[node]
+            return self._label[node]
+
+        row = np.asarray(row, dtype=np.float32).tolist()
+        node = 0
+        while feature[node] != LEAF:
+            node = left[node] if row[feature[node]] <= threshold[node] else right[node]
+        return self._label[node]
+
+    def predict(self, X):
+        """Prediz um lote (denso ou CSR), descendo um nível de todos os registros por vez."""
+        if sparse.issparse(X):
+            X = X.toarray()
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))
+        node = np.zeros(len(X), dtype=np.int32)
+        for _ in range(self.depth):
+            feat = self.feature[node]
+            internal = feat != LEAF
+            if not internal.any():
+                break
+            go_left = X[rows, np.where(internal, feat, 0)] <= self.threshold[node]
+            node = np.where(internal, np.where(go_left, self.left[node], self.right[node]), node)
+        return self.classes[self.value[node]]
+
+    def save(self, path):
+        np.savez(path, feature=self.feature, threshold=self.threshold, left=self.left,
+                 right=self.right, value=self.value, classes=self.classes,
+                 feature_names=np.array(self.feature_names or [], dtype=object))
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=True)
+        names = list(data['feature_names']) or None
+        return cls(data['feature'], data['threshold'], data['left'], data['right'],
+                   data['value'], data['classes'], names)
+
+
+def export_tree(model, feature_names=None):
+    """Achata um DecisionTreeClassifier ajustado em uma TreeTable."""
+    tree = model.tree_
+    return TreeTable(tree.feature, tree.threshold, tree.children_left, tree.children_right,
+                     tree.value[:, 0, :].argmax(axis=1), model.classes_, feature_names)
+
+
+def _latency_us(fn, items, repeat=3):
+    """Melhor tempo médio (µs) por chamada de fn sobre items."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, (time.perf_counter() - start) / len(items))
+    return best * 1e6
+
+
+def benchmark(table, model, X_test, y_test, n_single=2000):
+    """Concordância com o sklearn e latência por registro / lote."""
+    X_dense = X_test.toarray() if sparse.issparse(X_test) else np.asarray(X_test)
+    y_test = np.asarray(y_test)
+
+    sk_pred = model.predict(X_test)
+    batch_pred = table.predict(X_test)
+    rows = X_dense[:n_single]
+    dicts = [{table.feature_names[j]: float(v) for j, v in enumerate(r) if v != 0} for r in rows]
+    single_pred = np.array([table.predict_one(r) for r in rows])
+    dict_pred = np.array([table.predict_one(d) for d in dicts])
+
+    print(f"Nós: {len(table)} | profundidade: {table.depth}")
+    print(f"Concordância com o sklearn: lote {np.mean(batch_pred == sk_pred):.4%} | "
+          f"registro {np.mean(single_pred == sk_pred[:n_single]):.4%} | "
+          f"dict {np.mean(dict_pred == sk_pred[:n_single]):.4%}")
+    print(f"Acurácia: sklearn {np.mean(sk_pred == y_test):.4f} | tabela {np.mean(batch_pred == y_test):.4f}")
+
+    csr_rows = [X_test[i] for i in range(min(n_single, 300))]
+    batch = X_dense[:100]
+    print(f"\n{'método':<34} {'µs/registro':>12}")
+    print(f"{'sklearn predict (1 linha CSR)':<34} {_latency_us(model.predict, csr_rows):>12.1f}")
+    print(f"{'sklearn predict (1 linha densa)':<34} "
+          f"{_latency_us(lambda r: model.predict(r[None, :]), rows[:300]):>12.1f}")
+    print(f"{'tabela predict_one (linha)':<34} {_latency_us(table.predict_one, rows):>12.1f}")
+    print(f"{'tabela predict_one (dict)':<34} {_latency_us(table.predict_one, dicts):>12.1f}")
+    print(f"{'sklearn predict (lote de 100)':<34} {_latency_us(model.predict, [batch] * 50) / 100:>12.2f}")
+    print(f"{'tabela predict (lote de 100)':<34} {_latency_us(table.predict, [batch] * 50) / 100:>12.2f}")
+
+    return bool(np.all(batch_pred == sk_pred) and np.all(single_pred == sk_pred[:n_single])
+                and np.all(dict_pred == sk_pred[:n_single]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Exporta a árvore treinada para uma tabela de nós')
+    parser.add_argument('--model', type=str, default=os.path.join(MODELS_PATH, 'tree.joblib'))
+    parser.add_argument('--output', type=str, default=os.path.join(MODELS_PATH, TABLE_FILE))
+    args = parser.parse_args()
+
+    bundle = load_bundle(args.model)
+    table = export_tree(bundle['model'], bundle['feature_names'])
+    table.save(args.output)
+    print(f"Tabela de nós salva em: {args.output}")
+
+    _, X_test, _, y_test = load_data()
+    if not benchmark(TreeTable.load(args.output), bundle['model'], X_test, y_test):
+        raise SystemExit("A tabela exportada diverge do sklearn")
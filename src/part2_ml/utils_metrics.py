@@ -2,41 +2,132 @@
 Módulo de utilitários para cálculo e visualização de métricas de classificação
 """
 import os
+import json
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.metrics import (
-    accuracy_score, 
-    precision_score, 
-    recall_score, 
-    f1_score,
-    classification_report,
-    confusion_matrix
-)
+from dataset import open_dataset
+import reporting
 
 #Caminhos 
 PROCESSED_PATH = 'data/processed/'
 REPORTS_PATH = 'reports'
 
 
-def load_data():
+def load_data(mmap_mode='r'):
     """
     Carrega os dados processados do diretório data/processed/
     
+    As features ficam em um único arquivo float32 aberto com memória mapeada:
+    processos de treino diferentes compartilham as mesmas páginas do arquivo.
+    O manifesto é validado contra a última execução do pré-processamento (cache.json).
+    
+    Args:
+        mmap_mode: Modo do np.memmap ('r' padrão); None carrega tudo em memória
+    
     Returns:
-        X_train: Array de features de treino
-        X_test: Array de features de teste
+        X_train: Matriz esparsa (CSR, float32) de features de treino
+        X_test: Matriz esparsa (CSR, float32) de features de teste
         y_train: Array de target de treino
         y_test: Array de target de teste
     """
     
     print("Carregando dados processados...")
-    X_train = np.load(os.path.join(PROCESSED_PATH, 'X_train.npy')) # features de treino
-    X_test = np.load(os.path.join(PROCESSED_PATH, 'X_test.npy')) # features de teste
-    y_train = np.load(os.path.join(PROCESSED_PATH, 'y_train.npy')) # target de treino
-    y_test = np.load(os.path.join(PROCESSED_PATH, 'y_test.npy')) # target de teste
+    with open(os.path.join(PROCESSED_PATH, 'cache.json')) as f:
+        preprocess_key = json.load(f)['key']
+    data = open_dataset(PROCESSED_PATH, preprocess_key, mmap_mode=mmap_mode)
+    
+    return data['X_train'], data['X_test'], data['y_train'], data['y_test']
+
+
+class ConfusionMetrics:
+    """
+    Motor de métricas baseado em uma única matriz de confusão.
+    
+    A matriz é acumulada com update() (inclusive bloco a bloco, sem guardar as
+    predições) e todas as métricas (acurácia, precisão/recall/F1 por classe e
+    ponderados, classification report) são derivadas dela.
+    
+    Args:
+        labels: Lista de labels das classes (ordem das linhas/colunas da matriz)
+    """
+    def __init__(self, labels=[0, 1]):
+        self.labels = np.asarray(labels)
+        self._order = np.argsort(self.labels)
+        self.matrix = np.zeros((len(labels), len(labels)), dtype=np.int64)
+    
+    def _index(self, y):
+        """Posição de cada valor em labels (-1 para valores fora de labels)."""
+        y = np.asarray(y)
+        pos = np.searchsorted(self.labels[self._order], y).clip(0, len(self.labels) - 1)
+        idx = self._order[pos]
+        return np.where(self.labels[idx] == y, idx, -1)
     
-    return X_train, X_test, y_train, y_test
+    def update(self, y_true, y_pred):
+        """Acumula um bloco de valores reais e previstos na matriz de confusão."""
+        t, p = self._index(y_true), self._index(y_pred)
+        ok = (t >= 0) & (p >= 0)
+        n = len(self.labels)
+        self.matrix += np.bincount(t[ok] * n + p[ok], minlength=n * n).reshape(n, n)
+        return self
+    
+    @classmethod
+    def from_predictions(cls, y_true, y_pred, labels=[0, 1]):
+        return cls(labels).update(y_true, y_pred)
+    
+    def per_class(self):
+        """Precisão, recall, F1 e suporte de cada classe (zero quando indefinido)."""
+        tp = np.diag(self.matrix).astype(np.float64)
+        support = self.matrix.sum(axis=1)
+        predicted = self.matrix.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precision = np.where(predicted > 0, tp / predicted, 0.0)
+            recall = np.where(support > 0, tp / support, 0.0)
+            f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+        return precision, recall, f1, support
+    
+    def metrics(self):
+        """Mesmas chaves que calculate_all_metrics."""
+        precision, recall, f1, support = self.per_class()
+        total = support.sum()
+        weights = support / total if total else support
+        metrics = {
+            'accuracy': np.trace(self.matrix) / total if total else 0.0,
+            'precision': float(precision @ weights),
+            'recall': float(recall @ weights),
+            'f1_score': float(f1 @ weights)
+        }
+        
+        # Métricas por classe (para problemas binários)
+        if np.count_nonzero(support) == 2:
+            for i, label in enumerate(self.labels):
+                metrics[f'precision_class_{label}'] = float(precision[i])
+                metrics[f'recall_class_{label}'] = float(recall[i])
+                metrics[f'f1_class_{label}'] = float(f1[i])
+        
+        return metrics
+    
+    def report(self, target_names=['<=50k', '>50k'], digits=2):
+        """Texto no mesmo formato do classification_report do sklearn."""
+        precision, recall, f1, support = self.per_class()
+        total = support.sum()
+        weights = support / total if total else support
+        width = max(max(len(name) for name in target_names), len('weighted avg'), digits)
+        
+        headers = ['precision', 'recall', 'f1-score', 'support']
+        report = ('{:>{width}s} ' + ' {:>9}' * 4).format('', *headers, width=width) + '\n\n'
+        row_fmt = '{:>{width}s} ' + ' {:>9.{digits}f}' * 3 + ' {:>9}\n'
+        for i, name in enumerate(target_names):
+            report += row_fmt.format(name, precision[i], recall[i], f1[i], support[i], width=width, digits=digits)
+        report += '\n'
+        accuracy = np.trace(self.matrix) / total if total else 0.0
+        report += ('{:>{width}s} ' + ' {:>9}' * 2 + ' {:>9.{digits}f}' + ' {:>9}\n').format(
+            'accuracy', '', '', accuracy, total, width=width, digits=digits)
+        report += row_fmt.format('macro avg', precision.mean(), recall.mean(), f1.mean(), total,
+                                 width=width, digits=digits)
+        report += row_fmt.format('weighted avg', precision @ weights, recall @ weights, f1 @ weights, total,
+                                 width=width, digits=digits)
+        return report
+
+
 def calculate_all_metrics(y_true, y_pred):
     """
     Calcula todas as métricas principais de classificação
@@ -48,26 +139,12 @@ def calculate_all_metrics(y_true, y_pred):
     Returns:
         dict: Dicionário com todas as métricas calculadas
     """
-    metrics = {
-        'accuracy': accuracy_score(y_true, y_pred),
-        'precision': precision_score(y_true, y_pred, average='weighted'),
-        'recall': recall_score(y_true, y_pred, average='weighted'),
-        'f1_score': f1_score(y_true, y_pred, average='weighted')
-    }
-    
-    # Métricas por classe (para problemas binários)
-    if len(np.unique(y_true)) == 2:
-        metrics['precision_class_0'] = precision_score(y_true, y_pred, pos_label=0, zero_division=0)
-        metrics['recall_class_0'] = recall_score(y_true, y_pred, pos_label=0, zero_division=0)
-        metrics['f1_class_0'] = f1_score(y_true, y_pred, pos_label=0, zero_division=0)
-        metrics['precision_class_1'] = precision_score(y_true, y_pred, pos_label=1, zero_division=0)
-        metrics['recall_class_1'] = recall_score(y_true, y_pred, pos_label=1, zero_division=0)
-        metrics['f1_class_1'] = f1_score(y_true, y_pred, pos_label=1, zero_division=0)
-    
-    return metrics
+    # Uma matriz de confusão só; todas as métricas saem dela
+    return ConfusionMetrics.from_predictions(y_true, y_pred).metrics()
 
 
-def print_metrics_summary(y_true, y_pred, model_name, labels=[0, 1], target_names=['<=50k', '>50k']):
+def print_metrics_summary(y_true, y_pred, model_name, labels=[0, 1], target_names=['<=50k', '>50k'],
+                          engine=None):
     """
     Imprime um resumo formatado das métricas de classificação
     
@@ -77,7 +154,11 @@ def print_metrics_summary(y_true, y_pred, model_name, labels=[0, 1], target_name
         model_name: Nome do modelo para exibição
         labels: Lista de labels das classes
         target_names: Nomes amigáveis das classes
+        engine: ConfusionMetrics já acumulado (se informado, y_true/y_pred são ignorados)
     """
+    if engine is None:
+        engine = ConfusionMetrics.from_predictions(y_true, y_pred, labels)
+    
     # Mapear nomes simples para nomes amigáveis
     name_mapping = {
         'knn': 'KNN',
@@ -91,15 +172,14 @@ def print_metrics_summary(y_true, y_pred, model_name, labels=[0, 1], target_name
     print("="*50)
     
     # Acurácia
-    acc = accuracy_score(y_true, y_pred)
-    print(f"Acurácia: {acc:.4f}\n")
+    metrics = engine.metrics()
+    print(f"Acurácia: {metrics['accuracy']:.4f}\n")
     
     # Classification Report
     print("Classification Report:")
-    print(classification_report(y_true, y_pred, labels=labels, target_names=target_names))
+    print(engine.report(target_names))
     
     # Métricas adicionais
-    metrics = calculate_all_metrics(y_true, y_pred)
     print(f"Precisão (weighted): {metrics['precision']:.4f}")
     print(f"Recall (weighted): {metrics['recall']:.4f}")
     print(f"F1-Score (weighted): {metrics['f1_score']:.4f}")
@@ -107,7 +187,7 @@ def print_metrics_summary(y_true, y_pred, model_name, labels=[0, 1], target_name
 
 def plot_confusion_matrix(y_true, y_pred, model_name, save_path, 
                           labels=[0, 1], target_names=['<=50k', '>50k'], 
-                          cmap='Blues'):
+                          cmap='Blues', cm=None):
     """
     Cria e salva uma visualização da matriz de confusão
     
@@ -119,6 +199,7 @@ def plot_confusion_matrix(y_true, y_pred, model_name, save_path,
         labels: Lista de labels das classes
         target_names: Nomes amigáveis das classes
         cmap: Mapa de cores para o heatmap
+        cm: Matriz de confusão já calculada (se informada, y_true/y_pred são ignorados)
     """
     # Mapear nomes simples para nomes amigáveis
     name_mapping = {
@@ -128,7 +209,12 @@ def plot_confusion_matrix(y_true, y_pred, model_name, save_path,
     }
     display_name = name_mapping.get(model_name.lower(), model_name)
     
-    cm = confusion_matrix(y_true, y_pred, labels=labels)
+    # Import tardio: só o processo que renderiza paga o custo do matplotlib/seaborn
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
+    if cm is None:
+        cm = ConfusionMetrics.from_predictions(y_true, y_pred, labels).matrix
     
     plt.figure(figsize=(8, 6))
     sns.heatmap(cm, annot=True, fmt='d', cmap=cmap,
@@ -145,12 +231,46 @@ def plot_confusion_matrix(y_true, y_pred, model_name, save_path,
     plt.close()
 
 
+def plot_models_comparison(comparison_df, save_path,
+                           metrics=('accuracy', 'precision', 'recall', 'f1_score')):
+    """
+    Cria e salva um gráfico de barras comparando as métricas dos modelos
+    
+    Args:
+        comparison_df: DataFrame retornado por compare_models_metrics (índice = modelo)
+        save_path: Caminho completo para salvar a figura
+        metrics: Colunas do DataFrame que serão exibidas
+    """
+    name_mapping = {
+        'knn': 'KNN',
+        'svm': 'SVM',
+        'tree': 'Árvore de Decisão'
+    }
+    df = comparison_df[list(metrics)].rename(index=lambda m: name_mapping.get(m.lower(), m))
+    
+    import matplotlib.pyplot as plt
+    
+    ax = df.plot(kind='bar', figsize=(10, 6), rot=0, colormap='viridis', edgecolor='black')
+    ax.set_title('Comparação entre Modelos', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Valor', fontsize=12)
+    ax.set_xlabel('Modelo', fontsize=12)
+    ax.set_ylim(max(0.0, df.values.min() - 0.1), 1.0)
+    ax.legend(title='Métrica', loc='lower right')
+    for container in ax.containers:
+        ax.bar_label(container, fmt='%.3f', fontsize=8)
+    plt.tight_layout()
+    
+    plt.savefig(save_path, dpi=300, bbox_inches='tight')
+    print(f'Comparação entre modelos salva em: {save_path}')
+    plt.close()
+
+
 def evaluate_model(y_true, y_pred, model_name, save_dir='reports/figs',
                    labels=[0, 1], target_names=['<=50k', '>50k'],
-                   cmap='Blues'):
+                   cmap='Blues', engine=None):
     """
     Função completa para avaliar um modelo: calcula métricas, imprime resumo
-    e salva matriz de confusão
+    e enfileira a matriz de confusão na camada de relatórios (reporting.py)
     
     Args:
         y_true: Valores reais
@@ -160,6 +280,8 @@ def evaluate_model(y_true, y_pred, model_name, save_dir='reports/figs',
         labels: Lista de labels das classes
         target_names: Nomes amigáveis das classes
         cmap: Mapa de cores para o heatmap
+        engine: ConfusionMetrics já acumulado (ex: avaliação em blocos); se informado,
+                y_true/y_pred são ignorados
         
     Returns:
         dict: Dicionário com todas as métricas calculadas
@@ -169,15 +291,22 @@ def evaluate_model(y_true, y_pred, model_name, save_dir='reports/figs',
     # Garantir que o diretório existe
     os.makedirs(save_dir, exist_ok=True)
     
+    # Uma matriz de confusão por avaliação: resumo, figura e métricas saem dela
+    if engine is None:
+        engine = ConfusionMetrics.from_predictions(y_true, y_pred, labels)
+    
     # Imprimir resumo das métricas
-    print_metrics_summary(y_true, y_pred, model_name, labels, target_names)
+    print_metrics_summary(y_true, y_pred, model_name, labels, target_names, engine=engine)
     
-    # Criar e salvar matriz de confusão
+    # Matriz de confusão renderizada fora do caminho crítico (ou não, com --no-plots)
     save_path = os.path.join(save_dir, f'confusion_matrix_{model_name.lower().replace(" ", "_")}.png')
-    plot_confusion_matrix(y_true, y_pred, model_name, save_path, labels, target_names, cmap)
+    reporting.queue_figure('confusion_matrix', model_name=model_name, save_path=save_path,
+                           labels=list(labels), target_names=list(target_names), cmap=cmap,
+                           cm=engine.matrix.tolist())
+    reporting.flush()
     
     # Retornar métricas calculadas
-    return calculate_all_metrics(y_true, y_pred)
+    return engine.metrics()
 
 
 def compare_models_metrics(models_results):
@@ -0,0 +1,51 @@
+import numpy as np
+
+
+class RegistroGeracoes:
+    """
+    Registro de estatísticas por geração em arrays NumPy pré-alocados.
+
+    Cada linha guarda: melhor fitness, média, desvio padrão, nº de indivíduos únicos,
+    avaliações acumuladas, tempo decorrido (s), as taxas de cruzamento e mutação
+    usadas na geração, as duplicatas encontradas na inserção dos filhos e quantas
+    delas foram substituídas (deduplicação).
+    A capacidade dobra quando enche,
+    então registrar uma geração custa O(1) amortizado.
+    """
+    CAMPOS = ('melhor', 'media', 'desvio', 'unicos', 'avaliacoes', 'tempo_s', 'taxa_cx', 'taxa_mut', 'duplicatas',
+              'substituidas')
+
+    def __init__(self, capacidade: int = 64):
+        self._dados = np.empty((max(capacidade, 1), len(self.CAMPOS)), dtype=np.float64)
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def registrar(self, *valores: float):
+        """Adiciona uma geração (valores na ordem de CAMPOS)."""
+        if self.n == len(self._dados):
+            # Crescimento geométrico: copia só quando a capacidade dobra
+            novo = np.empty((2 * len(self._dados), len(self.CAMPOS)), dtype=np.float64)
+            novo[:self.n] = self._dados[:self.n]
+            self._dados = novo
+        self._dados[self.n] = valores
+        self.n += 1
+
+    def __getitem__(self, campo: str) -> np.ndarray:
+        """Série de um campo (view sem cópia das gerações registradas)."""
+        return self._dados[:self.n, self.CAMPOS.index(campo)]
+
+    def linha(self, i: int = -1) -> str:
+        """Resumo compacto de uma geração para o log."""
+        i = i % self.n
+        (melhor, media, desvio, unicos, avaliacoes, tempo_s, taxa_cx, taxa_mut, duplicatas,
+         substituidas) = self._dados[i]
+        return (f"Gen {i}: Melhor Fitness = {melhor:.4f} | Média = {media:.2f} ± {desvio:.2f} | "
+                f"Únicos = {int(unicos)} | Duplicatas = {int(duplicatas)} ({int(substituidas)} substituídas) | "
+                f"Avaliações = {int(avaliacoes)} | "
+                f"CX = {taxa_cx:.2f} MUT = {taxa_mut:.2f} | {tempo_s:.2f}s")
+
+    def salvar(self, caminho: str):
+        """Salva as séries em um arquivo .npz (uma chave por campo)."""
+        np.savez(caminho, **{campo: self[campo] for campo in self.CAMPOS})
@@ -1,10 +1,38 @@
-import random
-from typing import List, Callable, Any, Tuple
+import time
+import heapq
+from typing import List, Callable, Any, Tuple, Hashable
+
+import numpy as np
+
+from common.seeds import gerador
+from src.part3_ga.estatisticas import RegistroGeracoes
+
+
+def chave_padrao(ind: Any) -> Hashable:
+    """
+    Forma canônica padrão de um indivíduo sequencial: a tupla dos genes ou, se algum
+    gene não for hashable (ex: dataclass mutável), a tupla das identidades dos genes.
+    """
+    chave = tuple(ind)
+    try:
+        hash(chave)
+    except TypeError:
+        return tuple(map(id, ind))
+    return chave
+
 
 class GA:
     """
     Classe genérica para Algoritmo Genético.
+
+    Modos:
+      - 'geracional': cada geração reconstrói a população inteira (step).
+      - 'estacionario': cada passo gera dois filhos que substituem os piores
+        membros (step_estacionario); a população fica em um heap pelo fitness
+        guardado, então achar e trocar o pior custa O(log pop).
     """
+    MODOS = ('geracional', 'estacionario')
+
     def __init__(
         self,
         pop_size: int,
@@ -15,9 +43,21 @@ class GA:
         cx_rate: float = 0.7,    # Chance de Cruzamento
         mut_rate: float = 0.01,   # Chance de Mutação
         elitism: bool = True,    # Se mantém o melhor de todos sempre
-        seed: int = 42
+        seed: int = 42,
+        rng: np.random.Generator = None,  # Gerador próprio (não usa o estado global)
+        key_fn: Callable[[Any], Hashable] = chave_padrao,  # Forma canônica do indivíduo (conta os únicos)
+        adaptativo: bool = False,  # Ajusta as taxas pela diversidade da população
+        limites_cx: Tuple[float, float] = (0.6, 0.95),
+        limites_mut: Tuple[float, float] = (0.01, 0.5),
+        diversidade_alvo: float = 0.5,  # Fração de indivíduos únicos abaixo da qual as taxas sobem
+        deduplicar: bool = False,  # Não insere cópias de indivíduos já presentes na nova população
+        tentativas_dedup: int = 3,  # Mutações tentadas em uma duplicata antes de gerar um indivíduo novo
+        modo: str = 'geracional',  # 'geracional' ou 'estacionario' (steady-state)
+        populacao_inicial: List[Any] = None  # Indivíduos prontos (ex: do ACO); o restante é aleatório
     ):
-        random.seed(seed)
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo desconhecido: {modo}. Use um de {self.MODOS}")
+        self.rng = gerador(rng, seed)
         self.pop_size = pop_size
         self.fitness_fn = fitness_fn
         self.create_ind = create_ind
@@ -26,70 +66,230 @@ class GA:
         self.cx_rate = cx_rate
         self.mut_rate = mut_rate
         self.elitism = elitism
-        
-        # Inicializa a população
-        self.population = [self.create_ind() for _ in range(pop_size)]
-        
+        self.key_fn = key_fn
+        self.adaptativo = adaptativo
+        self.limites_cx = limites_cx
+        self.limites_mut = limites_mut
+        self.diversidade_alvo = diversidade_alvo
+        self.deduplicar = deduplicar
+        self.tentativas_dedup = tentativas_dedup
+        self.modo = modo
+
+        # Duplicatas encontradas na inserção da última geração (e quantas foram substituídas)
+        self.duplicatas = 0
+        self.substituidas = 0
+
+        # Contador de chamadas à função de fitness
+        self.n_avaliacoes = 0
+
+        # Inicializa a população (o fitness de cada indivíduo é calculado uma vez e guardado)
+        sementes = list(populacao_inicial or [])[:pop_size]
+        self.population = sementes + [self.create_ind() for _ in range(pop_size - len(sementes))]
+        self.scores = [self.avaliar(ind) for ind in self.population]
+
+        # Modo estacionário: heap (fitness, posição) com o pior no topo e contagem das chaves da população
+        self._heap = None
+        self._chaves = None
+        self._chave_pos = None
+
         # Histórico para gráficos
         self.history = []
+        self.estatisticas = RegistroGeracoes()
+
+    def avaliar(self, ind: Any) -> float:
+        """Calcula o fitness de um indivíduo contabilizando a avaliação."""
+        self.n_avaliacoes += 1
+        return self.fitness_fn(ind)
 
-    def select_tournament(self, k: int = 3) -> Any:
+    def select_tournament(self, k: int = 3) -> Tuple[Any, float]:
         """
-        Seleção por Torneio: Pega K indivíduos aleatórios e retorna o melhor.
+        Seleção por Torneio: Pega K indivíduos aleatórios e retorna o melhor (e seu fitness).
         """
-        competitors = random.sample(self.population, k)
+        idx = self.rng.choice(len(self.population), k, replace=False)
         # Retorna o que tiver maior fitness
-        return max(competitors, key=self.fitness_fn)
+        vencedor = max(idx, key=self.scores.__getitem__)
+        return self.population[vencedor], self.scores[vencedor]
+
+    def _resolver_duplicata(self, ind: Any, score: Any, vistos) -> Tuple[Any, Any, Hashable]:
+        """
+        Calcula a chave canônica (key_fn) uma vez e a consulta em `vistos`
+        (set ou dict): O(1) por indivíduo, sem comparar pares.
+        Com deduplicar=True, uma duplicata é mutada (até `tentativas_dedup` vezes)
+        e, se continuar repetida, trocada por um indivíduo novo (score None: reavaliar).
+        """
+        chave = self.key_fn(ind)
+        if chave in vistos:
+            self.duplicatas += 1
+            if self.deduplicar:
+                for _ in range(self.tentativas_dedup):
+                    ind = self.mutate_fn(ind)
+                    chave = self.key_fn(ind)
+                    if chave not in vistos:
+                        break
+                else:
+                    ind = self.create_ind()
+                    chave = self.key_fn(ind)
+                score = None
+                self.substituidas += 1
+        return ind, score, chave
+
+    def _inserir(self, ind: Any, score: Any, new_pop: list, new_scores: list, vistos: set):
+        """Adiciona um filho à nova população (modo geracional)."""
+        ind, score, chave = self._resolver_duplicata(ind, score, vistos)
+        vistos.add(chave)
+        new_pop.append(ind)
+        new_scores.append(self.avaliar(ind) if score is None else score)
+
+    def _gerar_filhos(self) -> List[Tuple[Any, Any]]:
+        """Seleciona dois pais e aplica cruzamento/mutação. Score None = filho precisa ser avaliado."""
+        # Seleção dos Pais
+        p1, s1 = self.select_tournament()
+        p2, s2 = self.select_tournament()
+
+        # Cruzamento (Crossover)
+        offspring1, offspring2 = p1, p2 # Padrão: cópia
+        if self.rng.random() < self.cx_rate:
+            # Se não for uma lista (ex: objeto customizado), o crossover deve lidar com a cópia
+            offspring1, offspring2 = self.crossover_fn(p1, p2)
+            s1 = s2 = None
+
+        # Mutação
+        if self.rng.random() < self.mut_rate:
+            offspring1 = self.mutate_fn(offspring1)
+            s1 = None
+        if self.rng.random() < self.mut_rate:
+            offspring2 = self.mutate_fn(offspring2)
+            s2 = None
+
+        # Cópias inalteradas reaproveitam o fitness do pai
+        return [(offspring1, s1), (offspring2, s2)]
 
     def step(self):
         """
         Executa UMA geração (evolução).
         """
         new_pop = []
-        
+        new_scores = []
+        vistos = set()
+        self.duplicatas = 0
+        self.substituidas = 0
+
         # 1. Elitismo: Mantém o melhor da geração anterior intacto?
         if self.elitism:
-            best_ind = max(self.population, key=self.fitness_fn)
-            new_pop.append(best_ind)
-            
+            best_idx = int(np.argmax(self.scores))
+            self._inserir(self.population[best_idx], self.scores[best_idx], new_pop, new_scores, vistos)
+
         # 2. Gera novos indivíduos até encher a população
         while len(new_pop) < self.pop_size:
-            # Seleção dos Pais
-            p1 = self.select_tournament()
-            p2 = self.select_tournament()
-            
-            # Cruzamento (Crossover)
-            offspring1, offspring2 = p1, p2 # Padrão: cópia
-            if random.random() < self.cx_rate:
-                # Se não for uma lista (ex: objeto customizado), o crossover deve lidar com a cópia
-                offspring1, offspring2 = self.crossover_fn(p1, p2)
-            
-            # Mutação
-            if random.random() < self.mut_rate:
-                offspring1 = self.mutate_fn(offspring1)
-            if random.random() < self.mut_rate:
-                offspring2 = self.mutate_fn(offspring2)
-                
-            # Adiciona na nova população
-            new_pop.append(offspring1)
-            if len(new_pop) < self.pop_size:
-                new_pop.append(offspring2)
-        
+            for filho, score in self._gerar_filhos():
+                if len(new_pop) < self.pop_size:
+                    self._inserir(filho, score, new_pop, new_scores, vistos)
+
         self.population = new_pop
+        self.scores = new_scores
+        self._heap = None  # A população mudou inteira: o heap do modo estacionário é refeito se usado
+
+    def _iniciar_heap(self):
+        """Monta o heap (fitness, posição) e a contagem de chaves da população atual: O(pop)."""
+        self._heap = [(score, i) for i, score in enumerate(self.scores)]
+        heapq.heapify(self._heap)
+        self._chave_pos = [self.key_fn(ind) for ind in self.population]
+        self._chaves = {}
+        for chave in self._chave_pos:
+            self._chaves[chave] = self._chaves.get(chave, 0) + 1
+
+    def step_estacionario(self):
+        """
+        Um passo steady-state: dois filhos; cada um substitui o pior membro da
+        população se for melhor que ele. Só os filhos novos são avaliados.
+        """
+        if self._heap is None:
+            self._iniciar_heap()
+
+        for filho, score in self._gerar_filhos():
+            filho, score, chave = self._resolver_duplicata(filho, score, self._chaves)
+            if score is None:
+                score = self.avaliar(filho)
+
+            pior, pos = self._heap[0]
+            if score <= pior:
+                continue
+            heapq.heapreplace(self._heap, (score, pos))
+
+            antiga = self._chave_pos[pos]
+            self._chaves[antiga] -= 1
+            if not self._chaves[antiga]:
+                del self._chaves[antiga]
+            self._chaves[chave] = self._chaves.get(chave, 0) + 1
+            self._chave_pos[pos] = chave
+            self.population[pos] = filho
+            self.scores[pos] = score
+
+    def geracao(self):
+        """
+        Avança uma geração: no modo estacionário, pop_size/2 passos
+        (o mesmo número de filhos de uma geração do modo geracional).
+        """
+        if self.modo == 'geracional':
+            self.step()
+            return
+        self.duplicatas = 0
+        self.substituidas = 0
+        for _ in range((self.pop_size + 1) // 2):
+            self.step_estacionario()
+
+    def diversidade(self) -> float:
+        """Fração de indivíduos distintos na população (pela forma canônica key_fn)."""
+        return len({self.key_fn(ind) for ind in self.population}) / len(self.population)
+
+    def adaptar_taxas(self, diversidade: float):
+        """
+        Ajusta as taxas dentro dos limites: com a população diversa usa os mínimos;
+        conforme a fração de únicos cai abaixo de `diversidade_alvo`, sobe
+        linearmente até os máximos (mais mutação para sair da estagnação).
+        """
+        pressao = min(max((self.diversidade_alvo - diversidade) / self.diversidade_alvo, 0.0), 1.0)
+        self.cx_rate = self.limites_cx[0] + pressao * (self.limites_cx[1] - self.limites_cx[0])
+        self.mut_rate = self.limites_mut[0] + pressao * (self.limites_mut[1] - self.limites_mut[0])
 
-    def run(self, n_generations: int, verbose: bool = True) -> Any:
+    def run(self, n_generations: int, verbose: bool = True, log_intervalo: int = 10,
+            caminho_estatisticas: str = None) -> Any:
         """
         Loop principal de execução.
+
+        Args:
+            n_generations: Número de gerações
+            verbose: Se True, imprime o resumo da geração a cada `log_intervalo` gerações
+            log_intervalo: Intervalo (em gerações) entre as linhas de log (< 1 desliga o log por geração)
+            caminho_estatisticas: Se informado, salva as estatísticas por geração em .npz
         """
+        inicio = time.perf_counter()
+        if self.adaptativo:
+            self.adaptar_taxas(self.diversidade())
         for gen in range(n_generations):
-            self.step()
-            
-            # Coleta estatísticas
-            best_ind = max(self.population, key=self.fitness_fn)
-            best_score = self.fitness_fn(best_ind)
+            taxas = (self.cx_rate, self.mut_rate)
+            self.geracao()
+
+            # Coleta estatísticas (o fitness da população já está calculado)
+            scores = np.asarray(self.scores)
+            best_score = float(scores.max())
+            diversidade = self.diversidade()
             self.history.append(best_score)
-            
-            if verbose and gen % 10 == 0:
-                print(f"Gen {gen}: Melho Fitness = {best_score:.4f}")
-                
-        return max(self.population, key=self.fitness_fn)
\ No newline at end of file
+            self.estatisticas.registrar(
+                best_score, scores.mean(), scores.std(),
+                diversidade * len(self.population),
+                self.n_avaliacoes, time.perf_counter() - inicio, *taxas, self.duplicatas,
+                self.substituidas
+            )
+
+            # Modo adaptativo: as taxas da próxima geração dependem da diversidade atual
+            if self.adaptativo:
+                self.adaptar_taxas(diversidade)
+
+            if verbose and log_intervalo > 0 and gen % log_intervalo == 0:
+                print(self.estatisticas.linha())
+
+        if caminho_estatisticas:
+            self.estatisticas.salvar(caminho_estatisticas)
+
+        return self.population[int(np.argmax(self.scores))]
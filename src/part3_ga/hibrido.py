@@ -0,0 +1,114 @@
+import os
+from typing import Any, Callable, List
+
+from src.part3_ga.ga import GA
+from src.part4_swarm_immune.aco import ACO
+
+
+class HibridoACOGA:
+    """
+    Pipeline híbrido ACO → AG.
+
+    Uma fase curta de ACO (a heurística das formigas já monta provas quase viáveis)
+    preenche parte ou toda a população inicial do AG com as melhores soluções
+    distintas do arquivo da colônia; o AG refina a partir delas.
+
+    Com `ciclos` > 1 as fases se alternam: a cada ciclo a colônia roda mais
+    `iters_aco` iterações e um novo AG recebe as sementes da colônia mais os
+    melhores indivíduos do AG anterior. Com `retorno=True`, o melhor indivíduo de
+    cada fase do AG é depositado como feromônio (com o peso da formiga elite),
+    guiando a colônia para a região que o AG encontrou.
+    """
+    def __init__(self, aco: ACO, criar_ga: Callable[[List[Any]], GA], pop_size: int, iters_aco: int = 5,
+                 fracao: float = 1.0, ciclos: int = 1, retorno: bool = False, peso_retorno: float = None):
+        """
+        Args:
+            aco: Colônia com arquivo de soluções (tamanho_arquivo > 0)
+            criar_ga: Cria o AG a partir da população inicial (lista de indivíduos)
+            pop_size: Tamanho da população do AG
+            iters_aco: Iterações da colônia por ciclo
+            fracao: Fração da população inicial vinda da colônia (o restante é aleatório)
+            ciclos: Número de alternâncias ACO → AG
+            retorno: Deposita o melhor do AG no feromônio ao fim de cada ciclo
+            peso_retorno: Feromônio depositado no retorno (padrão: e * Q, o da formiga elite)
+        """
+        if not aco.tamanho_arquivo:
+            raise ValueError("A colônia precisa de um arquivo de soluções (tamanho_arquivo > 0)")
+        if not 0.0 <= fracao <= 1.0:
+            raise ValueError(f"fracao deve estar em [0, 1], recebido {fracao}")
+        self.aco = aco
+        self.criar_ga = criar_ga
+        self.pop_size = pop_size
+        self.iters_aco = iters_aco
+        self.n_sementes = int(round(fracao * pop_size))
+        self.ciclos = max(1, ciclos)
+        self.retorno = retorno
+        self.peso_retorno = aco.e * aco.Q if peso_retorno is None else peso_retorno
+
+        self.ga = None
+        self.best_solution = None
+        self.best_fitness = float('-inf')
+
+    def _populacao_inicial(self) -> List[Any]:
+        """Sementes da colônia e, a partir do 2º ciclo, os melhores do AG anterior nas vagas restantes."""
+        sementes = [sol for sol, _ in self.aco.melhores_distintas(self.n_sementes)]
+        if self.ga is None:
+            return sementes
+
+        chaves = {self.ga.key_fn(s) for s in sementes}
+        ordem = sorted(range(len(self.ga.population)), key=lambda i: -self.ga.scores[i])
+        for i in ordem:
+            if len(sementes) >= self.pop_size:
+                break
+            ind = self.ga.population[i]
+            chave = self.ga.key_fn(ind)
+            if chave not in chaves:
+                chaves.add(chave)
+                sementes.append(ind)
+        return sementes
+
+    def _caminho_ciclo(self, caminho: str, ciclo: int) -> str:
+        """Arquivo de estatísticas do AG de um ciclo: o próprio caminho ou, com vários ciclos, `<base>_ciclo<k><ext>`."""
+        if self.ciclos == 1:
+            return caminho
+        base, ext = os.path.splitext(caminho)
+        return f"{base}_ciclo{ciclo}{ext}"
+
+    def run(self, n_generations: int, verbose: bool = True, log_intervalo: int = 10,
+            caminho_estatisticas: str = None) -> Any:
+        """
+        Executa os ciclos ACO → AG, dividindo as gerações do AG entre eles.
+
+        Args:
+            n_generations: Total de gerações do AG (somando os ciclos)
+            verbose: Se True, imprime o log de cada fase do AG e o resumo de cada ciclo
+            log_intervalo: Intervalo (em gerações) entre as linhas de log do AG
+            caminho_estatisticas: Se informado, salva as estatísticas por geração de cada AG em .npz
+                (um arquivo por ciclo, com o sufixo `_ciclo<k>`, quando há mais de um ciclo)
+
+        Returns:
+            Melhor solução encontrada (AG ou colônia)
+        """
+        for ciclo in range(self.ciclos):
+            self.aco.run(n_iterations=self.iters_aco, verbose=False)
+            populacao = self._populacao_inicial()
+            self.ga = self.criar_ga(populacao)
+
+            geracoes = n_generations // self.ciclos + (1 if ciclo < n_generations % self.ciclos else 0)
+            caminho = self._caminho_ciclo(caminho_estatisticas, ciclo) if caminho_estatisticas else None
+            melhor = self.ga.run(n_generations=geracoes, verbose=verbose, log_intervalo=log_intervalo,
+                                 caminho_estatisticas=caminho)
+            melhor_fitness = max(self.ga.scores)
+            if melhor_fitness > self.best_fitness:
+                self.best_solution, self.best_fitness = melhor, melhor_fitness
+            if self.aco.best_fitness > self.best_fitness:
+                self.best_solution, self.best_fitness = self.aco.best_solution, self.aco.best_fitness
+
+            if self.retorno:
+                self.aco.depositar(melhor, self.peso_retorno)
+
+            if verbose:
+                print(f"Ciclo {ciclo}: ACO melhor = {self.aco.best_fitness:.2f} | "
+                      f"{len(populacao)} semente(s) | AG melhor = {melhor_fitness:.2f} ({geracoes} gerações)")
+
+        return self.best_solution
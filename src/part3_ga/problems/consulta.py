@@ -0,0 +1,122 @@
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+# Consultas distintas guardadas no cache de resultados (LRU)
+TAMANHO_CACHE = 128
+
+
+def _bitmap(posicoes: Iterable[int], n: int) -> int:
+    """Inteiro com o bit i ligado para cada posição i (montado via bytes, em O(n))."""
+    buf = bytearray((n + 7) // 8)
+    for i in posicoes:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, 'little')
+
+
+def _posicoes(bits: int) -> List[int]:
+    """Posições dos bits ligados, em ordem crescente."""
+    s = format(bits, 'b')[::-1]
+    posicoes = []
+    i = s.find('1')
+    while i != -1:
+        posicoes.append(i)
+        i = s.find('1', i + 1)
+    return posicoes
+
+
+class IndiceBitmap:
+    """
+    Índice de consultas com vários predicados sobre uma lista fixa de itens.
+
+    Cada valor de um campo categórico tem um bitmap (inteiro Python, bit i = item i),
+    e os predicados se combinam com E/OU bit a bit. Campos numéricos guardam os
+    valores distintos ordenados e o bitmap acumulado até cada um, então uma faixa
+    [mín, máx] sai de duas buscas binárias e um XOR. Só a conversão do bitmap final
+    para a lista de itens percorre elementos, e ela é proporcional ao resultado.
+
+    Campos categóricos são comparados sem diferença de maiúsculas/minúsculas.
+    """
+    def __init__(self, itens: Sequence[Any], categoricos: Sequence[str], numericos: Sequence[str],
+                 chave: str = 'id', tamanho_cache: int = TAMANHO_CACHE):
+        self.itens = list(itens)
+        n = len(self.itens)
+        self.todos = (1 << n) - 1
+
+        self.categoricos: Dict[str, Dict[str, int]] = {}
+        for campo in categoricos:
+            grupos: Dict[str, List[int]] = {}
+            for i, item in enumerate(self.itens):
+                grupos.setdefault(str(getattr(item, campo)).lower(), []).append(i)
+            self.categoricos[campo] = {v: _bitmap(p, n) for v, p in grupos.items()}
+
+        # Campo numérico: (valores distintos ordenados, acumulado[j] = itens com valor < valores[j])
+        self.numericos: Dict[str, Tuple[List[Any], List[int]]] = {}
+        for campo in numericos:
+            grupos = {}
+            for i, item in enumerate(self.itens):
+                grupos.setdefault(getattr(item, campo), []).append(i)
+            valores = sorted(grupos)
+            acumulado = [0]
+            for v in valores:
+                acumulado.append(acumulado[-1] | _bitmap(grupos[v], n))
+            self.numericos[campo] = (valores, acumulado)
+
+        self.posicao = {getattr(item, chave): i for i, item in enumerate(self.itens)}
+
+        self.tamanho_cache = tamanho_cache
+        self._cache: 'OrderedDict[Hashable, Tuple[Any, ...]]' = OrderedDict()
+        self.acertos_cache = 0
+        self.faltas_cache = 0
+
+    def bitmap_categorico(self, campo: str, valores: Iterable[str]) -> int:
+        """OU dos bitmaps dos valores (valores inexistentes não selecionam nada)."""
+        bitmaps = self.categoricos[campo]
+        bits = 0
+        for v in valores:
+            bits |= bitmaps.get(str(v).lower(), 0)
+        return bits
+
+    def bitmap_faixa(self, campo: str, minimo: Optional[float] = None, maximo: Optional[float] = None) -> int:
+        """Itens com minimo <= valor <= maximo (extremo None = sem limite)."""
+        valores, acumulado = self.numericos[campo]
+        lo = 0 if minimo is None else bisect_left(valores, minimo)
+        hi = len(valores) if maximo is None else bisect_right(valores, maximo)
+        return acumulado[hi] ^ acumulado[lo] if hi > lo else 0
+
+    def bitmap_chaves(self, chaves: Iterable[Hashable]) -> int:
+        return _bitmap((self.posicao[c] for c in chaves if c in self.posicao), len(self.itens))
+
+    def consultar(self, categoricos: Dict[str, Iterable[str]], faixas: Dict[str, Tuple], excluir=()) -> List[Any]:
+        """
+        Itens que satisfazem todos os predicados, na ordem original.
+
+        Args:
+            categoricos: {campo: valores aceitos} (OU dentro do campo, E entre campos)
+            faixas: {campo: (mín, máx)} inclusivos
+            excluir: chaves de itens a descartar
+        """
+        # Materializa uma vez: um iterador seria consumido pela chave do cache
+        excluir = frozenset(excluir)
+        chave = (tuple(sorted((c, tuple(sorted(str(v).lower() for v in vs))) for c, vs in categoricos.items())),
+                 tuple(sorted(faixas.items())), excluir)
+        resultado = self._cache.get(chave)
+        if resultado is not None:
+            self._cache.move_to_end(chave)
+            self.acertos_cache += 1
+            return list(resultado)
+        self.faltas_cache += 1
+
+        bits = self.todos
+        for campo, valores in categoricos.items():
+            bits &= self.bitmap_categorico(campo, valores)
+        for campo, (minimo, maximo) in faixas.items():
+            bits &= self.bitmap_faixa(campo, minimo, maximo)
+        if excluir:
+            bits &= ~self.bitmap_chaves(excluir)
+
+        resultado = tuple(self.itens) if bits == self.todos else tuple(self.itens[i] for i in _posicoes(bits))
+        self._cache[chave] = resultado
+        if len(self._cache) > self.tamanho_cache:
+            self._cache.popitem(last=False)
+        return list(resultado)
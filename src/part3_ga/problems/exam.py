@@ -1,6 +1,56 @@
+import os
 import random
-from dataclasses import dataclass
-from typing import List, Dict
+import pickle
+from dataclasses import dataclass, astuple
+from typing import List, Dict, Iterable, Optional, Tuple, Union
+
+from common.seeds import semente_inteira
+from src.part3_ga.problems.consulta import IndiceBitmap
+
+# Snapshots do banco gerado (um arquivo por tamanho/semente)
+SNAPSHOT_DIR = 'data/processed'
+# Incrementar ao mudar a geração do banco: snapshots de versões anteriores são ignorados
+VERSAO_BANCO = 1
+
+# Base de conhecimento expandida
+MATERIAS_TOPICOS: Dict[str, List[str]] = {
+    'Matemática': [
+        'Álgebra', 'Geometria Plana', 'Geometria Espacial', 
+        'Trigonometria', 'Cálculo', 'Estatística', 'Combinatória'
+    ],
+    'Física': [
+        'Cinemática', 'Dinâmica', 'Termodinâmica', 
+        'Óptica', 'Eletromagnetismo', 'Ondulatória', 'Moderna'
+    ],
+    'Química': [
+        'Atomística', 'Físico-Química', 'Orgânica', 
+        'Inorgânica', 'Estequiometria', 'Eletroquímica'
+    ],
+    'Biologia': [
+        'Citologia', 'Genética', 'Ecologia', 
+        'Fisiologia Humana', 'Botânica', 'Evolução'
+    ],
+    'História': [
+        'Antiga', 'Medieval', 'Brasil Colônia', 
+        'Brasil Império', 'Brasil República', 'Moderna', 'Contemporânea'
+    ],
+    'Geografia': [
+        'Física', 'Humana', 'Geopolítica', 
+        'Cartografia', 'Ambiental'
+    ],
+    'Português': [
+        'Gramática', 'Literatura Brasileira', 'Interpretação de Texto', 
+        'Semântica', 'Redação'
+    ],
+    'Inglês': [
+        'Reading', 'Grammar', 'Vocabulary'
+    ]
+}
+
+
+class QuestoesInsuficientes(ValueError):
+    """O filtro (matéria/tópico) tem menos questões do que o tamanho da prova."""
+
 
 @dataclass
 class Questao:
@@ -17,77 +67,75 @@ class Questao:
         return f"Q{self.id:04d}[{self.materia[:3]}-{self.subtopico[:4]}|D:{self.dificuldade}|T:{self.tempo}m]"
 
 class BancoDeQuestoes:
-    def __init__(self, tamanho: int = 5000, seed: int = 42):
+    def __init__(self, tamanho: int = 5000, seed: int = 42, rng=None):
+        # Com um numpy Generator, a semente do banco é sorteada dele; senão usa `seed`
         self.tamanho = tamanho
-        self.seed = seed
+        self.seed = seed if rng is None else semente_inteira(rng)
         self.questoes = self._gerar_banco_sintetico()
 
+    @classmethod
+    def carregar(cls, tamanho: int = 5000, seed: int = 42, diretorio: str = SNAPSHOT_DIR) -> 'BancoDeQuestoes':
+        """
+        Banco de um snapshot em disco; na primeira chamada (ou se o snapshot for de
+        outra versão) gera o banco normalmente e grava o snapshot.
+        """
+        caminho = os.path.join(diretorio, f'banco_{tamanho}_{seed}.pkl')
+        try:
+            with open(caminho, 'rb') as f:
+                snapshot = pickle.load(f)
+            if snapshot['versao'] == VERSAO_BANCO:
+                banco = cls.__new__(cls)
+                banco.tamanho, banco.seed = tamanho, seed
+                banco.questoes = [Questao(*campos) for campos in snapshot['questoes']]
+                return banco
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+            pass
+
+        banco = cls(tamanho=tamanho, seed=seed)
+        try:
+            os.makedirs(diretorio, exist_ok=True)
+            # Grava em arquivo temporário e renomeia: execuções paralelas nunca leem um snapshot pela metade
+            temporario = f'{caminho}.{os.getpid()}.tmp'
+            with open(temporario, 'wb') as f:
+                pickle.dump({'versao': VERSAO_BANCO, 'questoes': [astuple(q) for q in banco.questoes]},
+                            f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, caminho)
+        except OSError:
+            pass  # Sem permissão de escrita: segue com o banco gerado
+        return banco
+
     def _gerar_banco_sintetico(self) -> List[Questao]:
         """
         Gera uma lista de 3000 questões fictícias com atributos complexos.
         """
-        random.seed(self.seed)
-        
-        # Base de conhecimento expandida
-        materias_topicos: Dict[str, List[str]] = {
-            'Matemática': [
-                'Álgebra', 'Geometria Plana', 'Geometria Espacial', 
-                'Trigonometria', 'Cálculo', 'Estatística', 'Combinatória'
-            ],
-            'Física': [
-                'Cinemática', 'Dinâmica', 'Termodinâmica', 
-                'Óptica', 'Eletromagnetismo', 'Ondulatória', 'Moderna'
-            ],
-            'Química': [
-                'Atomística', 'Físico-Química', 'Orgânica', 
-                'Inorgânica', 'Estequiometria', 'Eletroquímica'
-            ],
-            'Biologia': [
-                'Citologia', 'Genética', 'Ecologia', 
-                'Fisiologia Humana', 'Botânica', 'Evolução'
-            ],
-            'História': [
-                'Antiga', 'Medieval', 'Brasil Colônia', 
-                'Brasil Império', 'Brasil República', 'Moderna', 'Contemporânea'
-            ],
-            'Geografia': [
-                'Física', 'Humana', 'Geopolítica', 
-                'Cartografia', 'Ambiental'
-            ],
-            'Português': [
-                'Gramática', 'Literatura Brasileira', 'Interpretação de Texto', 
-                'Semântica', 'Redação'
-            ],
-            'Inglês': [
-                'Reading', 'Grammar', 'Vocabulary'
-            ]
-        }
+        # Gerador local: não altera o estado global de `random`
+        rng = random.Random(self.seed)
         
         banco = []
-        lista_materias = list(materias_topicos.keys())
+        lista_materias = list(MATERIAS_TOPICOS.keys())
         
         for i in range(self.tamanho):
             # 1. Escolha da Matéria e Tópico
-            materia_escolhida = random.choice(lista_materias)
-            subtopico_escolhido = random.choice(materias_topicos[materia_escolhida])
+            materia_escolhida = rng.choice(lista_materias)
+            subtopico_escolhido = rng.choice(MATERIAS_TOPICOS[materia_escolhida])
             
             # 2. Definição de Dificuldade (1.0 a 5.0)
-            dificuldade = round(random.uniform(1.0, 5.0), 1)
+            dificuldade = round(rng.uniform(1.0, 5.0), 1)
             
             # 3. Definição de Tempo (com mais variância para dificultar o AG)
             # Regra base: Dificuldade * 3 + aleatoriedade
             tempo_base = int(dificuldade * 3)
             
             # Introduz "Outliers" (questões difíceis mas rápidas, ou fáceis mas longas)
-            fator_caos = random.random()
+            fator_caos = rng.random()
             if fator_caos < 0.05: # 5% de chance de ser uma questão "pegadinha"
-                if random.choice([True, False]):
-                    tempo_final = tempo_base + random.randint(10, 20) # Muito longa
+                if rng.choice([True, False]):
+                    tempo_final = tempo_base + rng.randint(10, 20) # Muito longa
                 else:
-                    tempo_final = max(1, tempo_base - random.randint(2, 5)) # Muito rápida
+                    tempo_final = max(1, tempo_base - rng.randint(2, 5)) # Muito rápida
             else:
                 # Comportamento padrão
-                tempo_final = max(2, tempo_base + random.randint(-2, 4))
+                tempo_final = max(2, tempo_base + rng.randint(-2, 4))
             
             q = Questao(
                 id=i,
@@ -100,13 +148,39 @@ class BancoDeQuestoes:
             
         return banco
 
+    @property
+    def indice(self) -> IndiceBitmap:
+        """Índice de consultas (montado na primeira consulta)."""
+        if getattr(self, '_indice', None) is None:
+            self._indice = IndiceBitmap(self.questoes, categoricos=('materia', 'subtopico'),
+                                        numericos=('dificuldade', 'tempo'))
+        return self._indice
+
+    def consultar(self, materias: Union[str, Iterable[str], None] = None,
+                  subtopicos: Union[str, Iterable[str], None] = None,
+                  dificuldade: Optional[Tuple[Optional[float], Optional[float]]] = None,
+                  tempo: Optional[Tuple[Optional[int], Optional[int]]] = None,
+                  excluir_ids: Iterable[int] = ()) -> List[Questao]:
+        """
+        Consulta o banco com vários predicados combinados (E entre eles).
+
+        Args:
+            materias / subtopicos: Um nome ou lista de nomes aceitos (sem diferença de maiúsculas)
+            dificuldade / tempo: Faixa (mín, máx) inclusiva; None em um extremo = sem limite
+            excluir_ids: Ids a descartar (ex: questões usadas nas provas do semestre anterior)
+
+        Consultas repetidas vêm de um cache LRU do índice.
+        """
+        categoricos = {}
+        for campo, valores in (('materia', materias), ('subtopico', subtopicos)):
+            if valores:
+                categoricos[campo] = [valores] if isinstance(valores, str) else list(valores)
+        faixas = {campo: tuple(faixa) for campo, faixa in (('dificuldade', dificuldade), ('tempo', tempo))
+                  if faixa is not None}
+        return self.indice.consultar(categoricos, faixas, excluir_ids)
+
     def filtrar(self, materia: str = None, subtopico: str = None) -> List[Questao]:
         """
         Filtra o banco.
         """
-        resultado = self.questoes
-        if materia:
-            resultado = [q for q in resultado if q.materia.lower() == materia.lower()]
-        if subtopico:
-            resultado = [q for q in resultado if q.subtopico.lower() == subtopico.lower()]
-        return resultado
\ No newline at end of file
+        return self.consultar(materias=materia, subtopicos=subtopico)
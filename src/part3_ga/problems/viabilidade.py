@@ -0,0 +1,83 @@
+import bisect
+from itertools import accumulate
+from typing import List, Tuple
+
+from src.part3_ga.problems.exam import Questao
+
+
+class IndiceViabilidade:
+    """
+    Índice pré-computado sobre as questões candidatas de um filtro.
+
+    Guarda os tempos e dificuldades ordenados com somas de prefixo das k menores
+    e das k maiores. Com isso responde em O(1) se as r questões que faltam ainda
+    conseguem fechar a lacuna de tempo e de dificuldade da prova parcial, e em
+    O(log n) quais questões têm tempo dentro de uma faixa.
+
+    As somas usam todas as candidatas (inclusive as já escolhidas), então o teste
+    é uma relaxação: se ele diz que é inviável, a prova parcial certamente é um beco sem saída.
+
+    Por padrão só a janela de tempo é usada na poda. Como o tempo cresce com a dificuldade,
+    exigir também a média 4.0 empurra as provas para fora da janela e piora o fitness
+    (a dificuldade continua disponível via `podar_dificuldade=True`).
+    """
+    EPS = 1e-9
+
+    def __init__(self, questoes: List[Questao], tamanho: int, tempo_min: int, tempo_max: int,
+                 dificuldade_alvo: float, tol_dificuldade: float = 0.0, podar_dificuldade: bool = False):
+        self.tamanho = tamanho
+        self.tempo_min = tempo_min
+        self.tempo_max = tempo_max
+        self.soma_dif_min = (dificuldade_alvo - tol_dificuldade) * tamanho
+        self.soma_dif_max = (dificuldade_alvo + tol_dificuldade) * tamanho
+
+        # Questões ordenadas por tempo (para consultas por faixa com bisect)
+        self.por_tempo = sorted(questoes, key=lambda q: q.tempo)
+        self.tempos = [q.tempo for q in self.por_tempo]
+        difs = sorted(q.dificuldade for q in questoes)
+
+        # Somas de prefixo: [k] = soma das k menores / k maiores
+        self._tempo_menores = [0] + list(accumulate(self.tempos))
+        self._tempo_maiores = [0] + list(accumulate(reversed(self.tempos)))
+        self._dif_menores = [0.0] + list(accumulate(difs))
+        self._dif_maiores = [0.0] + list(accumulate(reversed(difs)))
+
+        # Se nem a prova vazia consegue atingir uma meta, a poda dessa meta é desligada
+        self.poda_tempo = self.tempo_viavel(0, tamanho)
+        self.poda_dificuldade = podar_dificuldade and self.dificuldade_viavel(0.0, tamanho)
+
+    def faixa_tempo(self, restantes: int) -> Tuple[int, int]:
+        """Menor e maior tempo somado possível com `restantes` questões."""
+        return self._tempo_menores[restantes], self._tempo_maiores[restantes]
+
+    def faixa_dificuldade(self, restantes: int) -> Tuple[float, float]:
+        """Menor e maior soma de dificuldades possível com `restantes` questões."""
+        return self._dif_menores[restantes], self._dif_maiores[restantes]
+
+    def tempo_viavel(self, tempo_atual: int, restantes: int) -> bool:
+        """As `restantes` questões ainda conseguem levar o tempo para dentro da janela?"""
+        lo, hi = self.faixa_tempo(restantes)
+        return tempo_atual + lo <= self.tempo_max and tempo_atual + hi >= self.tempo_min
+
+    def dificuldade_viavel(self, soma_dif_atual: float, restantes: int) -> bool:
+        """As `restantes` questões ainda conseguem levar a dificuldade média para o alvo?"""
+        lo, hi = self.faixa_dificuldade(restantes)
+        return (soma_dif_atual + lo <= self.soma_dif_max + self.EPS
+                and soma_dif_atual + hi >= self.soma_dif_min - self.EPS)
+
+    def pode_completar(self, tempo_atual: int, soma_dif_atual: float, restantes: int) -> bool:
+        """
+        Teste O(1) usado para podar escolhas: retorna False se a prova parcial é um beco sem saída
+        para alguma meta podada que ainda era alcançável a partir da prova vazia.
+        """
+        if self.poda_tempo and not self.tempo_viavel(tempo_atual, restantes):
+            return False
+        if self.poda_dificuldade and not self.dificuldade_viavel(soma_dif_atual, restantes):
+            return False
+        return True
+
+    def candidatas_por_tempo(self, tempo_lo: int, tempo_hi: int) -> List[Questao]:
+        """Questões com tempo em [tempo_lo, tempo_hi] (busca binária, O(log n) + tamanho da fatia)."""
+        i = bisect.bisect_left(self.tempos, tempo_lo)
+        j = bisect.bisect_right(self.tempos, tempo_hi)
+        return self.por_tempo[i:j]
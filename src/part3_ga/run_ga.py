@@ -1,15 +1,15 @@
 # src/part3_ga/run_ga.py
 import argparse
-import random
 import sys
 import os
-import numpy as np
 
 # Adiciona o diretório raiz ao path para importar os módulos do projeto
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
+from common.seeds import criar_geradores, gerador
 from src.part3_ga.ga import GA
-from src.part3_ga.problems.exam import BancoDeQuestoes, Questao
+from src.part3_ga.problems.exam import BancoDeQuestoes, Questao, QuestoesInsuficientes
+from src.part3_ga.problems.viabilidade import IndiceViabilidade
 
 
 TAMANHO_PROVA = 10
@@ -22,23 +22,49 @@ class ExamProblem:
     Classe que conecta o domínio do problema (Prova) ao Algoritmo Genético.
     Define como criar, avaliar e modificar uma prova.
     """
-    def __init__(self, materia_filtro: str, topico_filtro: str, banco: BancoDeQuestoes):
+    def __init__(self, materia_filtro: str, topico_filtro: str, banco: BancoDeQuestoes, verbose: bool = True,
+                 usar_poda: bool = True, rng=None, tamanho: int = TAMANHO_PROVA,
+                 tempo_min: int = ALVO_TEMPO_MIN, tempo_max: int = ALVO_TEMPO_MAX,
+                 dificuldade_alvo: float = ALVO_DIFICULDADE):
+        # Gerador próprio dos operadores (criação, mutação e cruzamento)
+        self.rng = gerador(rng)
+        
+        # Metas da prova (padrão: 10 questões, 50-60 min, dificuldade média 4.0)
+        self.tamanho = tamanho
+        self.tempo_min = tempo_min
+        self.tempo_max = tempo_max
+        self.dificuldade_alvo = dificuldade_alvo
+        
         # Filtra questões disponíveis baseadas na matéria e (opcionalmente) no tópico
         self.questoes_candidatas = banco.filtrar(materia=materia_filtro, subtopico=topico_filtro)
         
         # Validação: precisamos de pelo menos 10 questões para montar uma prova
-        if len(self.questoes_candidatas) < TAMANHO_PROVA:
-             raise ValueError(f"Erro: Questões insuficientes para o filtro '{materia_filtro}'/'{topico_filtro}'. "
-                              f"Encontradas: {len(self.questoes_candidatas)} (Mínimo: {TAMANHO_PROVA})")
+        if len(self.questoes_candidatas) < self.tamanho:
+             raise QuestoesInsuficientes(
+                 f"Erro: Questões insuficientes para o filtro '{materia_filtro}'/'{topico_filtro}'. "
+                 f"Encontradas: {len(self.questoes_candidatas)} (Mínimo: {self.tamanho})")
+        
+        # Índice de viabilidade: permite descartar escolhas que não conseguem mais fechar as metas
+        self.usar_poda = usar_poda
+        self.indice = IndiceViabilidade(self.questoes_candidatas, self.tamanho,
+                                        self.tempo_min, self.tempo_max, self.dificuldade_alvo)
+        
+        if not verbose:
+            return
         
         print(f"\n--- Configuração do Problema ---")
         print(f"Filtro: {materia_filtro} " + (f"({topico_filtro})" if topico_filtro else "(Todos os tópicos)"))
         print(f"Espaço de busca: {len(self.questoes_candidatas)} questões candidatas.")
-        print(f"Meta: {TAMANHO_PROVA} questões | Tempo {ALVO_TEMPO_MIN}-{ALVO_TEMPO_MAX}min | Dif média {ALVO_DIFICULDADE}")
+        print(f"Meta: {self.tamanho} questões | Tempo {self.tempo_min}-{self.tempo_max}min | Dif média {self.dificuldade_alvo}")
 
     def create_ind(self):
         """Cria um indivíduo aleatório (lista de 10 questões únicas)."""
-        return random.sample(self.questoes_candidatas, TAMANHO_PROVA)
+        idx = self.rng.choice(len(self.questoes_candidatas), self.tamanho, replace=False)
+        return [self.questoes_candidatas[i] for i in idx]
+
+    def chave(self, prova: list[Questao]) -> tuple:
+        """Forma canônica da prova (ids ordenados): provas com as mesmas questões têm a mesma chave."""
+        return tuple(sorted(q.id for q in prova))
 
     def fitness(self, prova: list[Questao]) -> float:
         """
@@ -52,21 +78,21 @@ class ExamProblem:
 
         # 2. Cálculo das métricas da prova
         tempo_total = sum(q.tempo for q in prova)
-        dificuldade_media = np.mean([q.dificuldade for q in prova])
+        dificuldade_media = sum(q.dificuldade for q in prova) / len(prova)
 
         score = 1000.0  # Pontuação base
 
         # 3. Penalidade de Tempo (Soft Constraint)
         # Se estiver fora do intervalo 50-60min, desconta pontos pela distância
-        if not (ALVO_TEMPO_MIN <= tempo_total <= ALVO_TEMPO_MAX):
-            erro_min = abs(tempo_total - ALVO_TEMPO_MIN)
-            erro_max = abs(tempo_total - ALVO_TEMPO_MAX)
+        if not (self.tempo_min <= tempo_total <= self.tempo_max):
+            erro_min = abs(tempo_total - self.tempo_min)
+            erro_max = abs(tempo_total - self.tempo_max)
             distancia = min(erro_min, erro_max)
             score -= distancia * 10  # -10 pts por minuto errado
 
         # 4. Penalidade de Dificuldade (Soft Constraint)
         # média 4.0. Desconta pontos proporcionalmente ao erro.
-        erro_dif = abs(dificuldade_media - ALVO_DIFICULDADE)
+        erro_dif = abs(dificuldade_media - self.dificuldade_alvo)
         score -= erro_dif * 200  # -200 pts por 1.0 de desvio na dificuldade
 
         return score
@@ -78,15 +104,24 @@ class ExamProblem:
         nova_prova = prova.copy()
         
         # Escolhe uma posição aleatória para trocar
-        idx_to_remove = random.randint(0, TAMANHO_PROVA - 1)
+        idx_to_remove = int(self.rng.integers(self.tamanho))
         
         # Encontra candidatos válidos (questões do banco que não estão nesta prova)
         ids_na_prova = {q.id for q in nova_prova}
-        candidatas_validas = [q for q in self.questoes_candidatas if q.id not in ids_na_prova]
+        candidatas_validas = None
+        
+        if self.usar_poda and self.indice.poda_tempo:
+            # Prefere substitutas cujo tempo fecha a janela junto com as demais questões (busca binária)
+            tempo_resto = sum(q.tempo for q in nova_prova) - nova_prova[idx_to_remove].tempo
+            faixa = self.indice.candidatas_por_tempo(self.tempo_min - tempo_resto, self.tempo_max - tempo_resto)
+            candidatas_validas = [q for q in faixa if q.id not in ids_na_prova]
+        
+        if not candidatas_validas:
+            candidatas_validas = [q for q in self.questoes_candidatas if q.id not in ids_na_prova]
         
         # Se houver substitutos, realiza a troca
         if candidatas_validas:
-            nova_prova[idx_to_remove] = random.choice(candidatas_validas)
+            nova_prova[idx_to_remove] = candidatas_validas[self.rng.integers(len(candidatas_validas))]
             
         return nova_prova
 
@@ -95,7 +130,7 @@ class ExamProblem:
         Cruzamento de Ponto Único (Single Point) com função de Reparo para evitar duplicatas.
         """
         # Escolhe ponto de corte
-        point = random.randint(1, TAMANHO_PROVA - 1)
+        point = int(self.rng.integers(1, self.tamanho))
         
         # Gera filhos combinando partes dos pais
         f1 = p1[:point] + p2[point:]
@@ -116,11 +151,27 @@ class ExamProblem:
             # Substitui as duplicatas por questões novas
             if indices_duplicados:
                 disponiveis = [q for q in self.questoes_candidatas if q.id not in ids_existentes]
-                random.shuffle(disponiveis)
+                self.rng.shuffle(disponiveis)
+                
+                # Métricas da parte já fixada (sem as posições duplicadas)
+                tempo_atual = sum(filho[i].tempo for i in range(self.tamanho) if i not in indices_duplicados)
+                soma_dif = sum(filho[i].dificuldade for i in range(self.tamanho) if i not in indices_duplicados)
                 
-                for idx in indices_duplicados:
-                    if disponiveis:
-                        filho[idx] = disponiveis.pop()
+                for n, idx in enumerate(indices_duplicados):
+                    if not disponiveis:
+                        break
+                    escolha = len(disponiveis) - 1
+                    if self.usar_poda:
+                        # Pula substitutas que tornam a prova um beco sem saída
+                        restantes = len(indices_duplicados) - n - 1
+                        for j in range(len(disponiveis) - 1, -1, -1):
+                            q = disponiveis[j]
+                            if self.indice.pode_completar(tempo_atual + q.tempo, soma_dif + q.dificuldade, restantes):
+                                escolha = j
+                                break
+                    filho[idx] = disponiveis.pop(escolha)
+                    tempo_atual += filho[idx].tempo
+                    soma_dif += filho[idx].dificuldade
             return filho
 
         return reparar(f1), reparar(f2)
@@ -138,37 +189,102 @@ def main():
     parser.add_argument('--pop', type=int, default=100, help='Tamanho da população')
     parser.add_argument('--cx', type=float, default=0.7, help='Probabilidade de Crossover')
     parser.add_argument('--mut', type=float, default=0.01, help='Probabilidade de Mutação')
+    parser.add_argument('--seed', type=int, default=42, help='Semente da execução')
+    parser.add_argument('--log-intervalo', type=int, default=10, help='Gerações entre as linhas de log')
+    parser.add_argument('--estatisticas', type=str, default=None,
+                        help='Arquivo .npz para salvar as estatísticas por geração '
+                             '(com --hibrido e --ciclos > 1, um arquivo <base>_ciclo<k>.npz por ciclo)')
+    parser.add_argument('--sem-poda', action='store_true', help='Desliga a poda pelo índice de viabilidade')
+    parser.add_argument('--adaptativo', action='store_true',
+                        help='Ajusta as taxas de crossover/mutação pela diversidade da população')
+    parser.add_argument('--dedup', action='store_true',
+                        help='Substitui filhos duplicados (mesmas questões) na inserção')
+    parser.add_argument('--modo', choices=GA.MODOS, default='geracional',
+                        help="'geracional' ou 'estacionario' (steady-state: filhos substituem os piores)")
+    
+    # Pipeline híbrido ACO → AG
+    parser.add_argument('--hibrido', action='store_true',
+                        help='Semeia a população inicial com as melhores provas distintas de uma fase curta de ACO')
+    parser.add_argument('--aco-formigas', type=int, default=10, help='Formigas da fase ACO (--hibrido)')
+    parser.add_argument('--aco-iters', type=int, default=2, help='Iterações da fase ACO por ciclo (--hibrido)')
+    parser.add_argument('--fracao-aco', type=float, default=1.0,
+                        help='Fração da população inicial vinda da colônia (--hibrido)')
+    parser.add_argument('--ciclos', type=int, default=1, help='Alternâncias ACO → AG (--hibrido)')
+    parser.add_argument('--retorno', action='store_true',
+                        help='Deposita o melhor do AG no feromônio a cada ciclo (--hibrido)')
     
     args = parser.parse_args()
+    if args.log_intervalo < 1:
+        parser.error(f"--log-intervalo deve ser >= 1 (recebido {args.log_intervalo})")
 
+    # Geradores independentes para os operadores do problema, o AG e a colônia (--hibrido)
+    rng_problema, rng_ga, rng_aco = criar_geradores(args.seed, 3)
+    
     # 1. Carrega Dados e Configura o Problema
     try:
-        banco = BancoDeQuestoes() # Gera/Carrega as 5000 questões
-        problem = ExamProblem(args.materia, args.topico, banco)
+        banco = BancoDeQuestoes.carregar() # Carrega as 5000 questões do snapshot (gera na 1ª vez)
+        problem = ExamProblem(args.materia, args.topico, banco, usar_poda=not args.sem_poda, rng=rng_problema)
     except ValueError as e:
         print(e)
         return
 
     # 2. Inicializa o AG
-    ga = GA(
-        pop_size=args.pop,
-        fitness_fn=problem.fitness,
-        create_ind=problem.create_ind,
-        mutate_fn=problem.mutate,
-        crossover_fn=problem.crossover,
-        cx_rate=args.cx,   # Usa o valor 0.7 (padrão) ou o passado no terminal
-        mut_rate=args.mut, # Usa o valor 0.01 (padrão) ou o passado no terminal
-        elitism=True
-    )
+    def criar_ga(populacao_inicial=None):
+        return GA(
+            pop_size=args.pop,
+            fitness_fn=problem.fitness,
+            create_ind=problem.create_ind,
+            mutate_fn=problem.mutate,
+            crossover_fn=problem.crossover,
+            cx_rate=args.cx,   # Usa o valor 0.7 (padrão) ou o passado no terminal
+            mut_rate=args.mut, # Usa o valor 0.01 (padrão) ou o passado no terminal
+            elitism=True,
+            rng=rng_ga,
+            key_fn=problem.chave,
+            adaptativo=args.adaptativo,
+            deduplicar=args.dedup,
+            modo=args.modo,
+            populacao_inicial=populacao_inicial
+        )
 
     # 3. Execução
-    print(f"Iniciando AG: Pop={args.pop}, Gens={args.gens}, CX={args.cx}, MUT={args.mut}")
-    best_ind = ga.run(n_generations=args.gens)
+    print(f"Iniciando AG: Pop={args.pop}, Gens={args.gens}, CX={args.cx}, MUT={args.mut}"
+          + (" (taxas adaptativas)" if args.adaptativo else "") + f" | Modo: {args.modo}")
+    if args.hibrido:
+        # Só o modo híbrido precisa da colônia
+        from src.part3_ga.hibrido import HibridoACOGA
+        from src.part4_swarm_immune.aco import ACO
+        from src.part4_swarm_immune.run_aco import ExamProblemACO
+
+        problem_aco = ExamProblemACO(args.materia, args.topico, banco, verbose=False, usar_poda=not args.sem_poda)
+        aco = ACO(
+            n_ants=args.aco_formigas,
+            n_positions=problem.tamanho,
+            n_options=len(problem_aco.questoes_candidatas),
+            fitness_fn=problem.fitness,
+            heuristica_fn=problem_aco.heuristica,
+            get_valid_options=problem_aco.get_valid_options,
+            update_state=problem_aco.update_state,
+            get_option_id=problem_aco.get_questao_idx,
+            rng=rng_aco,
+            tamanho_arquivo=args.pop,
+            chave_fn=problem.chave
+        )
+        print(f"Híbrido ACO → AG: {args.aco_formigas} formigas x {args.aco_iters} iterações por ciclo, "
+              f"{args.ciclos} ciclo(s), fração semeada {args.fracao_aco}" + (", com retorno" if args.retorno else ""))
+        hibrido = HibridoACOGA(aco, criar_ga, args.pop, iters_aco=args.aco_iters, fracao=args.fracao_aco,
+                               ciclos=args.ciclos, retorno=args.retorno)
+        best_ind = hibrido.run(n_generations=args.gens, log_intervalo=args.log_intervalo,
+                               caminho_estatisticas=args.estatisticas)
+    else:
+        ga = criar_ga()
+        best_ind = ga.run(n_generations=args.gens, log_intervalo=args.log_intervalo,
+                          caminho_estatisticas=args.estatisticas)
 
     # 4. Relatório Final da Melhor Solução
     score = problem.fitness(best_ind)
     tempo_total = sum(q.tempo for q in best_ind)
-    dif_media = np.mean([q.dificuldade for q in best_ind])
+    dif_media = sum(q.dificuldade for q in best_ind) / len(best_ind)
     
     print("\n" + "="*40)
     print(" MELHOR PROVA ENCONTRADA")
@@ -3,9 +3,11 @@ Algoritmo de Otimização Baseado em Colônia de Formigas (ACO)
 Implementação genérica que pode ser aplicada a diferentes problemas.
 """
 
-import random
+import heapq
 import numpy as np
-from typing import List, Callable, Any, Dict, Tuple
+from typing import List, Callable, Any, Dict, Hashable, Tuple
+
+from common.seeds import gerador
 
 
 class ACO:
@@ -29,7 +31,10 @@ class ACO:
         Q: float = 10.0,         # Constante de deposição
         tau_zero: float = 1.0,   # Feromônio inicial
         e: float = 5.0,          # Peso da elite
-        seed: int = 42
+        seed: int = 42,
+        rng: np.random.Generator = None,  # Gerador próprio (não usa o estado global)
+        tamanho_arquivo: int = 0,  # Melhores soluções distintas guardadas (0 = sem arquivo)
+        chave_fn: Callable[[List[Any]], Hashable] = None  # Forma canônica da solução (define "distintas")
     ):
         """
         Args:
@@ -46,10 +51,12 @@ class ACO:
             Q: Constante de deposição de feromônio
             tau_zero: Valor inicial do feromônio
             e: Peso da formiga elite
-            seed: Semente para reprodutibilidade
+            seed: Semente para reprodutibilidade (usada quando rng não é informado)
+            rng: numpy.random.Generator exclusivo desta colônia
+            tamanho_arquivo: Quantas soluções distintas (as de maior fitness) o arquivo mantém
+            chave_fn: Chave de uma solução no arquivo (padrão: ids das opções por posição)
         """
-        random.seed(seed)
-        np.random.seed(seed)
+        self.rng = gerador(rng, seed)
         
         self.n_ants = n_ants
         self.n_positions = n_positions
@@ -71,6 +78,13 @@ class ACO:
         # Para cada posição, temos feromônio para cada opção possível
         self.pheromone = [[tau_zero] * n_options for _ in range(n_positions)]
         
+        # Arquivo das melhores soluções distintas: heap (fitness, ordem, chave) com a pior no topo
+        self.tamanho_arquivo = tamanho_arquivo
+        self.chave_fn = chave_fn or (lambda sol: tuple(self.get_option_id(op) for op in sol))
+        self._arquivo: Dict[Hashable, Tuple[float, List[Any]]] = {}
+        self._heap_arquivo: List[Tuple[float, int, Hashable]] = []
+        self._ordem_arquivo = 0
+        
         # Histórico para gráficos
         self.history = []
         self.best_solution = None
@@ -120,10 +134,10 @@ class ACO:
             # 3. Escolhe opção probabilísticamente
             if not probabilidades:
                 # Nenhuma opção válida, escolhe aleatoriamente
-                opcao_escolhida = random.choice(opcoes_validas)
+                opcao_escolhida = opcoes_validas[self.rng.integers(len(opcoes_validas))]
             elif denominador == 0:
                 # Todas as probabilidades são zero, escolhe aleatoriamente
-                opcao_escolhida = random.choice([p[0] for p in probabilidades])
+                opcao_escolhida = probabilidades[self.rng.integers(len(probabilidades))][0]
             else:
                 # Normaliza e escolhe por roleta
                 probabilidades = [(op, prob/denominador) for op, prob in probabilidades]
@@ -145,7 +159,7 @@ class ACO:
         Returns:
             Opção escolhida
         """
-        r = random.random()
+        r = self.rng.random()
         acumulado = 0.0
         
         for opcao, prob in probabilidades:
@@ -186,9 +200,7 @@ class ACO:
                     delta_tau = self.Q * 0.5
                 
                 # Deposita em todas as posições usadas
-                for posicao, opcao in enumerate(solucao):
-                    opcao_id = self.get_option_id(opcao) % self.n_options
-                    self.pheromone[posicao][opcao_id] += delta_tau
+                self.depositar(solucao, delta_tau)
         
         # 3. Deposição extra da melhor formiga (elite)
         if fitnesses:
@@ -209,9 +221,32 @@ class ACO:
             else:
                 delta_tau_elite = self.e * self.Q
             
-            for posicao, opcao in enumerate(melhor_solucao):
-                opcao_id = self.get_option_id(opcao) % self.n_options
-                self.pheromone[posicao][opcao_id] += delta_tau_elite
+            self.depositar(melhor_solucao, delta_tau_elite)
+    
+    def depositar(self, solucao: List[Any], delta_tau: float):
+        """Deposita `delta_tau` de feromônio em cada (posição, opção) da solução."""
+        for posicao, opcao in enumerate(solucao):
+            opcao_id = self.get_option_id(opcao) % self.n_options
+            self.pheromone[posicao][opcao_id] += delta_tau
+    
+    def arquivar(self, solucao: List[Any], fitness: float):
+        """Guarda a solução no arquivo se ela for nova e estiver entre as `tamanho_arquivo` melhores."""
+        chave = self.chave_fn(solucao)
+        if chave in self._arquivo:
+            return
+        if len(self._arquivo) >= self.tamanho_arquivo:
+            if fitness <= self._heap_arquivo[0][0]:
+                return
+            _, _, pior = heapq.heappop(self._heap_arquivo)
+            del self._arquivo[pior]
+        self._arquivo[chave] = (fitness, list(solucao))
+        heapq.heappush(self._heap_arquivo, (fitness, self._ordem_arquivo, chave))
+        self._ordem_arquivo += 1
+    
+    def melhores_distintas(self, n: int = None) -> List[Tuple[List[Any], float]]:
+        """As n melhores soluções distintas do arquivo (solução, fitness), da melhor para a pior."""
+        ordenadas = sorted(self._arquivo.values(), key=lambda item: -item[0])[:n]
+        return [(solucao, fitness) for fitness, solucao in ordenadas]
     
     def run(self, n_iterations: int, verbose: bool = True) -> List[Any]:
         """
@@ -236,6 +271,9 @@ class ACO:
             
             # 2. Avaliação
             fitnesses = [self.fitness_fn(sol) for sol in solucoes]
+            if self.tamanho_arquivo:
+                for sol, fit in zip(solucoes, fitnesses):
+                    self.arquivar(sol, fit)
             
             # 3. Atualização de feromônio
             self.atualizar_feromonio(solucoes, fitnesses)
@@ -3,16 +3,15 @@ Script principal para executar ACO no problema de montagem de provas.
 """
 
 import argparse
-import random
 import sys
 import os
-import numpy as np
 
 # Adiciona o diretório raiz ao path para importar os módulos do projeto
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
 from src.part4_swarm_immune.aco import ACO
-from src.part3_ga.problems.exam import BancoDeQuestoes, Questao
+from src.part3_ga.problems.exam import BancoDeQuestoes, Questao, QuestoesInsuficientes
+from src.part3_ga.problems.viabilidade import IndiceViabilidade
 
 
 TAMANHO_PROVA = 10
@@ -27,28 +26,49 @@ class ExamProblemACO:
     Define heurística, validação e funções auxiliares.
     """
     
-    def __init__(self, materia_filtro: str, topico_filtro: str, banco: BancoDeQuestoes):
+    def __init__(self, materia_filtro: str, topico_filtro: str, banco: BancoDeQuestoes, verbose: bool = True,
+                 usar_poda: bool = True, tamanho: int = TAMANHO_PROVA, tempo_min: int = ALVO_TEMPO_MIN,
+                 tempo_max: int = ALVO_TEMPO_MAX, dificuldade_alvo: float = ALVO_DIFICULDADE):
+        # Metas da prova (padrão: 10 questões, 50-60 min, dificuldade média 4.0)
+        self.tamanho = tamanho
+        self.tempo_min = tempo_min
+        self.tempo_max = tempo_max
+        self.dificuldade_alvo = dificuldade_alvo
+        
         # Filtra questões disponíveis
         self.questoes_candidatas = banco.filtrar(materia=materia_filtro, subtopico=topico_filtro)
         
         # Validação
-        if len(self.questoes_candidatas) < TAMANHO_PROVA:
-            raise ValueError(f"Erro: Questões insuficientes para o filtro '{materia_filtro}'/'{topico_filtro}'. "
-                           f"Encontradas: {len(self.questoes_candidatas)} (Mínimo: {TAMANHO_PROVA})")
+        if len(self.questoes_candidatas) < self.tamanho:
+            raise QuestoesInsuficientes(
+                f"Erro: Questões insuficientes para o filtro '{materia_filtro}'/'{topico_filtro}'. "
+                f"Encontradas: {len(self.questoes_candidatas)} (Mínimo: {self.tamanho})")
         
         # Mapeia IDs das questões para índices na lista de candidatas (0 a N-1)
         # Isso é necessário porque o ACO usa índices de 0 a n_options-1
         self.questao_to_idx = {q.id: idx for idx, q in enumerate(self.questoes_candidatas)}
         
+        # Índice de viabilidade: descarta escolhas que não conseguem mais fechar as metas
+        self.usar_poda = usar_poda
+        self.indice = IndiceViabilidade(self.questoes_candidatas, self.tamanho,
+                                        self.tempo_min, self.tempo_max, self.dificuldade_alvo)
+        
+        if not verbose:
+            return
+        
         print(f"\n--- Configuração do Problema (ACO) ---")
         print(f"Filtro: {materia_filtro} " + (f"({topico_filtro})" if topico_filtro else "(Todos os tópicos)"))
         print(f"Espaço de busca: {len(self.questoes_candidatas)} questões candidatas.")
-        print(f"Meta: {TAMANHO_PROVA} questões | Tempo {ALVO_TEMPO_MIN}-{ALVO_TEMPO_MAX}min | Dif média {ALVO_DIFICULDADE}")
+        print(f"Meta: {self.tamanho} questões | Tempo {self.tempo_min}-{self.tempo_max}min | Dif média {self.dificuldade_alvo}")
     
     def get_questao_idx(self, questao: Questao) -> int:
         """Retorna o índice da questão na lista de candidatas."""
         return self.questao_to_idx[questao.id]
     
+    def chave(self, prova: list[Questao]) -> tuple:
+        """Forma canônica da prova (ids ordenados): a ordem das questões não distingue provas."""
+        return tuple(sorted(q.id for q in prova))
+    
     def fitness(self, prova: list[Questao]) -> float:
         """
         Calcula a aptidão (nota) da prova.
@@ -61,19 +81,19 @@ class ExamProblemACO:
         
         # 2. Cálculo das métricas da prova
         tempo_total = sum(q.tempo for q in prova)
-        dificuldade_media = np.mean([q.dificuldade for q in prova])
+        dificuldade_media = sum(q.dificuldade for q in prova) / len(prova)
         
         score = 1000.0  # Pontuação base
         
         # 3. Penalidade de Tempo (Soft Constraint)
-        if not (ALVO_TEMPO_MIN <= tempo_total <= ALVO_TEMPO_MAX):
-            erro_min = abs(tempo_total - ALVO_TEMPO_MIN)
-            erro_max = abs(tempo_total - ALVO_TEMPO_MAX)
+        if not (self.tempo_min <= tempo_total <= self.tempo_max):
+            erro_min = abs(tempo_total - self.tempo_min)
+            erro_max = abs(tempo_total - self.tempo_max)
             distancia = min(erro_min, erro_max)
             score -= distancia * 10  # -10 pts por minuto errado
         
         # 4. Penalidade de Dificuldade (Soft Constraint)
-        erro_dif = abs(dificuldade_media - ALVO_DIFICULDADE)
+        erro_dif = abs(dificuldade_media - self.dificuldade_alvo)
         score -= erro_dif * 200  # -200 pts por 1.0 de desvio na dificuldade
         
         return score
@@ -95,21 +115,27 @@ class ExamProblemACO:
         
         tempo_projetado = tempo_atual + questao.tempo
         dificuldades_projetadas = dificuldades_atual + [questao.dificuldade]
-        dificuldade_media_projetada = np.mean(dificuldades_projetadas)
+        dificuldade_media_projetada = sum(dificuldades_projetadas) / len(dificuldades_projetadas)
         
         # 3. Questões restantes
-        questoes_restantes = TAMANHO_PROVA - (posicao + 1)
+        questoes_restantes = self.tamanho - (posicao + 1)
+        
+        # 3a. Poda: se as questões restantes não conseguem mais fechar tempo/dificuldade, não escolhe
+        if self.usar_poda:
+            soma_dif_projetada = sum(dificuldades_projetadas)
+            if not self.indice.pode_completar(tempo_projetado, soma_dif_projetada, questoes_restantes):
+                return 0.0
         
         # 4. Heurística baseada em quão próximo está das metas
         score = 1.0  # Base
         
         # 4a. Tempo: penaliza se já passou do limite ou está muito abaixo
-        if tempo_projetado > ALVO_TEMPO_MAX:
+        if tempo_projetado > self.tempo_max:
             # Já passou do máximo, muito ruim
             score *= 0.1
-        elif tempo_projetado < ALVO_TEMPO_MIN:
+        elif tempo_projetado < self.tempo_min:
             # Ainda abaixo, mas precisa considerar questões restantes
-            tempo_medio_necessario = (ALVO_TEMPO_MIN - tempo_projetado) / max(questoes_restantes, 1)
+            tempo_medio_necessario = (self.tempo_min - tempo_projetado) / max(questoes_restantes, 1)
             if questao.tempo < tempo_medio_necessario * 0.5:
                 # Questão muito rápida, pode não conseguir atingir meta
                 score *= 0.5
@@ -122,7 +148,7 @@ class ExamProblemACO:
         else:
             # Dentro do intervalo, bom!
             # Mas precisa evitar passar do máximo com questões restantes
-            tempo_disponivel = ALVO_TEMPO_MAX - tempo_projetado
+            tempo_disponivel = self.tempo_max - tempo_projetado
             tempo_medio_restante = tempo_disponivel / max(questoes_restantes, 1)
             if questao.tempo > tempo_medio_restante * 1.5:
                 # Questão muito lenta, pode passar do limite
@@ -131,7 +157,7 @@ class ExamProblemACO:
                 score *= 1.5
         
         # 4b. Dificuldade: penaliza desvios da meta
-        erro_dificuldade = abs(dificuldade_media_projetada - ALVO_DIFICULDADE)
+        erro_dificuldade = abs(dificuldade_media_projetada - self.dificuldade_alvo)
         if erro_dificuldade < 0.3:
             score *= 1.3  # Muito próximo da meta
         elif erro_dificuldade < 0.5:
@@ -148,12 +174,12 @@ class ExamProblemACO:
         # 4d. Considera questões restantes para ajustar dificuldade
         if questoes_restantes > 0:
             # Se está abaixo da meta, precisa de questões mais difíceis
-            if dificuldade_media_projetada < ALVO_DIFICULDADE - 0.3:
-                if questao.dificuldade > ALVO_DIFICULDADE:
+            if dificuldade_media_projetada < self.dificuldade_alvo - 0.3:
+                if questao.dificuldade > self.dificuldade_alvo:
                     score *= 1.1  # Ajuda a subir a média
             # Se está acima da meta, precisa de questões mais fáceis
-            elif dificuldade_media_projetada > ALVO_DIFICULDADE + 0.3:
-                if questao.dificuldade < ALVO_DIFICULDADE:
+            elif dificuldade_media_projetada > self.dificuldade_alvo + 0.3:
+                if questao.dificuldade < self.dificuldade_alvo:
                     score *= 1.1  # Ajuda a baixar a média
         
         return max(0.0, score)  # Garante não negativo
@@ -208,13 +234,15 @@ def main():
     parser.add_argument('--Q', type=float, default=10.0, help='Constante de deposição')
     parser.add_argument('--tau0', type=float, default=1.0, help='Feromônio inicial')
     parser.add_argument('--elite', type=float, default=5.0, help='Peso da elite')
+    parser.add_argument('--seed', type=int, default=42, help='Semente da execução')
+    parser.add_argument('--sem-poda', action='store_true', help='Desliga a poda pelo índice de viabilidade')
     
     args = parser.parse_args()
     
     # 1. Carrega Dados e Configura o Problema
     try:
-        banco = BancoDeQuestoes()
-        problem = ExamProblemACO(args.materia, args.topico, banco)
+        banco = BancoDeQuestoes.carregar()  # Snapshot em disco (gerado na 1ª vez)
+        problem = ExamProblemACO(args.materia, args.topico, banco, usar_poda=not args.sem_poda)
     except ValueError as e:
         print(e)
         return
@@ -227,7 +255,7 @@ def main():
     
     aco = ACO(
         n_ants=args.ants,
-        n_positions=TAMANHO_PROVA,
+        n_positions=problem.tamanho,
         n_options=n_options,
         fitness_fn=problem.fitness,
         heuristica_fn=problem.heuristica,
@@ -239,7 +267,8 @@ def main():
         rho=args.rho,
         Q=args.Q,
         tau_zero=args.tau0,
-        e=args.elite
+        e=args.elite,
+        seed=args.seed
     )
     
     # 3. Execução
@@ -250,7 +279,7 @@ def main():
     # 4. Relatório Final da Melhor Solução
     score = problem.fitness(best_solution)
     tempo_total = sum(q.tempo for q in best_solution)
-    dif_media = np.mean([q.dificuldade for q in best_solution])
+    dif_media = sum(q.dificuldade for q in best_solution) / len(best_solution)
     
     print("\n" + "="*40)
     print(" MELHOR PROVA ENCONTRADA (ACO)")
@@ -0,0 +1,370 @@
+"""
+Servidor residente de montagem de provas (HTTP local ou socket Unix, asyncio).
+
+O banco de questões é carregado uma vez e fica em memória, com o índice de
+consultas e o cache de resultados de cada filtro (matéria/tópico). As buscas (GA ou ACO) rodam em um pool de
+processos que herda o banco já pronto; o loop asyncio só recebe e responde.
+
+Rotas:
+    POST /prova   corpo JSON com a especificação da prova (ver ESPEC_PADRAO)
+    GET  /stats   requisições, erros e percentis de latência por rota
+    GET  /health  verificação simples
+
+Uso:
+    python src/server/run_server.py serve --porta 8765 --workers 2
+    python src/server/run_server.py bench --n 200 --concorrencia 4
+"""
+
+import sys
+import os
+import json
+import math
+import time
+import asyncio
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+# Adiciona o diretório raiz ao path para importar os módulos do projeto
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+import numpy as np
+
+from src.benchmark.runners import ALGORITMOS, PARAMS_PADRAO, Rastreador
+from src.part3_ga.problems.exam import BancoDeQuestoes
+from src.part3_ga.run_ga import TAMANHO_PROVA, ALVO_TEMPO_MIN, ALVO_TEMPO_MAX, ALVO_DIFICULDADE
+
+
+# Especificação padrão de uma prova (campos ausentes no JSON usam estes valores)
+ESPEC_PADRAO: Dict[str, Any] = {
+    'materia': 'Física',
+    'topico': None,
+    'tamanho': TAMANHO_PROVA,
+    'tempo_min': ALVO_TEMPO_MIN,
+    'tempo_max': ALVO_TEMPO_MAX,
+    'dificuldade': ALVO_DIFICULDADE,
+    'algoritmo': 'ga',
+    'seed': 42,
+    'params': {},
+}
+
+# Parâmetros que precisam ser >= 1 e os que são frações/probabilidades em [0, 1]
+PARAMS_POSITIVOS = ('pop', 'gens', 'ants', 'iters', 'ciclos')
+PARAMS_FRACOES = ('cx', 'mut', 'rho', 'fracao')
+
+# Janela de latências guardadas por rota (para os percentis do /stats)
+JANELA_LATENCIAS = 10_000
+
+
+# Banco do processo (criado antes do pool: os workers o herdam com 'fork')
+_BANCO: Optional[BancoDeQuestoes] = None
+
+
+def carregar_banco(tamanho: int = 5000, seed: int = 42) -> BancoDeQuestoes:
+    global _BANCO
+    if _BANCO is None or _BANCO.tamanho != tamanho or _BANCO.seed != seed:
+        _BANCO = BancoDeQuestoes.carregar(tamanho=tamanho, seed=seed)
+        _BANCO.indice  # Monta o índice de consultas antes do fork
+    return _BANCO
+
+
+def _e_numero(valor: Any) -> bool:
+    # O json do Python aceita NaN/Infinity: não são números válidos para a busca
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool) and math.isfinite(valor)
+
+
+def _e_inteiro(valor: Any) -> bool:
+    return isinstance(valor, int) and not isinstance(valor, bool)
+
+
+def _tipo_compativel(valor: Any, padrao: Any) -> bool:
+    """O valor tem o tipo do padrão (int aceito onde o padrão é float; bool e não finitos não contam)."""
+    if isinstance(padrao, bool):
+        return isinstance(valor, bool)
+    if isinstance(padrao, int):
+        return _e_inteiro(valor)
+    if isinstance(padrao, float):
+        return _e_numero(valor)
+    return isinstance(valor, type(padrao))
+
+
+def validar_espec(dados: Dict[str, Any]) -> Dict[str, Any]:
+    """Completa a especificação com os padrões e valida os campos e seus tipos. Levanta ValueError."""
+    if not isinstance(dados, dict):
+        raise ValueError("O corpo deve ser um objeto JSON")
+    desconhecidos = set(dados) - set(ESPEC_PADRAO)
+    if desconhecidos:
+        raise ValueError(f"Campos desconhecidos: {sorted(desconhecidos)}")
+    espec = {**ESPEC_PADRAO, **dados}
+    if espec['algoritmo'] not in ALGORITMOS:
+        raise ValueError(f"Algoritmo desconhecido: {espec['algoritmo']}. Use um de {list(ALGORITMOS)}")
+    if not isinstance(espec['materia'], str):
+        raise ValueError("'materia' deve ser um texto")
+    if espec['topico'] is not None and not isinstance(espec['topico'], str):
+        raise ValueError("'topico' deve ser um texto ou null")
+    if not _e_inteiro(espec['tamanho']) or espec['tamanho'] < 2:
+        raise ValueError("'tamanho' deve ser um inteiro >= 2")
+    if not _e_inteiro(espec['seed']):
+        raise ValueError("'seed' deve ser um inteiro")
+    for campo in ('tempo_min', 'tempo_max', 'dificuldade'):
+        if not _e_numero(espec[campo]):
+            raise ValueError(f"'{campo}' deve ser um número finito")
+    if espec['tempo_min'] > espec['tempo_max']:
+        raise ValueError("'tempo_min' maior que 'tempo_max'")
+
+    if not isinstance(espec['params'], dict):
+        raise ValueError("'params' deve ser um objeto")
+    padroes = PARAMS_PADRAO[espec['algoritmo']]
+    desconhecidos = set(espec['params']) - set(padroes)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos para {espec['algoritmo']}: {sorted(desconhecidos)}")
+    for nome, valor in espec['params'].items():
+        if not _tipo_compativel(valor, padroes[nome]):
+            raise ValueError(f"Parâmetro '{nome}' deve ser do tipo {type(padroes[nome]).__name__}")
+        if nome in PARAMS_POSITIVOS and valor < 1:
+            raise ValueError(f"Parâmetro '{nome}' deve ser >= 1")
+        if nome in PARAMS_FRACOES and not 0.0 <= valor <= 1.0:
+            raise ValueError(f"Parâmetro '{nome}' deve estar em [0, 1]")
+    return espec
+
+
+def resolver(espec: Dict[str, Any]) -> Dict[str, Any]:
+    """Executa a busca de uma especificação já validada (roda no worker)."""
+    inicio = time.perf_counter()
+    banco = carregar_banco()
+    algoritmo = espec['algoritmo']
+    params = {**PARAMS_PADRAO[algoritmo], **espec['params']}
+    metas = {'tamanho': espec['tamanho'], 'tempo_min': espec['tempo_min'],
+             'tempo_max': espec['tempo_max'], 'dificuldade_alvo': espec['dificuldade']}
+
+    best, problem, rastreador = ALGORITMOS[algoritmo](banco, espec['materia'], espec['topico'], espec['seed'],
+                                                      params, Rastreador, metas)
+    return {
+        'fitness': problem.fitness(best),
+        'tempo_total': sum(q.tempo for q in best),
+        'dificuldade_media': round(sum(q.dificuldade for q in best) / len(best), 3),
+        'questoes': [{'id': q.id, 'materia': q.materia, 'subtopico': q.subtopico,
+                      'dificuldade': q.dificuldade, 'tempo': q.tempo} for q in best],
+        'n_candidatas': len(problem.questoes_candidatas),
+        'avaliacoes': rastreador.avaliacoes,
+        'busca_ms': (time.perf_counter() - inicio) * 1000,
+    }
+
+
+class Estatisticas:
+    """Contadores e latências (janela deslizante) por rota."""
+    def __init__(self, janela: int = JANELA_LATENCIAS):
+        self.inicio = time.time()
+        self.janela = janela
+        self.latencias: Dict[str, deque] = {}
+        self.requisicoes: Dict[str, int] = {}
+        self.erros: Dict[str, int] = {}
+
+    def registrar(self, rota: str, latencia_ms: float, erro: bool = False):
+        self.latencias.setdefault(rota, deque(maxlen=self.janela)).append(latencia_ms)
+        self.requisicoes[rota] = self.requisicoes.get(rota, 0) + 1
+        if erro:
+            self.erros[rota] = self.erros.get(rota, 0) + 1
+
+    def resumo(self) -> Dict[str, Any]:
+        rotas = {}
+        for rota, lat in self.latencias.items():
+            p50, p90, p99 = np.percentile(np.fromiter(lat, dtype=float), [50, 90, 99])
+            rotas[rota] = {'requisicoes': self.requisicoes[rota], 'erros': self.erros.get(rota, 0),
+                           'p50_ms': p50, 'p90_ms': p90, 'p99_ms': p99, 'max_ms': max(lat)}
+        return {'uptime_s': time.time() - self.inicio, 'rotas': rotas}
+
+
+class Servidor:
+    """Servidor HTTP/1.1 mínimo (JSON, keep-alive) sobre asyncio."""
+    def __init__(self, workers: int = 1):
+        self.workers = workers
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.stats = Estatisticas()
+
+    async def iniciar_pool(self):
+        # O banco é criado no processo principal antes do pool: os workers herdam tudo pronto
+        carregar_banco()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # Aquecimento: um pedido padrão por worker (imports, filtro padrão em cache)
+        loop = asyncio.get_running_loop()
+        espec = validar_espec({})
+        await asyncio.gather(*(loop.run_in_executor(self.pool, resolver, espec) for _ in range(self.workers)))
+
+    async def rota(self, metodo: str, caminho: str, corpo: bytes):
+        """Retorna (status, objeto JSON de resposta)."""
+        if metodo == 'GET' and caminho == '/health':
+            return 200, {'status': 'ok'}
+        if metodo == 'GET' and caminho == '/stats':
+            return 200, self.stats.resumo()
+        if metodo == 'POST' and caminho == '/prova':
+            try:
+                espec = validar_espec(json.loads(corpo or b'{}'))
+            except (ValueError, TypeError) as e:
+                return 400, {'erro': str(e)}
+            try:
+                resultado = await asyncio.get_running_loop().run_in_executor(self.pool, resolver, espec)
+            except ValueError as e:
+                # Ex: questões insuficientes para o filtro
+                return 422, {'erro': str(e)}
+            except Exception as e:
+                return 500, {'erro': f'Erro interno: {type(e).__name__}: {e}'}
+            return 200, resultado
+        return 404, {'erro': f'Rota não encontrada: {metodo} {caminho}'}
+
+    async def _responder(self, writer: asyncio.StreamWriter, status: int, resposta: Dict[str, Any],
+                         fechar: bool):
+        try:
+            # NaN/Infinity não são JSON válido
+            dados = json.dumps(resposta, ensure_ascii=False, allow_nan=False).encode()
+        except ValueError:
+            status = 500
+            dados = json.dumps({'erro': 'Resposta com número não finito'}, ensure_ascii=False).encode()
+        writer.write(f'HTTP/1.1 {status} {"OK" if status == 200 else "Erro"}\r\n'
+                     f'Content-Type: application/json; charset=utf-8\r\n'
+                     f'Content-Length: {len(dados)}\r\n'
+                     f'Connection: {"close" if fechar else "keep-alive"}\r\n\r\n'.encode() + dados)
+        await writer.drain()
+
+    async def atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                linha = await reader.readline()
+                if not linha:
+                    break
+                try:
+                    metodo, caminho, _ = linha.decode('latin-1').split(' ', 2)
+                    cabecalhos = {}
+                    while True:
+                        h = await reader.readline()
+                        if h in (b'\r\n', b'\n', b''):
+                            break
+                        nome, _, valor = h.decode('latin-1').partition(':')
+                        cabecalhos[nome.strip().lower()] = valor.strip()
+                    tamanho = int(cabecalhos.get('content-length', 0))
+                    if tamanho < 0:
+                        raise ValueError(f"Content-Length negativo: {tamanho}")
+                except ValueError:
+                    # Requisição malformada: sem como achar o fim dela, responde e fecha a conexão
+                    self.stats.registrar('malformada', 0.0, erro=True)
+                    await self._responder(writer, 400, {'erro': 'Requisição HTTP malformada'}, fechar=True)
+                    break
+                corpo = await reader.readexactly(tamanho)
+
+                inicio = time.perf_counter()
+                try:
+                    status, resposta = await self.rota(metodo, caminho, corpo)
+                except Exception as e:
+                    status, resposta = 500, {'erro': f'Erro interno: {type(e).__name__}: {e}'}
+                latencia_ms = (time.perf_counter() - inicio) * 1000
+                if caminho != '/stats':
+                    self.stats.registrar(f'{metodo} {caminho}', latencia_ms, erro=status >= 400)
+                if status == 200 and caminho == '/prova':
+                    resposta['latencia_ms'] = latencia_ms
+
+                fechar = cabecalhos.get('connection', '').lower() == 'close'
+                await self._responder(writer, status, resposta, fechar)
+                if fechar:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def servir(self, host: str = '127.0.0.1', porta: int = 8765, unix: Optional[str] = None):
+        await self.iniciar_pool()
+        if unix:
+            server = await asyncio.start_unix_server(self.atender, path=unix)
+            print(f"Servidor pronto em unix:{unix} ({self.workers} worker(s))")
+        else:
+            server = await asyncio.start_server(self.atender, host, porta)
+            print(f"Servidor pronto em http://{host}:{porta} ({self.workers} worker(s))")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+
+
+async def _requisitar(reader, writer, metodo: str, caminho: str, corpo: Optional[dict] = None):
+    dados = json.dumps(corpo).encode() if corpo is not None else b''
+    writer.write(f'{metodo} {caminho} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                 f'Content-Length: {len(dados)}\r\n\r\n'.encode() + dados)
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    tamanho = 0
+    while True:
+        h = await reader.readline()
+        if h in (b'\r\n', b''):
+            break
+        nome, _, valor = h.decode().partition(':')
+        if nome.lower() == 'content-length':
+            tamanho = int(valor)
+    return status, json.loads(await reader.readexactly(tamanho))
+
+
+async def bench(host: str, porta: int, unix: Optional[str], n: int, concorrencia: int,
+                especs: List[Dict[str, Any]]):
+    """Cliente de carga: n pedidos em `concorrencia` conexões keep-alive; imprime os percentis."""
+    async def conectar():
+        if unix:
+            return await asyncio.open_unix_connection(unix)
+        return await asyncio.open_connection(host, porta)
+
+    latencias = []
+    fila = list(range(n))
+
+    async def cliente():
+        reader, writer = await conectar()
+        while fila:
+            i = fila.pop()
+            inicio = time.perf_counter()
+            status, _ = await _requisitar(reader, writer, 'POST', '/prova', especs[i % len(especs)])
+            latencias.append((time.perf_counter() - inicio) * 1000)
+            if status != 200:
+                print(f"Pedido {i}: status {status}")
+        writer.close()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(concorrencia)))
+    total = time.perf_counter() - inicio
+
+    p50, p90, p99 = np.percentile(latencias, [50, 90, 99])
+    print(f"{n} pedidos em {total:.2f}s ({n / total:.1f} pedidos/s) | "
+          f"cliente p50={p50:.1f}ms p90={p90:.1f}ms p99={p99:.1f}ms")
+
+    reader, writer = await conectar()
+    _, stats = await _requisitar(reader, writer, 'GET', '/stats')
+    writer.close()
+    print(json.dumps(stats, indent=2, ensure_ascii=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor residente de montagem de provas')
+    parser.add_argument('comando', nargs='?', choices=['serve', 'bench'], default='serve')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--unix', type=str, default=None, help='Caminho de socket Unix (no lugar de TCP)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Processos de busca')
+    parser.add_argument('--n', type=int, default=100, help='bench: número de pedidos')
+    parser.add_argument('--concorrencia', type=int, default=4, help='bench: conexões simultâneas')
+    parser.add_argument('--espec', type=str, default=None,
+                        help='bench: JSON com uma especificação ou lista de especificações')
+    args = parser.parse_args()
+
+    if args.comando == 'serve':
+        try:
+            asyncio.run(Servidor(args.workers).servir(args.host, args.porta, args.unix))
+        except KeyboardInterrupt:
+            print("\nEncerrando o servidor...")
+        return
+
+    especs = json.loads(args.espec) if args.espec else [{'materia': 'Física', 'topico': 'Cinemática'}]
+    if isinstance(especs, dict):
+        especs = [especs]
+    asyncio.run(bench(args.host, args.porta, args.unix, args.n, args.concorrencia, especs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Testes do AG na montagem de provas: resultado fixo por semente, validade das
+soluções e vazão (gerações e operadores) contra os limites de
+tests/limites_desempenho.json. Filtro: Física/Cinemática, banco padrão (5000, seed 42).
+"""
+import json
+import os
+import sys
+import timeit
+
+import pytest
+
+# Adiciona o diretório raiz ao path para importar os módulos do projeto
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from common.seeds import criar_geradores
+from src.benchmark.runners import PARAMS_PADRAO, Rastreador, executar_ga, executar_hibrido
+from src.benchmark.runners import executar as executar_celula
+from src.part3_ga.ga import GA
+from src.part3_ga.hibrido import HibridoACOGA
+from src.part3_ga.problems.exam import BancoDeQuestoes
+from src.part3_ga.run_ga import ExamProblem
+from src.part4_swarm_immune.aco import ACO
+from src.part4_swarm_immune.run_aco import ExamProblemACO
+
+MATERIA, TOPICO = 'Física', 'Cinemática'
+
+with open(os.path.join(os.path.dirname(__file__), 'limites_desempenho.json')) as f:
+    LIMITES = json.load(f)['ga']
+
+# Melhor prova (ids) e fitness de cada variante com a semente 42
+RESULTADOS_FIXOS = {
+    'geracional': ({}, [268, 4395, 255, 4944, 2888, 447, 3958, 4773, 2009, 606], 766.0),
+    'estacionario': ({'modo': 'estacionario', 'dedup': True},
+                     [4773, 4395, 255, 2888, 4944, 2957, 2009, 3958, 268, 60], 774.0),
+    'adaptativo': ({'adaptativo': True}, [606, 4395, 255, 1933, 2009, 2957, 4944, 1194, 2888, 268], 766.0),
+}
+
+
+@pytest.fixture(scope='module')
+def banco():
+    return BancoDeQuestoes()
+
+
+@pytest.fixture(scope='module')
+def problema(banco):
+    return ExamProblem(MATERIA, TOPICO, banco, verbose=False, rng=criar_geradores(42, 1)[0])
+
+
+def executar(banco, seed=42, **params):
+    best, problem, _ = executar_ga(banco, MATERIA, TOPICO, seed, {**PARAMS_PADRAO['ga'], **params}, Rastreador)
+    return best, problem
+
+
+def vazao(fn, n):
+    """Chamadas por segundo (melhor de 3 repetições)."""
+    return n / min(timeit.repeat(fn, number=n, repeat=3))
+
+
+@pytest.mark.parametrize('variante', list(RESULTADOS_FIXOS))
+def test_resultado_fixo_por_semente(banco, variante):
+    params, ids, fitness = RESULTADOS_FIXOS[variante]
+    best, problem = executar(banco, **params)
+    assert [q.id for q in best] == ids
+    assert problem.fitness(best) == pytest.approx(fitness)
+
+
+def test_mesma_semente_mesmo_resultado(banco):
+    a, _ = executar(banco, seed=7)
+    b, _ = executar(banco, seed=7)
+    assert [q.id for q in a] == [q.id for q in b]
+
+
+@pytest.mark.parametrize('variante', list(RESULTADOS_FIXOS))
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_solucao_valida(banco, variante, seed):
+    best, problem = executar(banco, seed=seed, **RESULTADOS_FIXOS[variante][0])
+    ids = [q.id for q in best]
+    assert len(best) == problem.tamanho
+    assert len(set(ids)) == len(ids)
+    assert all(q.materia == MATERIA and q.subtopico == TOPICO for q in best)
+
+    # O fitness confere com o tempo total e a dificuldade média da prova
+    tempo = sum(q.tempo for q in best)
+    dificuldade = sum(q.dificuldade for q in best) / len(best)
+    fora_da_janela = 0 if problem.tempo_min <= tempo <= problem.tempo_max else \
+        min(abs(tempo - problem.tempo_min), abs(tempo - problem.tempo_max))
+    esperado = 1000.0 - 10 * fora_da_janela - 200 * abs(dificuldade - problem.dificuldade_alvo)
+    assert problem.fitness(best) == pytest.approx(esperado)
+
+
+@pytest.mark.parametrize('modo, deduplicar', [('geracional', False), ('geracional', True), ('estacionario', True)])
+def test_ga_sem_key_fn(problema, modo, deduplicar):
+    # Questao não é hashable: a chave padrão precisa funcionar mesmo assim
+    ga = GA(10, problema.fitness, problema.create_ind, problema.mutate, problema.crossover,
+            rng=criar_geradores(42, 2)[1], adaptativo=True, deduplicar=deduplicar, modo=modo)
+    best = ga.run(2, verbose=False)
+    assert len(best) == problema.tamanho
+    assert 0 < ga.diversidade() <= 1
+    # Só a deduplicação substitui duplicatas, e nunca mais do que as encontradas
+    substituidas = ga.estatisticas['substituidas']
+    assert (substituidas <= ga.estatisticas['duplicatas']).all()
+    assert deduplicar or not substituidas.any()
+
+
+def test_populacao_inicial_semeada(problema):
+    sementes = [problema.create_ind() for _ in range(5)]
+    ga = GA(20, problema.fitness, problema.create_ind, problema.mutate, problema.crossover,
+            rng=criar_geradores(42, 2)[1], key_fn=problema.chave, populacao_inicial=sementes)
+    assert ga.population[:5] == sementes
+    assert len(ga.population) == 20
+
+
+@pytest.mark.parametrize('params, ids, fitness', [
+    ({}, [255, 2957, 1091, 3660, 1933, 268, 2009, 1871, 4395, 2888], 740.0),
+    ({'ciclos': 3, 'retorno': True}, [255, 2957, 1091, 4773, 2795, 268, 2009, 1933, 4395, 2888], 744.0),
+])
+def test_hibrido_aco_ga(banco, params, ids, fitness):
+    best, problem, _ = executar_hibrido(banco, MATERIA, TOPICO, 42, {**PARAMS_PADRAO['hibrido'], **params},
+                                        Rastreador)
+    assert [q.id for q in best] == ids
+    assert problem.fitness(best) == pytest.approx(fitness)
+    assert len({q.id for q in best}) == problem.tamanho
+
+
+@pytest.mark.parametrize('ciclos, arquivos', [(1, ['est.npz']), (2, ['est_ciclo0.npz', 'est_ciclo1.npz'])])
+def test_hibrido_salva_estatisticas(banco, problema, tmp_path, ciclos, arquivos):
+    problema_aco = ExamProblemACO(MATERIA, TOPICO, banco, verbose=False)
+    aco = ACO(n_ants=5, n_positions=problema.tamanho, n_options=len(problema_aco.questoes_candidatas),
+              fitness_fn=problema.fitness, heuristica_fn=problema_aco.heuristica,
+              get_valid_options=problema_aco.get_valid_options, update_state=problema_aco.update_state,
+              get_option_id=problema_aco.get_questao_idx, seed=42, tamanho_arquivo=20, chave_fn=problema.chave)
+    rng = criar_geradores(42, 2)[1]
+    hibrido = HibridoACOGA(aco, lambda pop: GA(20, problema.fitness, problema.create_ind, problema.mutate,
+                                               problema.crossover, rng=rng, key_fn=problema.chave,
+                                               populacao_inicial=pop),
+                           20, iters_aco=1, ciclos=ciclos)
+    hibrido.run(4, verbose=False, caminho_estatisticas=str(tmp_path / 'est.npz'))
+    assert sorted(os.listdir(tmp_path)) == arquivos
+    assert len(hibrido.ga.estatisticas) == 4 // ciclos
+
+
+@pytest.mark.parametrize('como', [list, iter, lambda ids: (i for i in ids)])
+def test_consulta_exclui_ids(como):
+    # Banco novo a cada caso: o cache de consultas não pode esconder a exclusão
+    banco = BancoDeQuestoes()
+    todas = banco.consultar(materias=MATERIA, subtopicos=TOPICO)
+    excluidos = [q.id for q in todas[:3]]
+    restantes = banco.consultar(materias=MATERIA, subtopicos=TOPICO, excluir_ids=como(excluidos))
+    assert [q.id for q in restantes] == [q.id for q in todas[3:]]
+
+
+def test_executar_separa_insuficiente_de_erro(banco):
+    # Só a falta de questões vira status; parâmetros inválidos continuam sendo erros
+    registro = executar_celula('ga', BancoDeQuestoes(tamanho=50), MATERIA, TOPICO, 1, medir_memoria=False)
+    assert registro['status'] == 'insuficiente'
+    with pytest.raises(ValueError, match='Modo desconhecido'):
+        executar_celula('ga', banco, MATERIA, TOPICO, 1, {'modo': 'invalido'}, medir_memoria=False)
+
+
+def test_operadores_preservam_validade(problema):
+    a, b = problema.create_ind(), problema.create_ind()
+    for filho in [problema.mutate(a), *problema.crossover(a, b)]:
+        assert len(filho) == problema.tamanho
+        assert len({q.id for q in filho}) == problema.tamanho
+
+
+def test_vazao_geracoes(problema):
+    ga = GA(100, problema.fitness, problema.create_ind, problema.mutate, problema.crossover,
+            rng=criar_geradores(42, 2)[1], key_fn=problema.chave)
+    assert vazao(ga.geracao, 20) >= LIMITES['geracoes_por_s']['minimo']
+
+
+def test_vazao_operadores(problema):
+    ga = GA(100, problema.fitness, problema.create_ind, problema.mutate, problema.crossover,
+            rng=criar_geradores(42, 2)[1], key_fn=problema.chave)
+    a, b = problema.create_ind(), problema.create_ind()
+    assert vazao(lambda: problema.fitness(a), 2000) >= LIMITES['fitness_por_s']['minimo']
+    assert vazao(lambda: problema.mutate(a), 1000) >= LIMITES['mutacoes_por_s']['minimo']
+    assert vazao(lambda: problema.crossover(a, b), 1000) >= LIMITES['cruzamentos_por_s']['minimo']
+    assert vazao(ga.select_tournament, 1000) >= LIMITES['torneios_por_s']['minimo']
@@ -0,0 +1,122 @@
+"""
+Testes do ACO na montagem de provas: resultado fixo por semente, validade das
+soluções e vazão (iterações, formigas e operadores) contra os limites de
+tests/limites_desempenho.json. Filtro: Física/Cinemática, banco padrão (5000, seed 42).
+"""
+import json
+import os
+import sys
+import timeit
+
+import pytest
+
+# Adiciona o diretório raiz ao path para importar os módulos do projeto
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.benchmark.runners import PARAMS_PADRAO, Rastreador, executar_aco
+from src.part3_ga.problems.exam import BancoDeQuestoes
+from src.part4_swarm_immune.aco import ACO
+from src.part4_swarm_immune.run_aco import ExamProblemACO
+
+MATERIA, TOPICO = 'Física', 'Cinemática'
+PARAMS = {**PARAMS_PADRAO['aco'], 'ants': 10, 'iters': 10}
+
+with open(os.path.join(os.path.dirname(__file__), 'limites_desempenho.json')) as f:
+    LIMITES = json.load(f)['aco']
+
+# Melhor prova (ids) e fitness com a semente 42
+IDS_FIXOS = [3368, 4773, 3958, 1933, 447, 4395, 2009, 4944, 268, 1871]
+FITNESS_FIXO = 730.0
+
+
+@pytest.fixture(scope='module')
+def banco():
+    return BancoDeQuestoes()
+
+
+@pytest.fixture(scope='module')
+def problema(banco):
+    return ExamProblemACO(MATERIA, TOPICO, banco, verbose=False)
+
+
+def criar_aco(problema, n_ants=10, seed=42, **kwargs):
+    return ACO(n_ants=n_ants, n_positions=problema.tamanho, n_options=len(problema.questoes_candidatas),
+               fitness_fn=problema.fitness, heuristica_fn=problema.heuristica,
+               get_valid_options=problema.get_valid_options, update_state=problema.update_state,
+               get_option_id=problema.get_questao_idx, seed=seed, **kwargs)
+
+
+def executar(banco, seed=42):
+    best, problem, _ = executar_aco(banco, MATERIA, TOPICO, seed, PARAMS, Rastreador)
+    return best, problem
+
+
+def vazao(fn, n):
+    """Chamadas por segundo (melhor de 3 repetições)."""
+    return n / min(timeit.repeat(fn, number=n, repeat=3))
+
+
+def test_resultado_fixo_por_semente(banco):
+    best, problem = executar(banco)
+    assert [q.id for q in best] == IDS_FIXOS
+    assert problem.fitness(best) == pytest.approx(FITNESS_FIXO)
+
+
+def test_mesma_semente_mesmo_resultado(banco):
+    a, _ = executar(banco, seed=7)
+    b, _ = executar(banco, seed=7)
+    assert [q.id for q in a] == [q.id for q in b]
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_solucao_valida(banco, seed):
+    best, problem = executar(banco, seed=seed)
+    ids = [q.id for q in best]
+    assert len(best) == problem.tamanho
+    assert len(set(ids)) == len(ids)
+    assert all(q.materia == MATERIA and q.subtopico == TOPICO for q in best)
+
+    # O fitness confere com o tempo total e a dificuldade média da prova
+    tempo = sum(q.tempo for q in best)
+    dificuldade = sum(q.dificuldade for q in best) / len(best)
+    fora_da_janela = 0 if problem.tempo_min <= tempo <= problem.tempo_max else \
+        min(abs(tempo - problem.tempo_min), abs(tempo - problem.tempo_max))
+    esperado = 1000.0 - 10 * fora_da_janela - 200 * abs(dificuldade - problem.dificuldade_alvo)
+    assert problem.fitness(best) == pytest.approx(esperado)
+
+
+def test_formiga_constroi_prova_completa(problema):
+    aco = criar_aco(problema)
+    solucao, estado = aco.construir_solucao(0)
+    assert len(solucao) == problema.tamanho
+    assert len({q.id for q in solucao}) == problema.tamanho
+    assert estado['tempo_total'] == sum(q.tempo for q in solucao)
+
+
+def test_arquivo_guarda_melhores_distintas(problema):
+    aco = criar_aco(problema, tamanho_arquivo=8, chave_fn=problema.chave)
+    aco.run(3, verbose=False)
+    arquivo = aco.melhores_distintas()
+    fitnesses = [f for _, f in arquivo]
+    assert len(arquivo) == 8
+    assert len({problema.chave(s) for s, _ in arquivo}) == 8
+    assert fitnesses == sorted(fitnesses, reverse=True)
+    assert fitnesses[0] == aco.best_fitness
+
+
+def test_vazao_iteracoes(problema):
+    aco = criar_aco(problema)
+    assert vazao(lambda: aco.run(1, verbose=False), 5) >= LIMITES['iteracoes_por_s']['minimo']
+    assert vazao(lambda: aco.construir_solucao(0), 20) >= LIMITES['formigas_por_s']['minimo']
+
+
+def test_vazao_operadores(problema):
+    aco = criar_aco(problema)
+    estado = problema.update_state({}, problema.questoes_candidatas[0])
+    questao = problema.questoes_candidatas[5]
+    assert vazao(lambda: problema.heuristica(1, questao, estado), 2000) >= LIMITES['heuristicas_por_s']['minimo']
+
+    solucoes = [aco.construir_solucao(i)[0] for i in range(10)]
+    fitnesses = [problema.fitness(s) for s in solucoes]
+    assert vazao(lambda: aco.atualizar_feromonio(solucoes, fitnesses), 100) >= \
+        LIMITES['atualizacoes_feromonio_por_s']['minimo']